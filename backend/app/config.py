@@ -17,6 +17,8 @@ DATABASE_URL: str = os.getenv(
     f"postgresql+psycopg2://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{DB_HOST}:{DB_PORT}/{POSTGRES_DB}"
 )
 
+PARTITION_MONTHS_AHEAD: int = int(os.getenv("PARTITION_MONTHS_AHEAD", 3))
+
 # --- FASTAPI ---
 FASTAPI_PORT: int = int(os.getenv("FASTAPI_PORT", 8000))
 
@@ -35,10 +37,67 @@ OPENWEATHER_REVERSE_URL: str = os.getenv(
     "OPENWEATHER_REVERSE_URL",
     "https://api.openweathermap.org/geo/1.0/reverse"
 )
+OPENWEATHER_GROUP_URL: str = os.getenv(
+    "OPENWEATHER_GROUP_URL",
+    "https://api.openweathermap.org/data/2.5/group"
+)
+
+# --- HTTP CLIENT ---
+HTTP_POOL_SIZE: int = int(os.getenv("HTTP_POOL_SIZE", 20))
+HTTP_ASYNC_MAX_CONNECTIONS: int = int(os.getenv("HTTP_ASYNC_MAX_CONNECTIONS", 500))
+HTTP_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_TIMEOUT_SECONDS", 10))
+HTTP_MAX_RETRIES: int = int(os.getenv("HTTP_MAX_RETRIES", 3))
+HTTP_BACKOFF_FACTOR: float = float(os.getenv("HTTP_BACKOFF_FACTOR", 0.5))
+
+# --- UPSTREAM RATE LIMIT ---
+# Token bucket shared by every OpenWeather call (free tier: 60 calls/minute).
+OPENWEATHER_RATE_PER_MINUTE: float = float(os.getenv("OPENWEATHER_RATE_PER_MINUTE", 60))
+OPENWEATHER_BURST: int = int(os.getenv("OPENWEATHER_BURST", 20))
+# Tokens interactive requests may not use, kept for scheduled ingestion.
+OPENWEATHER_RESERVED_TOKENS: int = int(os.getenv("OPENWEATHER_RESERVED_TOKENS", 5))
+# Calls per UTC day (0 = unlimited); interactive requests stop OPENWEATHER_DAILY_RESERVE calls early.
+OPENWEATHER_DAILY_QUOTA: int = int(os.getenv("OPENWEATHER_DAILY_QUOTA", 0))
+OPENWEATHER_DAILY_RESERVE: int = int(os.getenv("OPENWEATHER_DAILY_RESERVE", 0))
+# Longest time a call may queue for a token before failing.
+RATE_LIMIT_INTERACTIVE_TIMEOUT: float = float(os.getenv("RATE_LIMIT_INTERACTIVE_TIMEOUT", 5))
+RATE_LIMIT_SCHEDULED_TIMEOUT: float = float(os.getenv("RATE_LIMIT_SCHEDULED_TIMEOUT", 120))
+
+# --- BATCH ---
+# Cities per batch request, concurrent upstream lookups per batch and the overall deadline.
+BATCH_MAX_CITIES: int = int(os.getenv("BATCH_MAX_CITIES", 50))
+BATCH_CONCURRENCY: int = int(os.getenv("BATCH_CONCURRENCY", 10))
+BATCH_TIMEOUT_SECONDS: float = float(os.getenv("BATCH_TIMEOUT_SECONDS", 8))
+# Buckets returned by /weather/compare when no 'from' is given (168 hours = one week).
+COMPARE_DEFAULT_BUCKETS: int = int(os.getenv("COMPARE_DEFAULT_BUCKETS", 168))
+
+# --- CACHE ---
+WEATHER_CACHE_TTL_SECONDS: int = int(os.getenv("WEATHER_CACHE_TTL_SECONDS", 600))
+WEATHER_CACHE_MAX_ENTRIES: int = int(os.getenv("WEATHER_CACHE_MAX_ENTRIES", 1024))
+# Maximum age of the in-memory latest store (the /weather/latest snapshot and
+# each city's entry) before it is re-read from the database (rows may be
+# written by cron, other workers or seeds).
+LATEST_SNAPSHOT_TTL_SECONDS: int = int(os.getenv("LATEST_SNAPSHOT_TTL_SECONDS", 30))
+
+GEOCODE_PRECISION: int = int(os.getenv("GEOCODE_PRECISION", 6))
+GEOCODE_CACHE_TTL_SECONDS: int = int(os.getenv("GEOCODE_CACHE_TTL_SECONDS", 30 * 24 * 3600))
+GEOCODE_CACHE_MAX_ENTRIES: int = int(os.getenv("GEOCODE_CACHE_MAX_ENTRIES", 10000))
+# How long a cell without any matching city is remembered before OpenWeather is asked again.
+GEOCODE_NEGATIVE_TTL_SECONDS: int = int(os.getenv("GEOCODE_NEGATIVE_TTL_SECONDS", 24 * 3600))
 
 # --- CRON / SCHEDULER ---
 CITIES: List[str] = os.getenv("CITIES", "Arrecife,Madrid,Barcelona,London,New York").split(",")
 CRON_INTERVAL_SECONDS: int = int(os.getenv("CRON_INTERVAL_SECONDS", 1800)) 
+SCHEDULER_MAX_WORKERS: int = int(os.getenv("SCHEDULER_MAX_WORKERS", 8))
+# Cities with a known OpenWeather id are ingested through group requests of up to this many ids.
+# The /group endpoint rejects more than OPENWEATHER_GROUP_MAX_IDS ids, so larger values are clamped.
+SCHEDULER_GROUP_REQUESTS: bool = os.getenv("SCHEDULER_GROUP_REQUESTS", "true").lower() == "true"
+OPENWEATHER_GROUP_MAX_IDS: int = 20
+OPENWEATHER_GROUP_SIZE: int = max(1, min(OPENWEATHER_GROUP_MAX_IDS, int(os.getenv("OPENWEATHER_GROUP_SIZE", 20))))
+
+# --- ARCHIVE ---
+ARCHIVE_DIR: str = os.getenv("ARCHIVE_DIR", "archive")
+ARCHIVE_ENABLED: bool = os.getenv("ARCHIVE_ENABLED", "false").lower() == "true"
+ARCHIVE_PURGE: bool = os.getenv("ARCHIVE_PURGE", "false").lower() == "true"
 
 # --- LIMITE DE DATOS ---
 TEMP_MIN: float = float(os.getenv("TEMP_MIN", -50))
@@ -46,6 +105,24 @@ TEMP_MAX: float = float(os.getenv("TEMP_MAX", 60))
 HUMIDITY_MIN: int = int(os.getenv("HUMIDITY_MIN", 0))
 HUMIDITY_MAX: int = int(os.getenv("HUMIDITY_MAX", 100))
 
+# --- ANOMALY DETECTION ---
+ANOMALY_DETECTION_ENABLED: bool = os.getenv("ANOMALY_DETECTION_ENABLED", "true").lower() == "true"
+# EWMA smoothing factor: higher adapts faster (0.05 ~ the last 20 observations).
+ANOMALY_EWMA_ALPHA: float = float(os.getenv("ANOMALY_EWMA_ALPHA", 0.05))
+ANOMALY_ZSCORE_THRESHOLD: float = float(os.getenv("ANOMALY_ZSCORE_THRESHOLD", 4.0))
+# Observations a detector must see before it may raise z-score alerts.
+ANOMALY_MIN_SAMPLES: int = int(os.getenv("ANOMALY_MIN_SAMPLES", 48))
+# Pressure change over PRESSURE_TENDENCY_HOURS that raises an alert (6 hPa / 3 h is a "rapid" change).
+PRESSURE_TENDENCY_HOURS: float = float(os.getenv("PRESSURE_TENDENCY_HOURS", 3))
+PRESSURE_TENDENCY_ALERT_HPA: float = float(os.getenv("PRESSURE_TENDENCY_ALERT_HPA", 6))
+
+# --- PREDICTION ---
+# Observations lose half their weight in the local model after this many days.
+PREDICT_HALF_LIFE_DAYS: float = float(os.getenv("PREDICT_HALF_LIFE_DAYS", 14))
+PREDICT_MIN_SAMPLES: int = int(os.getenv("PREDICT_MIN_SAMPLES", 24))
+PREDICT_MAX_HOURS: int = int(os.getenv("PREDICT_MAX_HOURS", 120))
+PREDICT_RIDGE: float = float(os.getenv("PREDICT_RIDGE", 0.001))
+
 # --- LOGGING ---
 LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
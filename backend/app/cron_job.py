@@ -5,28 +5,29 @@ Scheduled job module for periodically fetching and saving weather data.
 Intended to be run by a scheduler (cron, Docker loop, or APScheduler).
 
 Function:
-- run() : iterates over a list of predefined cities and saves their weather data.
+- run() : fetches all predefined cities concurrently and saves their weather data.
 
 Handles logging of successful and failed saves.
 """
-from app.crud import save_weather
-from app.config import CITIES
-from app.exceptions import AppError
+from app.scheduler import fetch_and_save_all_cities
 import logging
 
 logger = logging.getLogger(__name__)
 
-def run():
+def run() -> dict:
     """
     Fetch and save weather data for each city in CITIES.
 
-    Logs success or failure for each city individually.
+    Logs success for each city individually; failures are logged by the scheduler.
+
+    Returns:
+        dict: Ingestion report from fetch_and_save_all_cities.
     """
-    for city in CITIES:
-        try:
-            save_weather(city)
-            logger.info(f"Weather data for {city} saved successfully.")
-        except AppError as e:
-            logger.error(f"AppError in cron for {city}: {e.message}")
-        except Exception as e:
-            logger.exception(f"Unexpected error in cron for {city}: {e}")
\ No newline at end of file
+    try:
+        report = fetch_and_save_all_cities()
+    except Exception as e:
+        logger.exception(f"Unexpected error in cron: {e}")
+        raise
+    for city in report["saved"]:
+        logger.info(f"Weather data for {city} saved successfully ({report['latency_ms'].get(city)} ms).")
+    return report
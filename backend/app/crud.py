@@ -5,7 +5,7 @@ Module for fetching weather data from an external API and saving it to the datab
 Responsibilities:
 - Fetch weather data for a given city.
 - Validate fetched data.
-- Save validated data to the database.
+- Save validated data to the database, one city at a time or in bulk.
 - Log warnings and errors consistently.
 
 This module uses custom exceptions to standardize error handling:
@@ -14,32 +14,190 @@ This module uses custom exceptions to standardize error handling:
 - DatabaseError: issues when committing to the database.
 """
 
+import contextvars
 import logging
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Iterable
+from sqlalchemy import insert
 from app.models import Weather
-from app.weather_client import get_weather
-from app.exceptions import APIError, DatabaseError
+from app.weather_client import get_weather, get_weather_group
+from app.config import OPENWEATHER_GROUP_MAX_IDS, OPENWEATHER_GROUP_SIZE
+from app.exceptions import APIError, DatabaseError, RateLimitError, ValidationError
 from app.utils.validation import validate_weather_data
+from app.services.rollups import update_rollups
+from app.services.anomalies import detect_anomalies
+from app.services.latest_store import latest_store
+from app.services.prediction import model_store
 
 logger = logging.getLogger(__name__)
 
-def save_weather(city: str, db=None) -> None:
+def _record_observations(db, rows: list) -> None:
     """
-    Fetch, validate, and save weather data for a given city.
+    Update data derived from newly inserted observations.
+
+    Runs in the same transaction as the INSERT, so derived data (rollups,
+    anomaly detector state and alerts) is rolled back together with the
+    observations if the commit fails.
+    """
+    update_rollups(db, rows)
+    detect_anomalies(db, rows)
+
+def _publish_observations(rows: list) -> None:
+    """
+    Publish committed observations to in-memory read models.
+
+    Called only after a successful commit, so readers never see rows that were
+    rolled back.
+    """
+    latest_store.update(rows)
+    model_store.observe(rows)
+
+def fetch_validated_weather(city: str) -> dict:
+    """
+    Fetch and validate weather data for a given city without touching the database.
 
     Args:
         city (str): Name of the city.
 
+    Returns:
+        dict: Validated weather data mapped to Weather columns.
+
     Raises:
         APIError: If fetching weather data fails.
         ValidationError: If data is incomplete or invalid.
-        DatabaseError: If committing to the database fails.
+    """
+    return validate_weather_data(fetch_raw_weather(city), city)
+
+def fetch_raw_weather(city: str) -> dict:
+    """
+    Fetch the raw OpenWeather payload for a given city.
+
+    Raises:
+        APIError: If fetching weather data fails.
+        RateLimitError: If the upstream rate limiter rejects the call (passed through
+            unwrapped so callers can answer 503 with Retry-After).
     """
     try:
-        data = get_weather(city)
+        return get_weather(city)
+    except RateLimitError:
+        raise
     except Exception as e:
         raise APIError(f"Failed to fetch weather for {city}: {e}")
 
-    validated_data = validate_weather_data(data, city)
+def fetch_weather_many(
+    cities: Iterable[str],
+    max_workers: int = 8,
+    city_ids: Dict[str, int] = None,
+    group_size: int = OPENWEATHER_GROUP_SIZE,
+) -> dict:
+    """
+    Fetch raw weather payloads for several cities concurrently.
+
+    Upstream requests run on a bounded thread pool, so the total duration is
+    close to the slowest request instead of the sum of all of them. Cities with
+    a known OpenWeather id (``city_ids``) are fetched through group requests of
+    up to ``group_size`` ids; the others are fetched one by one by name. A city
+    whose id is missing from its group response is retried by name and reported
+    in ``missing_from_group`` so the caller can re-resolve its id.
+
+    Args:
+        cities (Iterable[str]): City names to fetch.
+        max_workers (int): Maximum number of concurrent upstream requests.
+        city_ids (Dict[str, int], optional): OpenWeather ids of resolved cities.
+        group_size (int): Ids per group request (capped at OPENWEATHER_GROUP_MAX_IDS).
+
+    Returns:
+        dict: ``{"results": {city: raw_payload}, "failures": {city: error},
+        "latency_ms": {city: elapsed}, "upstream_calls": n,
+        "missing_from_group": [city]}``. Cities fetched in the same group request
+        share its latency; a by-name retry reports its own.
+    """
+    cities = list(dict.fromkeys(c.strip() for c in cities if c and c.strip()))
+    city_ids = city_ids or {}
+    results: Dict[str, dict] = {}
+    failures: Dict[str, str] = {}
+    latency_ms: Dict[str, float] = {}
+    missing_from_group: list = []
+
+    def _fetch(city: str):
+        start = time.perf_counter()
+        try:
+            return [(city, fetch_raw_weather(city), None)]
+        except Exception as e:
+            return [(city, None, getattr(e, "message", str(e)))]
+        finally:
+            latency_ms[city] = round((time.perf_counter() - start) * 1000, 2)
+
+    def _fetch_group(chunk: list):
+        start = time.perf_counter()
+        try:
+            by_id = {data.get("id"): data for data in get_weather_group(sorted({city_ids[c] for c in chunk}))}
+        except Exception as e:
+            return [(city, None, getattr(e, "message", str(e))) for city in chunk]
+        finally:
+            elapsed = round((time.perf_counter() - start) * 1000, 2)
+            for city in chunk:
+                latency_ms[city] = elapsed
+        outcomes = []
+        for city in chunk:
+            if city_ids[city] in by_id:
+                outcomes.append((city, by_id[city_ids[city]], None))
+                continue
+            # The id is stale (merged or retired upstream): fall back to the name.
+            logger.warning(f"No data for {city} (id {city_ids[city]}) in group response, fetching by name")
+            missing_from_group.append(city)
+            outcomes.extend(_fetch(city))
+        return outcomes
+
+    grouped = [c for c in cities if c in city_ids]
+    size = max(1, min(group_size, OPENWEATHER_GROUP_MAX_IDS))
+    tasks = [(_fetch_group, grouped[i:i + size]) for i in range(0, len(grouped), size)]
+    tasks += [(_fetch, c) for c in cities if c not in city_ids]
+
+    if not tasks:
+        return {"results": results, "failures": failures, "latency_ms": latency_ms,
+                "upstream_calls": 0, "missing_from_group": []}
+
+    outcomes = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks)))) as pool:
+        # Each task runs in a copy of the caller's context so the upstream priority carries over.
+        futures = [pool.submit(contextvars.copy_context().run, func, arg) for func, arg in tasks]
+        for future in futures:
+            for city, data, error in future.result():
+                outcomes[city] = (data, error)
+
+    for city in cities:
+        data, error = outcomes[city]
+        if error is None:
+            results[city] = data
+        else:
+            failures[city] = error
+
+    return {
+        "results": results,
+        "failures": failures,
+        "latency_ms": latency_ms,
+        "upstream_calls": len(tasks) + len(missing_from_group),
+        "missing_from_group": [c for c in cities if c in missing_from_group],
+    }
+
+def save_weather(city: str, db=None) -> None:
+    """
+    Fetch, validate, and save weather data for a given city.
+
+    Args:
+        city (str): Name of the city.
+
+    Raises:
+        APIError: If fetching weather data fails.
+        RateLimitError: If the upstream rate limiter rejects the call.
+        ValidationError: If data is incomplete or invalid.
+        DatabaseError: If committing to the database fails.
+    """
+    validated_data = fetch_validated_weather(city)
 
     new_session = False
     if db is None:
@@ -48,13 +206,88 @@ def save_weather(city: str, db=None) -> None:
         new_session = True
 
     try:
+        validated_data["id"] = uuid.uuid4()
+        validated_data["created_at"] = datetime.now(timezone.utc)
         weather_entry = Weather(**validated_data)
         db.add(weather_entry)
+        _record_observations(db, [validated_data])
         db.commit()
+        _publish_observations([validated_data])
         logger.info(f"Saved enriched weather data for {city} to the database.")
     except Exception as e:
         db.rollback()
         raise DatabaseError(f"Failed to save weather for {city}: {e}")
     finally:
         if new_session:
-            db.close()
\ No newline at end of file
+            db.close()
+
+def save_weather_batch(payloads: Dict[str, dict], db=None) -> dict:
+    """
+    Validate many raw weather payloads and save them in a single transaction.
+
+    Valid rows are written with one executemany INSERT. If that statement fails,
+    rows are retried one by one inside savepoints so a single bad record does not
+    roll back the rest of the batch.
+
+    Args:
+        payloads (Dict[str, dict]): Raw OpenWeather payloads keyed by city name.
+        db (Session, optional): Database session. A new one is opened if omitted.
+
+    Returns:
+        dict: ``{"saved": [city, ...], "failures": {city: error}}``. A payload
+        that cannot be validated, for any reason, is reported in ``failures``.
+    """
+    failures: Dict[str, str] = {}
+    rows: Dict[str, dict] = {}
+    for city, data in payloads.items():
+        try:
+            rows[city] = validate_weather_data(data or {}, city)
+        except ValidationError as e:
+            failures[city] = e.message
+        except Exception as e:
+            # Malformed payloads (wrong types, unexpected shapes) fail their own row only.
+            failures[city] = f"Invalid weather data for {city}: {e}"
+
+    if not rows:
+        return {"saved": [], "failures": failures}
+
+    new_session = False
+    if db is None:
+        from app.db import SessionLocal
+        db = SessionLocal()
+        new_session = True
+
+    now = datetime.now(timezone.utc)
+    for row in rows.values():
+        row["id"] = uuid.uuid4()
+        row["created_at"] = now
+
+    saved = []
+    try:
+        try:
+            db.execute(insert(Weather), list(rows.values()))
+            _record_observations(db, list(rows.values()))
+            db.commit()
+            saved = list(rows)
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Bulk insert failed, retrying row by row: {e}")
+            for city, row in rows.items():
+                try:
+                    with db.begin_nested():
+                        db.execute(insert(Weather), [row])
+                        _record_observations(db, [row])
+                    saved.append(city)
+                except Exception as row_error:
+                    failures[city] = f"Failed to save weather for {city}: {row_error}"
+            db.commit()
+        _publish_observations([rows[city] for city in saved])
+        logger.info(f"Saved weather batch: {len(saved)} rows, {len(failures)} failures.")
+    except Exception as e:
+        db.rollback()
+        raise DatabaseError(f"Failed to save weather batch: {e}")
+    finally:
+        if new_session:
+            db.close()
+
+    return {"saved": saved, "failures": failures}
@@ -3,7 +3,7 @@
 Database configuration and session management for Weather Dashboard.
 
 Provides:
-- SQLAlchemy engine creation.
+- SQLAlchemy engine creation (instrumented for query and pool metrics).
 - SessionLocal for database sessions.
 - Base declarative class for models.
 
@@ -16,11 +16,13 @@ Example usage:
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config import DATABASE_URL
+from app.metrics import instrument_engine
 
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,  
 )
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -6,6 +6,7 @@ Provides structured JSON responses and logging for both expected
 (application-defined) and unexpected exceptions.
 """
 import logging
+import math
 from fastapi import Request
 from fastapi.responses import JSONResponse
 from app.exceptions import AppError, ValidationError, APIError, DatabaseError
@@ -15,9 +16,11 @@ logger = logging.getLogger(__name__)
 async def app_error_handler(request: Request, exc: AppError):
     """Handles all AppError exceptions and returns JSON."""
     logger.error(f"AppError: {exc.message}")
+    retry_after = getattr(exc, "retry_after", None)
     return JSONResponse(
         status_code=exc.code,
-        content={"detail": exc.message}
+        content={"detail": exc.message},
+        headers={"Retry-After": str(math.ceil(retry_after))} if retry_after else None
     )
 
 async def validation_error_handler(request: Request, exc: ValidationError):
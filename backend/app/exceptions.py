@@ -9,6 +9,7 @@ Exceptions:
 - DatabaseError: raised when a database operation fails.
 - APIError: raised when an external API call fails.
 - ValidationError: raised when input data is invalid.
+- RateLimitError: raised when the upstream call budget cannot serve a request in time.
 """
 import logging
 
@@ -45,4 +46,11 @@ class ValidationError(AppError):
     """Raised when input data is invalid."""
 
     def __init__(self, message: str = "Invalid input data", log: bool = False):
-        super().__init__(message, code=422, log=log)
\ No newline at end of file
+        super().__init__(message, code=422, log=log)
+
+class RateLimitError(AppError):
+    """Raised when no upstream token is available before the caller's deadline."""
+
+    def __init__(self, message: str = "Upstream rate limit exceeded", retry_after: float = None, log: bool = False):
+        super().__init__(message, code=503, log=log)
+        self.retry_after = retry_after
\ No newline at end of file
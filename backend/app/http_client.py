@@ -0,0 +1,178 @@
+# app/http_client.py
+"""
+Shared HTTP client for all OpenWeather calls.
+
+A single requests.Session is reused by every caller so TCP/TLS connections are
+kept alive and pooled instead of being opened for each request.
+
+Provides:
+- HTTPClient : pooled session with default timeout, retry-with-backoff and the
+  process-wide upstream rate limiter (one token per attempt, retries included).
+- http_client : module-level instance configured from app.config.
+
+Example usage:
+    from app.http_client import http_client
+    res = http_client.get(OPENWEATHER_BASE_URL, params=params)
+    http_client.stats()  # {"requests": 10, "new_connections": 1, "reused_connections": 9, ...}
+"""
+import threading
+import time
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+from app.config import HTTP_POOL_SIZE, HTTP_TIMEOUT_SECONDS, HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR
+from app.metrics import observe_upstream
+from app.utils.rate_limit import RateLimiter, upstream_limiter
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class _LimitedRetry(Retry):
+    """Retry policy that takes a rate-limiter token before every retry attempt."""
+
+    limiter: Optional[RateLimiter] = None
+
+    def new(self, **kw) -> "_LimitedRetry":
+        retry = super().new(**kw)
+        retry.limiter = self.limiter
+        return retry
+
+    def sleep(self, response=None) -> None:
+        super().sleep(response)
+        if self.limiter is not None:
+            self.limiter.acquire()
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report every new connection they open."""
+
+    def __init__(self, on_new_connection, **kwargs):
+        self._on_new_connection = on_new_connection
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        on_new_connection = self._on_new_connection
+
+        class CountingHTTPConnectionPool(HTTPConnectionPool):
+            def _new_conn(self):
+                on_new_connection()
+                return super()._new_conn()
+
+        class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            def _new_conn(self):
+                on_new_connection()
+                return super()._new_conn()
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool,
+        }
+
+
+class HTTPClient:
+    """Pooled keep-alive HTTP client with retry-with-backoff and reuse counters."""
+
+    def __init__(
+        self,
+        pool_size: int = HTTP_POOL_SIZE,
+        timeout: float = HTTP_TIMEOUT_SECONDS,
+        max_retries: int = HTTP_MAX_RETRIES,
+        backoff_factor: float = HTTP_BACKOFF_FACTOR,
+        limiter: RateLimiter = upstream_limiter,
+    ):
+        """
+        Args:
+            pool_size (int): Maximum number of kept-alive connections per host.
+            timeout (float): Default timeout in seconds for each request.
+            max_retries (int): Retries for connection errors and 429/5xx responses.
+            backoff_factor (float): Exponential backoff factor between retries.
+            limiter (RateLimiter, optional): Token bucket every request waits on (None disables it).
+        """
+        self.timeout = timeout
+        self.limiter = limiter
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._new_connections = 0
+        self._retries = 0
+        self._errors = 0
+
+        retry = _LimitedRetry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+            respect_retry_after_header=True,
+        )
+        retry.limiter = limiter
+        adapter = _CountingAdapter(
+            self._count_new_connection,
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _count_new_connection(self) -> None:
+        with self._lock:
+            self._new_connections += 1
+
+    def get(self, url: str, params: dict = None, timeout: float = None) -> requests.Response:
+        """
+        Send a GET request through the shared connection pool.
+
+        Args:
+            url (str): Absolute URL.
+            params (dict, optional): Query string parameters.
+            timeout (float, optional): Overrides the default timeout.
+
+        Returns:
+            requests.Response: Response of the last attempt.
+
+        Raises:
+            requests.RequestException: If the request fails after all retries.
+            RateLimitError: If the rate limiter cannot grant a call before the deadline.
+        """
+        if self.limiter is not None:
+            self.limiter.acquire()
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, params=params, timeout=timeout or self.timeout)
+        except requests.RequestException:
+            observe_upstream(url, "error", time.perf_counter() - start)
+            with self._lock:
+                self._requests += 1
+                self._errors += 1
+            raise
+        observe_upstream(url, response.status_code, time.perf_counter() - start)
+        retries = getattr(getattr(response.raw, "retries", None), "history", None) or ()
+        with self._lock:
+            self._requests += 1
+            self._retries += len(retries)
+        return response
+
+    def stats(self) -> dict:
+        """Return request and connection reuse counters."""
+        with self._lock:
+            reused = max(self._requests + self._retries - self._new_connections, 0)
+            attempts = self._requests + self._retries
+            return {
+                "requests": self._requests,
+                "retries": self._retries,
+                "errors": self._errors,
+                "new_connections": self._new_connections,
+                "reused_connections": reused,
+                "reuse_ratio": round(reused / attempts, 4) if attempts else 0.0,
+            }
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+
+http_client = HTTPClient()
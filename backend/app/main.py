@@ -6,27 +6,50 @@ Responsibilities:
 - Register routers (weather, etc.).
 - Configure middlewares (CORS, error handling).
 - Start the background scheduler.
-- Create database tables at startup.
+- Create database tables (and upcoming monthly partitions) at startup.
+- Warm the in-memory latest-observation store at startup.
 
 Exposes endpoints for:
 - Health check.
+- Prometheus metrics (/metrics).
 - Weather retrieval from API.
 - Weather history (all or by city).
 - Weather daily summaries.
 - Latest stored record.
 """
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.db import Base, engine
+from app.db import Base, engine, SessionLocal
 from app.config import settings
 from app.routers import weather
 from app.scheduler import start_scheduler
+from app.partitions import ensure_partitions
 from app.error_handlers import app_error_handler, generic_exception_handler
 from app.exceptions import AppError
+from app.metrics import MetricsMiddleware, render_metrics
+from app.services.openweather_async import close_async_client
+from app.services.latest_store import latest_store
+
+logger = logging.getLogger(__name__)
 
 Base.metadata.create_all(bind=engine)
+ensure_partitions(engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    db = SessionLocal()
+    try:
+        logger.info(f"Loaded latest observations for {latest_store.load(db)} cities.")
+    except Exception as e:
+        logger.warning(f"Could not warm the latest-observation store, it will fill on demand: {e}")
+    finally:
+        db.close()
+    yield
+    await close_async_client()
 
-app = FastAPI(title="Weather Dashboard API")
+app = FastAPI(title="Weather Dashboard API", lifespan=lifespan)
 app.add_exception_handler(AppError, app_error_handler)
 app.add_exception_handler(Exception, generic_exception_handler)
 
@@ -38,10 +61,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(weather.router, prefix="/weather")
 
 start_scheduler()
 
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """Prometheus metrics (route, upstream, database and scheduler timings)."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 @app.get("/")
 def root():
     return {"message": "Weather Dashboard backend funcionando!"}
\ No newline at end of file
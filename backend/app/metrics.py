@@ -0,0 +1,221 @@
+# app/metrics.py
+"""
+Prometheus metrics for the Weather Dashboard backend.
+
+Exposed at ``GET /metrics`` in the Prometheus text format.
+
+Metrics:
+- weather_http_request_duration_seconds{method, route, status}    : API latency per route template.
+- weather_upstream_requests_total{endpoint, status}                : OpenWeather calls by endpoint and status code.
+- weather_upstream_request_duration_seconds{endpoint}              : OpenWeather call latency (including retries).
+- weather_upstream_rate_limited_total{priority} / _tokens_available : shared rate limiter state.
+- weather_db_query_duration_seconds{operation}                     : SQL statement time, from engine events.
+- weather_db_connect_duration_seconds{engine}                      : time to open a new DBAPI connection.
+- weather_db_pool_checkout_duration_seconds{engine}                : time a connection stays checked out (checkout to checkin).
+- weather_db_pool_checked_out{engine}                              : connections currently checked out.
+- weather_scheduler_job_duration_seconds{job} / _failures_total    : background job runs.
+- weather_alerts_total{kind}                                       : anomalies raised on ingestion.
+
+Provides:
+- MetricsMiddleware : ASGI middleware timing every request.
+- instrument_engine(engine, name) : attaches query and pool timing to an SQLAlchemy engine.
+- observe_upstream(url, status, seconds) : records one OpenWeather call.
+- timed_job(name, func) : wraps a scheduler job so its duration and failures are recorded.
+- render_metrics() -> (bytes, str) : exposition body and content type.
+"""
+import functools
+import time
+from urllib.parse import urlparse
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "weather_http_request_duration_seconds", "API request latency by route template.",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_REQUESTS = Counter(
+    "weather_upstream_requests_total", "OpenWeather requests by endpoint and HTTP status (or 'error').",
+    ["endpoint", "status"],
+)
+UPSTREAM_DURATION = Histogram(
+    "weather_upstream_request_duration_seconds", "OpenWeather request latency by endpoint, including retries.",
+    ["endpoint"], buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_RATE_LIMITED = Counter(
+    "weather_upstream_rate_limited_total", "Upstream calls rejected by the rate limiter, by priority class.",
+    ["priority"],
+)
+UPSTREAM_TOKENS_AVAILABLE = Gauge(
+    "weather_upstream_tokens_available", "Tokens left in the shared OpenWeather rate-limit bucket.",
+)
+DB_QUERY_DURATION = Histogram(
+    "weather_db_query_duration_seconds", "SQL statement execution time by operation.",
+    ["operation"], buckets=DB_BUCKETS,
+)
+DB_CONNECT_DURATION = Histogram(
+    "weather_db_connect_duration_seconds", "Time to open a new database connection for the pool.",
+    ["engine"], buckets=DB_BUCKETS,
+)
+DB_POOL_CHECKOUT_DURATION = Histogram(
+    "weather_db_pool_checkout_duration_seconds", "Time a connection stays checked out of the pool.",
+    ["engine"], buckets=DB_BUCKETS,
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "weather_db_pool_checked_out", "Database connections currently checked out of the pool.",
+    ["engine"],
+)
+SCHEDULER_JOB_DURATION = Histogram(
+    "weather_scheduler_job_duration_seconds", "Background job duration.",
+    ["job"], buckets=JOB_BUCKETS,
+)
+SCHEDULER_JOB_FAILURES = Counter(
+    "weather_scheduler_job_failures_total", "Background job runs that raised.",
+    ["job"],
+)
+WEATHER_ALERTS = Counter(
+    "weather_alerts_total", "Anomaly alerts raised on ingestion, by kind.",
+    ["kind"],
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template (e.g. /weather/history/{city})."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"], route_label(scope), str(status)
+            ).observe(time.perf_counter() - start)
+
+
+def route_label(scope) -> str:
+    """
+    Route template of a handled request, e.g. ``/weather/history/{city}``.
+
+    Included routers report their own template without the include prefix, so
+    the prefix is taken from the leading segments of the concrete path.
+    """
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        return "unmatched"
+    path = scope.get("path", "")
+    depth = path.rstrip("/").count("/") - template.rstrip("/").count("/")
+    prefix = "/".join(path.split("/")[:depth + 1]) if depth > 0 else ""
+    return prefix + template
+
+
+def upstream_endpoint(url: str) -> str:
+    """Label for an OpenWeather URL: its last path segment (weather, forecast, reverse...)."""
+    return urlparse(url).path.rstrip("/").rsplit("/", 1)[-1] or "unknown"
+
+def observe_upstream(url: str, status, seconds: float) -> None:
+    """
+    Record one OpenWeather call.
+
+    Args:
+        url (str): Requested URL (without query string).
+        status (int | str): Final HTTP status code, or "error" for transport failures.
+        seconds (float): Total time including retries.
+    """
+    endpoint = upstream_endpoint(url)
+    UPSTREAM_REQUESTS.labels(endpoint, str(status)).inc()
+    UPSTREAM_DURATION.labels(endpoint).observe(seconds)
+
+
+def instrument_engine(engine, name: str = "app") -> None:
+    """
+    Attach query timing and pool checkout metrics to an engine.
+
+    Pool metrics come from pool events: ``connect`` (timed from the dialect's
+    ``do_connect``) for new connections, ``checkout``/``checkin`` for how long
+    connections are held. Long holds are what make other requests queue for a
+    connection; the pool exposes no event before a checkout starts waiting.
+    Pool metrics are labelled with ``name`` so several instrumented engines do
+    not overwrite each other.
+
+    Args:
+        engine (Engine): Engine to instrument.
+        name (str): Value of the ``engine`` label.
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_query(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _end_query(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+        DB_QUERY_DURATION.labels(operation).observe(time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def _failed_query(context):
+        if context.connection is not None and context.connection.info.get("query_start"):
+            context.connection.info["query_start"].pop()
+
+    @event.listens_for(engine, "do_connect")
+    def _start_connect(dialect, connection_record, cargs, cparams):
+        connection_record.info["connect_start"] = time.perf_counter()
+
+    @event.listens_for(engine.pool, "connect")
+    def _connected(dbapi_connection, connection_record):
+        started = connection_record.info.pop("connect_start", None)
+        if started is not None:
+            DB_CONNECT_DURATION.labels(name).observe(time.perf_counter() - started)
+
+    @event.listens_for(engine.pool, "checkout")
+    def _checked_out(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checkout_start"] = time.perf_counter()
+
+    @event.listens_for(engine.pool, "checkin")
+    def _checked_in(dbapi_connection, connection_record):
+        started = connection_record.info.pop("checkout_start", None) if connection_record is not None else None
+        if started is not None:
+            DB_POOL_CHECKOUT_DURATION.labels(name).observe(time.perf_counter() - started)
+
+    # Read through engine.pool on every scrape: dispose() replaces the pool object.
+    if hasattr(engine.pool, "checkedout"):
+        DB_POOL_CHECKED_OUT.labels(name).set_function(
+            lambda: engine.pool.checkedout() if hasattr(engine.pool, "checkedout") else 0
+        )
+
+
+def timed_job(name: str, func):
+    """Wrap a scheduler job so every run records its duration and failures."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            SCHEDULER_JOB_FAILURES.labels(name).inc()
+            raise
+        finally:
+            SCHEDULER_JOB_DURATION.labels(name).observe(time.perf_counter() - start)
+    return wrapper
+
+
+def render_metrics():
+    """Return the Prometheus exposition body and its content type."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
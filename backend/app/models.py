@@ -6,19 +6,33 @@ Defines database tables and relationships.
 
 Models:
 - Weather : stores weather data for a city, including temperature, humidity, description, and timestamp.
+  On PostgreSQL the table is range-partitioned by month on created_at (see app.partitions).
+- WeatherRollup : incrementally maintained aggregates per city at hourly, daily,
+  weekly and monthly resolution.
+- GeocodeCache : reverse geocoding results keyed by geohash cell.
+- City : registry of tracked city names resolved to OpenWeather city ids and
+  coordinates, so ingestion can use multi-city group requests.
+- DetectorState : persisted state of the incremental anomaly detectors, one row per (city, detector).
+- Alert : anomalies raised by the detectors on ingestion.
 
-Includes table indexes for efficient queries (e.g., by created_at date).
+Includes table indexes for efficient queries:
+- ix_weather_created_at : global history ordered by date.
+- ix_weather_city_created_at : composite (city, created_at DESC, id DESC) index serving
+  per-city history, latest record and daily summary range scans (the selected columns
+  are read from the table; existing databases get it from
+  db/migrations/001_weather_city_created_at.sql).
 """
 from app.db import Base
 from sqlalchemy import Column, String, Float, Integer, DateTime, Index
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
+from datetime import datetime, timezone
 
 class Weather(Base):
     __tablename__ = "weather_data"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, unique=True, nullable=False)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
     
     city = Column(String(100), nullable=False, index=False)
     country = Column(String(10), nullable=True)
@@ -49,9 +63,97 @@ class Weather(Base):
     sunrise = Column(Integer, nullable=True)  
     sunset = Column(Integer, nullable=True)   
 
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Part of the primary key because PostgreSQL requires the partition key in every unique constraint.
+    # The database therefore only enforces (id, created_at) as unique; id alone is a uuid4 from the app.
+    created_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        nullable=False,
+    )
 
     __table_args__ = (
         Index('ix_weather_created_at', 'created_at'),
-        Index('ix_weather_city', 'city'),
-    )
\ No newline at end of file
+        Index('ix_weather_city_created_at', city, created_at.desc(), id.desc()),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+class WeatherRollup(Base):
+    __tablename__ = "weather_rollups"
+
+    city = Column(String(100), primary_key=True)
+    bucket = Column(String(10), primary_key=True)
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+
+    count = Column(Integer, nullable=False, default=0)
+
+    temp_sum = Column(Float, nullable=False, default=0)
+    temp_min = Column(Float, nullable=True)
+    temp_max = Column(Float, nullable=True)
+
+    humidity_sum = Column(Float, nullable=False, default=0)
+    humidity_min = Column(Float, nullable=True)
+    humidity_max = Column(Float, nullable=True)
+
+    pressure_sum = Column(Float, nullable=False, default=0)
+    pressure_count = Column(Integer, nullable=False, default=0)
+
+    wind_speed_sum = Column(Float, nullable=False, default=0)
+    wind_speed_count = Column(Integer, nullable=False, default=0)
+    wind_speed_max = Column(Float, nullable=True)
+
+
+class GeocodeCache(Base):
+    __tablename__ = "geocode_cache"
+
+    cell = Column(String(12), primary_key=True)
+    # NULL records a cell with no matching city (negative cache entry).
+    city = Column(String(100), nullable=True)
+    country = Column(String(10), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class City(Base):
+    __tablename__ = "cities"
+
+    # Name as configured in CITIES (the lookup key); OpenWeather returns its own spelling in weather_data.city.
+    name = Column(String(100), primary_key=True)
+    owm_id = Column(Integer, nullable=True)
+    resolved_name = Column(String(100), nullable=True)
+    country = Column(String(10), nullable=True)
+    lat = Column(Float, nullable=True)
+    lon = Column(Float, nullable=True)
+    resolved_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class DetectorState(Base):
+    __tablename__ = "detector_state"
+
+    city = Column(String(100), primary_key=True)
+    detector = Column(String(40), primary_key=True)
+
+    count = Column(Integer, nullable=False, default=0)
+    mean = Column(Float, nullable=True)
+    variance = Column(Float, nullable=True)
+    last_value = Column(Float, nullable=True)
+    last_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class Alert(Base):
+    __tablename__ = "alerts"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    city = Column(String(100), nullable=False)
+    kind = Column(String(30), nullable=False)
+    metric = Column(String(30), nullable=False)
+    value = Column(Float, nullable=False)
+    expected = Column(Float, nullable=True)
+    score = Column(Float, nullable=True)
+    message = Column(String(255), nullable=False)
+    observed_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index('ix_alerts_observed_at', observed_at.desc()),
+        Index('ix_alerts_city_observed_at', city, observed_at.desc()),
+    )
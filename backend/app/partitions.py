@@ -0,0 +1,240 @@
+# app/partitions.py
+"""
+Monthly range partitions for the weather_data table (PostgreSQL only).
+
+weather_data is declared with ``PARTITION BY RANGE (created_at)``. This module
+creates the partition for the current month and the next PARTITION_MONTHS_AHEAD
+months, plus a DEFAULT partition as a safety net, and detaches old months so
+they can be archived or dropped without touching the live table.
+
+Rows land in the DEFAULT partition when their month has no partition yet (e.g.
+after a missed daily run). PostgreSQL refuses to create a month partition
+while the default one holds rows for that month, so a missing month is created
+as a standalone table, the matching rows are moved into it from the default
+partition and it is then attached, all in one transaction.
+
+The primary key is (id, created_at) because PostgreSQL requires the partition
+key in every unique constraint. ``id`` alone is therefore not enforced unique
+by the database; it is a uuid4 generated by the application on insert.
+
+An existing unpartitioned weather_data (created before partitioning) is left
+untouched at startup; migrate_to_partitioned() converts it, copying the rows
+into a new partitioned table (run it in a maintenance window: the table is
+locked while rows are copied):
+
+    python -m app.partitions migrate
+
+On other databases (SQLite in tests) every function is a no-op.
+
+Example usage:
+    from app.partitions import ensure_partitions, detach_partition
+    ensure_partitions()                 # at startup and daily from the scheduler
+    detach_partition(2024, 1)           # weather_data_y2024m01 becomes a standalone table
+"""
+import logging
+import sys
+from datetime import date, datetime, timezone
+from typing import List, Tuple
+from sqlalchemy import text
+from app.config import PARTITION_MONTHS_AHEAD
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "weather_data"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+LEGACY_TABLE = f"{PARENT_TABLE}_unpartitioned"
+
+def partition_name(year: int, month: int) -> str:
+    """Return the partition table name for a month, e.g. weather_data_y2025m03."""
+    return f"{PARENT_TABLE}_y{year:04d}m{month:02d}"
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def month_ranges(start: date, months_ahead: int) -> List[Tuple[date, date]]:
+    """
+    Return ``[(first_day, first_day_of_next_month), ...]`` from the month of ``start``.
+
+    Args:
+        start (date): Any day of the first month.
+        months_ahead (int): Number of following months to include.
+    """
+    first = start.replace(day=1)
+    return [(_add_months(first, i), _add_months(first, i + 1)) for i in range(months_ahead + 1)]
+
+def _utc_bound(day: date) -> str:
+    """Timestamptz literal for UTC midnight of ``day``, independent of the session TimeZone."""
+    return f"'{day.isoformat()} 00:00:00+00'"
+
+def partition_ddl(lower: date, upper: date) -> List[str]:
+    """
+    Return the statements that create and attach the partition covering ``[lower, upper)``.
+
+    Bounds are UTC midnights, like the months used by rollups and archives.
+    Rows of that month already in the DEFAULT partition are moved into the new
+    table before it is attached, which would otherwise fail.
+    """
+    name = partition_name(lower.year, lower.month)
+    lower_bound, upper_bound = _utc_bound(lower), _utc_bound(upper)
+    in_range = f"created_at >= {lower_bound} AND created_at < {upper_bound}"
+    return [
+        f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {in_range} RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved",
+        f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ({lower_bound}) TO ({upper_bound})",
+    ]
+
+def _attached(conn) -> set:
+    rows = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:table)"
+    ), {"table": PARENT_TABLE})
+    return {r[0] for r in rows}
+
+def _lock(conn) -> None:
+    """Serialize partition maintenance across workers until the transaction ends."""
+    conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {"name": f"{PARENT_TABLE}_partitions"})
+
+def _create_partitions(conn, start: date, months_ahead: int) -> List[str]:
+    """Create the missing month partitions from ``start``; must run inside a transaction."""
+    _lock(conn)
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"))
+    attached = _attached(conn)
+    names = []
+    for lower, upper in month_ranges(start, months_ahead):
+        name = partition_name(lower.year, lower.month)
+        if name not in attached:
+            for statement in partition_ddl(lower, upper):
+                conn.execute(text(statement))
+        names.append(name)
+    return names
+
+def _is_partitioned(conn) -> bool:
+    return bool(conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"
+    ), {"table": PARENT_TABLE}).scalar())
+
+def ensure_partitions(engine=None, months_ahead: int = PARTITION_MONTHS_AHEAD, start: date = None) -> List[str]:
+    """
+    Create the monthly partitions from ``start`` (default: today, UTC) up to ``months_ahead`` months later.
+
+    Args:
+        engine (Engine, optional): Database engine. Defaults to app.db.engine.
+        months_ahead (int): Number of upcoming months to create.
+        start (date, optional): First month to cover.
+
+    Returns:
+        list[str]: Partition names that exist for the requested range (empty on non-PostgreSQL).
+    """
+    if engine is None:
+        from app.db import engine
+    if engine.dialect.name != "postgresql":
+        return []
+
+    with engine.begin() as conn:
+        if not _is_partitioned(conn):
+            logger.warning(f"{PARENT_TABLE} is not partitioned; run 'python -m app.partitions migrate' to convert it.")
+            return []
+        names = _create_partitions(conn, start or datetime.now(timezone.utc).date(), months_ahead)
+    logger.info(f"Ensured weather_data partitions: {', '.join(names)}")
+    return names
+
+def list_partitions(engine=None) -> List[str]:
+    """Return the names of the partitions currently attached to weather_data."""
+    if engine is None:
+        from app.db import engine
+    if engine.dialect.name != "postgresql":
+        return []
+    with engine.connect() as conn:
+        return sorted(_attached(conn))
+
+def detach_partition(year: int, month: int, engine=None, concurrently: bool = False) -> bool:
+    """
+    Detach a monthly partition so it can be archived or dropped cheaply.
+
+    Args:
+        year (int): Partition year.
+        month (int): Partition month.
+        engine (Engine, optional): Database engine. Defaults to app.db.engine.
+        concurrently (bool): Use DETACH ... CONCURRENTLY (PostgreSQL 14+), which does not block readers/writers.
+
+    Returns:
+        bool: True if the partition was detached.
+    """
+    if engine is None:
+        from app.db import engine
+    if engine.dialect.name != "postgresql":
+        return False
+    name = partition_name(year, month)
+    if name not in list_partitions(engine):
+        return False
+    statement = f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}{' CONCURRENTLY' if concurrently else ''}"
+    if concurrently:
+        # DETACH CONCURRENTLY cannot run inside a transaction block.
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text(statement))
+    else:
+        with engine.begin() as conn:
+            conn.execute(text(statement))
+    logger.info(f"Detached partition {name}")
+    return True
+
+def migrate_to_partitioned(engine=None, months_ahead: int = PARTITION_MONTHS_AHEAD) -> int:
+    """
+    Convert an existing unpartitioned weather_data into the partitioned layout.
+
+    In one transaction: the old table (and its indexes and primary key) is
+    renamed to weather_data_unpartitioned, the partitioned table is created
+    from the model (primary key and indexes included), partitions are created
+    from the oldest row's month up to ``months_ahead`` months from today, the
+    rows are copied and the old table is dropped.
+
+    Args:
+        engine (Engine, optional): Database engine. Defaults to app.db.engine.
+        months_ahead (int): Number of upcoming months to create.
+
+    Returns:
+        int: Number of rows copied (0 if the table was already partitioned or not PostgreSQL).
+    """
+    if engine is None:
+        from app.db import engine
+    if engine.dialect.name != "postgresql":
+        return 0
+    from app.models import Weather
+
+    with engine.begin() as conn:
+        _lock(conn)
+        if _is_partitioned(conn):
+            logger.info(f"{PARENT_TABLE} is already partitioned.")
+            return 0
+        conn.execute(text(f"ALTER TABLE {PARENT_TABLE} RENAME TO {LEGACY_TABLE}"))
+        # Free the index and constraint names for the new table.
+        for (index,) in conn.execute(text("SELECT indexname FROM pg_indexes WHERE tablename = :table"),
+                                     {"table": LEGACY_TABLE}).all():
+            conn.execute(text(f'ALTER INDEX "{index}" RENAME TO "{index}_unpartitioned"'))
+        Weather.__table__.create(conn)
+
+        oldest = conn.execute(text(f"SELECT min(created_at) FROM {LEGACY_TABLE}")).scalar()
+        today = datetime.now(timezone.utc).date()
+        start = min(oldest.date(), today) if oldest else today
+        months = (today.year - start.year) * 12 + today.month - start.month + months_ahead
+        _create_partitions(conn, start, months)
+
+        legacy_columns = {r[0] for r in conn.execute(text(
+            "SELECT column_name FROM information_schema.columns WHERE table_name = :table"
+        ), {"table": LEGACY_TABLE})}
+        columns = ", ".join(c.name for c in Weather.__table__.columns if c.name in legacy_columns)
+        copied = conn.execute(text(
+            f"INSERT INTO {PARENT_TABLE} ({columns}) SELECT {columns} FROM {LEGACY_TABLE}"
+        )).rowcount
+        conn.execute(text(f"DROP TABLE {LEGACY_TABLE}"))
+    logger.info(f"Migrated {copied} rows into the partitioned {PARENT_TABLE}.")
+    return copied
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["migrate"]:
+        print(f"Copied {migrate_to_partitioned()} rows into the partitioned {PARENT_TABLE}.")
+    else:
+        print(f"Created partitions: {', '.join(ensure_partitions())}")
@@ -2,26 +2,46 @@
 Weather Router for Weather Dashboard API.
 
 Exposes endpoints for weather operations: fetch, save, history, summary, forecast, and reverse geocoding.
+Endpoints that only call OpenWeather are async so they do not hold a threadpool worker during the upstream round-trip.
 All endpoints implement input validation, error handling, and response typing for security and maintainability.
 """
 
-from fastapi import APIRouter, Depends, Query
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
-import requests
-from urllib.parse import urlencode
 
 from app.db import get_db
-from app.schemas import PaginatedWeatherResponse
-from app.config import OPENWEATHER_API_KEY, OPENWEATHER_REVERSE_URL
+from app.config import BATCH_MAX_CITIES, PREDICT_MAX_HOURS
+from app.schemas import PaginatedWeatherResponse, CityBatchRequest, BatchSaveResponse, BatchWeatherResponse
 from app.exceptions import AppError, ValidationError, APIError, DatabaseError
+from app.services.export_service import stream_export, EXPORT_FORMATS
+from app.services.archive import read_archive, serialize_table, ARCHIVE_FORMATS
+from app.services.analytics import get_city_analytics, get_city_series
+from app.services.anomalies import get_alerts
+from app.services.prediction import predict_city, backtest_city
+from app.services.geocode_service import reverse_geocode_city, get_geocode_stats
 from app.utils.validation import validate_city_name
+from app.utils.serialization import FastJSONResponse, rows_to_records, to_utc
+from app.utils.rate_limit import upstream_limiter
+from app.utils.http_cache import make_etag, not_modified, cache_headers, not_modified_response
 from app.services.weather_service import (
-    fetch_current_weather,
+    fetch_current_weather_async,
+    fetch_current_weather_batch,
     save_weather_data,
+    save_weather_batch_data,
     get_weather_history,
     get_daily_summary,
     get_latest_weather,
-    fetch_5day_forecast
+    get_latest_record,
+    get_latest_snapshot,
+    serialize_weather,
+    fetch_5day_forecast_async,
+    get_weather_aggregates,
+    get_weather_comparison,
+    get_city_version,
+    get_cache_stats
 )
 
 router = APIRouter()
@@ -31,42 +51,135 @@ router = APIRouter()
 def list_weathers(
     db: Session = Depends(get_db),
     limit: int = Query(50, ge=1, le=500),
-    offset: int = Query(0, ge=0)
-) -> PaginatedWeatherResponse:
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
+    include_total: bool = Query(True)
+) -> FastJSONResponse:
     """
     List all weather records with pagination and ordered by most recent.
 
     Args:
         db (Session): Database session.
         limit (int): Maximum number of records to return (default 50, max 500).
-        offset (int): Number of records to skip (default 0).
+        offset (int): Number of records to skip (default 0, ignored when cursor is set).
+        cursor (str, optional): next_cursor of the previous page for keyset pagination.
+        include_total (bool): Whether to compute the total count (default True).
 
     Returns:
-        PaginatedWeatherResponse: List of weather records sorted by created_at descending.
+        FastJSONResponse: PaginatedWeatherResponse body with records sorted by created_at descending.
     """
-    return get_weather_history(db=db, limit=limit, offset=offset)
+    page = get_weather_history(
+        db=db, limit=limit, offset=offset, cursor=cursor, include_total=include_total
+    )
+    return FastJSONResponse({**page, "records": rows_to_records(page["records"])})
 
 
 @router.get("/history/{city}", response_model=PaginatedWeatherResponse)
 def weather_history_city(
     city: str,
+    request: Request,
     db: Session = Depends(get_db),
     limit: int = Query(50, ge=1, le=500),
-    offset: int = Query(0, ge=0)
-) -> PaginatedWeatherResponse:
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
+    include_total: bool = Query(True)
+) -> FastJSONResponse:
     """
     Get weather history for a specific city with pagination, ordered by most recent.
 
+    Supports conditional GET: the ETag is derived from the city's newest record
+    and the query string, and a matching If-None-Match (or a fresh
+    If-Modified-Since) returns 304 without running the history query.
+
     Args:
         city (str): Name of the city.
         limit (int): Maximum number of records to return (default 50, max 500).
-        offset (int): Number of records to skip (default 0).
+        offset (int): Number of records to skip (default 0, ignored when cursor is set).
+        cursor (str, optional): next_cursor of the previous page for keyset pagination.
+        include_total (bool): Whether to compute the total count (default True).
+
+    Returns:
+        FastJSONResponse: PaginatedWeatherResponse body with the city's records sorted by created_at descending.
+    """
+    validate_city_name(city)
+    version = get_city_version(city, db)
+    newest = version.newest if version else None
+    etag = make_etag(city, newest, version.rows if version else 0, request.url.query)
+    if not_modified(request, etag, newest):
+        return not_modified_response(etag, newest)
+    page = get_weather_history(
+        db=db, city=city, limit=limit, offset=offset, cursor=cursor, include_total=include_total
+    )
+    return FastJSONResponse(
+        {**page, "records": rows_to_records(page["records"])},
+        headers=cache_headers(etag, newest),
+    )
+
+
+@router.get("/export/{city}")
+def export_history(
+    city: str,
+    db: Session = Depends(get_db),
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to")
+) -> StreamingResponse:
+    """
+    Stream the full weather history of a city as NDJSON or CSV.
+
+    Rows are read with a server-side cursor and written as they arrive, so
+    memory use stays constant regardless of the number of rows.
+
+    Args:
+        city (str): Name of the city.
+        fmt (str): "ndjson" (default) or "csv" (query param "format").
+        start (datetime, optional): Inclusive start of the range (query param "from").
+        end (datetime, optional): Exclusive end of the range (query param "to").
+
+    Returns:
+        StreamingResponse: Records ordered by created_at ascending.
+    """
+    validate_city_name(city)
+    if start and end and start >= end:
+        raise ValidationError("'from' must be earlier than 'to'.")
+    filename = f"weather_{city.replace(' ', '_').lower()}.{fmt}"
+    return StreamingResponse(
+        stream_export(db, city, fmt=fmt, start=start, end=end),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/archive/{city}")
+def archive_export(
+    city: str,
+    fmt: str = Query("arrow", alias="format", pattern="^(arrow|parquet|ndjson)$"),
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns, e.g. temperature,humidity")
+) -> Response:
+    """
+    Export archived (closed-month) history of a city straight from the Parquet archive.
+
+    Only the files overlapping the range and the requested columns are read;
+    the database is not queried.
+
+    Args:
+        city (str): Name of the city.
+        fmt (str): "arrow" IPC stream (default), "parquet" or "ndjson" (query param "format").
+        start (datetime, optional): Inclusive start of the range (query param "from").
+        end (datetime, optional): Exclusive end of the range (query param "to").
+        columns (str, optional): Columns to include; created_at is always returned.
 
     Returns:
-        PaginatedWeatherResponse: List of weather records for the given city sorted by created_at descending.
+        Response: Encoded table ordered by created_at.
     """
     validate_city_name(city)
-    return get_weather_history(db=db, city=city, limit=limit, offset=offset)
+    if start and end and start >= end:
+        raise ValidationError("'from' must be earlier than 'to'.")
+    selected = [c.strip() for c in columns.split(",") if c.strip()] if columns else None
+    table = read_archive(city, start=start, end=end, columns=selected)
+    return Response(content=serialize_table(table, fmt), media_type=ARCHIVE_FORMATS[fmt])
 
 
 @router.post("/save/{city}", response_model=dict)
@@ -91,21 +204,165 @@ def weather_save(city: str, db: Session = Depends(get_db)) -> dict:
         raise AppError(message="Internal server error.", code=500, log=True)
 
 
+@router.post("/save", response_model=BatchSaveResponse)
+def weather_save_batch(payload: CityBatchRequest, db: Session = Depends(get_db)) -> dict:
+    """
+    Fetch current weather for several cities and save them in one transaction.
+
+    Args:
+        payload (CityBatchRequest): Cities to fetch and save.
+        db (Session): Database session.
+
+    Returns:
+        dict: Saved cities and per-city errors. A failing city does not prevent the others from being saved.
+    """
+    return save_weather_batch_data(payload.cities, db=db)
+
+
+async def _weather_batch(cities: list) -> dict:
+    cities = [city for city in cities if city.strip()]
+    if not cities:
+        raise ValidationError("At least one city is required.")
+    if len(cities) > BATCH_MAX_CITIES:
+        raise ValidationError(f"At most {BATCH_MAX_CITIES} cities per batch.")
+    return await fetch_current_weather_batch(cities)
+
+
+@router.post("/batch", response_model=BatchWeatherResponse)
+async def weather_batch(payload: CityBatchRequest) -> dict:
+    """
+    Fetch current weather for several cities concurrently.
+
+    Each city is validated and served from the upstream cache when possible.
+    The whole batch is bounded by BATCH_TIMEOUT_SECONDS: cities still pending
+    then are reported as errors instead of delaying the response.
+
+    Args:
+        payload (CityBatchRequest): Cities to look up.
+
+    Returns:
+        dict: Per-city ``results`` and ``errors`` plus ``duration_ms``.
+
+    Raises:
+        ValidationError: If no city or more than BATCH_MAX_CITIES cities are given.
+    """
+    return await _weather_batch(payload.cities)
+
+
+@router.get("/batch", response_model=BatchWeatherResponse)
+async def weather_batch_query(
+    cities: list[str] = Query(..., description="Cities, repeated (?cities=A&cities=B) or comma-separated")
+) -> dict:
+    """
+    GET variant of the batch lookup: ``/weather/batch?cities=Madrid,London``.
+
+    Returns:
+        dict: Per-city ``results`` and ``errors`` plus ``duration_ms``.
+    """
+    return await _weather_batch([city for value in cities for city in value.split(",")])
+
+
+@router.get("/compare", response_model=dict)
+def compare(
+    db: Session = Depends(get_db),
+    cities: list[str] = Query(..., description="Cities, repeated (?cities=A&cities=B) or comma-separated"),
+    metric: str = Query("temperature", pattern="^(temperature|humidity|pressure|wind_speed)$"),
+    bucket: str = Query("hour", pattern="^(hour|day|week|month)$"),
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to")
+) -> FastJSONResponse:
+    """
+    Compare one metric across cities on time-aligned buckets.
+
+    Read from the rollup tables in a single query, so the cost does not grow
+    with one request per city.
+
+    Args:
+        cities (list[str]): Cities to compare (at most BATCH_MAX_CITIES).
+        metric (str): temperature, humidity, pressure or wind_speed (default temperature).
+        bucket (str): Resolution: hour, day, week or month (default hour).
+        start (datetime, optional): Inclusive start of the range (query param "from");
+            defaults to the last COMPARE_DEFAULT_BUCKETS buckets before ``to`` or now.
+        end (datetime, optional): Exclusive end of the range (query param "to").
+
+    Returns:
+        FastJSONResponse: ``buckets`` (bucket starts) and ``series`` with one
+        list of averages per city aligned with them (null where a city has no data).
+    """
+    return FastJSONResponse(get_weather_comparison(
+        [city for value in cities for city in value.split(",")],
+        metric, bucket, db=db, start=start, end=end,
+    ))
+
+
+@router.get("/alerts", response_model=dict)
+def alerts(
+    db: Session = Depends(get_db),
+    city: Optional[str] = Query(None),
+    kind: Optional[str] = Query(None, pattern="^(zscore|pressure_tendency|out_of_range)$"),
+    since: Optional[datetime] = Query(None),
+    limit: int = Query(50, ge=1, le=500)
+) -> dict:
+    """
+    Anomaly alerts raised by the ingestion detectors, newest first.
+
+    Args:
+        city (str, optional): Only alerts of this city.
+        kind (str, optional): zscore, pressure_tendency or out_of_range.
+        since (datetime, optional): Only alerts observed at or after this time.
+        limit (int): Maximum number of alerts (default 50, max 500).
+
+    Returns:
+        dict: ``{"count": n, "alerts": [...]}``.
+    """
+    if city:
+        validate_city_name(city)
+    records = get_alerts(db, city=city, kind=kind, since=since, limit=limit)
+    return {"count": len(records), "alerts": records}
+
+
+@router.get("/latest", response_model=dict)
+def latest_all(db: Session = Depends(get_db)) -> FastJSONResponse:
+    """
+    Snapshot of the newest stored observation of every city, served from memory.
+
+    The snapshot is reloaded from the database once it is older than
+    LATEST_SNAPSHOT_TTL_SECONDS.
+
+    Returns:
+        FastJSONResponse: ``{"count": n, "records": [...]}`` ordered by city.
+    """
+    records = rows_to_records(get_latest_snapshot(db))
+    return FastJSONResponse({"count": len(records), "records": records})
+
+
 @router.get("/latest/{city}", response_model=dict)
-def latest_weather(city: str, db: Session = Depends(get_db)) -> dict:
+def latest_weather(city: str, request: Request, response: Response, db: Session = Depends(get_db)) -> dict:
     """
-    Retrieve the most recent weather record for a city from the database.
+    Retrieve the most recent weather record for a city.
+
+    Served from the in-memory latest store; an entry not confirmed against the
+    database for LATEST_SNAPSHOT_TTL_SECONDS is refreshed with one indexed
+    query, so rows saved by other processes appear within that delay.
+    Supports conditional GET (ETag / Last-Modified from the newest record).
 
     Args:
         city (str): Name of the city.
         db (Session): Database session.
 
     Returns:
-        dict: Weather record with all recorded metrics.
+        dict: Weather record with all recorded metrics (or 304 Not Modified).
     """
     validate_city_name(city)
     try:
-        return get_latest_weather(city, db=db)
+        record = get_latest_record(city, db)
+        if record is None:
+            return get_latest_weather(city, db=db)
+        etag = make_etag(city, record["created_at"], "latest")
+        if not_modified(request, etag, record["created_at"]):
+            return not_modified_response(etag, record["created_at"])
+        response.headers.update(cache_headers(etag, record["created_at"]))
+        return serialize_weather(record)
     except (AppError, APIError, DatabaseError, ValidationError) as e:
         raise e
     except Exception as e:
@@ -113,18 +370,30 @@ def latest_weather(city: str, db: Session = Depends(get_db)) -> dict:
 
 
 @router.get("/daily-summary/{city}", response_model=dict)
-def daily_summary(city: str, db: Session = Depends(get_db)) -> dict:
+def daily_summary(city: str, request: Request, response: Response, db: Session = Depends(get_db)) -> dict:
     """
-    Get daily min/max/average stats for a city.
+    Get min/max/average stats of the current UTC day for a city.
+
+    Supports conditional GET. The validators also depend on the current UTC
+    day, so a cached summary is not revalidated across midnight UTC.
 
     Args:
         city (str): Name of the city.
         db (Session): Database session.
 
     Returns:
-        dict: Daily summary metrics.
+        dict: Daily summary metrics (or 304 Not Modified).
     """
     validate_city_name(city)
+    version = get_city_version(city, db)
+    if version is not None:
+        today = datetime.now(timezone.utc).date()
+        midnight = datetime.combine(today, datetime.min.time(), tzinfo=timezone.utc)
+        last_modified = max(to_utc(version.newest), midnight)
+        etag = make_etag(city, version.newest, version.rows, "daily-summary", today.isoformat())
+        if not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        response.headers.update(cache_headers(etag, last_modified))
     try:
         return get_daily_summary(city, db=db)
     except (AppError, APIError, DatabaseError, ValidationError) as e:
@@ -133,8 +402,148 @@ def daily_summary(city: str, db: Session = Depends(get_db)) -> dict:
         raise AppError(message="Internal server error.", code=500, log=True)
 
 
+@router.get("/aggregate/{city}", response_model=list)
+def aggregate(
+    city: str,
+    db: Session = Depends(get_db),
+    bucket: str = Query("day", pattern="^(hour|day|week|month)$"),
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to")
+) -> list:
+    """
+    Get aggregated weather metrics for a city from the rollup tables.
+
+    Args:
+        city (str): Name of the city.
+        bucket (str): Resolution: hour, day, week or month (default day).
+        start (datetime, optional): Inclusive start of the range (query param "from").
+        end (datetime, optional): Exclusive end of the range (query param "to").
+
+    Returns:
+        list[dict]: Count, averages and extremes per bucket, oldest first.
+    """
+    validate_city_name(city)
+    return get_weather_aggregates(city, bucket, db=db, start=start, end=end)
+
+
+@router.get("/analytics/{city}", response_model=dict)
+def analytics(
+    city: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    window: int = Query(7, ge=1, le=365)
+) -> FastJSONResponse:
+    """
+    Vectorized statistics over a city's history.
+
+    Supports conditional GET with the same ETag scheme as history/{city}.
+
+    Args:
+        city (str): Name of the city.
+        start (datetime, optional): Inclusive start of the range (query param "from").
+        end (datetime, optional): Exclusive end of the range (query param "to").
+        window (int): Moving-average window in days (default 7).
+
+    Returns:
+        FastJSONResponse: Per-metric distribution and trend, correlations,
+        diurnal cycle and daily series with moving average.
+    """
+    validate_city_name(city)
+    version = get_city_version(city, db)
+    newest = version.newest if version else None
+    etag = make_etag(city, newest, version.rows if version else 0, "analytics", request.url.query)
+    if not_modified(request, etag, newest):
+        return not_modified_response(etag, newest)
+    result = get_city_analytics(city, db=db, start=start, end=end, window=window, version=version)
+    return FastJSONResponse(result, headers=cache_headers(etag, newest))
+
+
+@router.get("/series/{city}", response_model=dict)
+def series(
+    city: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    metric: str = Query("temperature", pattern="^(temperature|humidity|pressure|wind_speed)$"),
+    points: int = Query(500, ge=3, le=5000),
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to")
+) -> FastJSONResponse:
+    """
+    One metric of a city as timestamp/value pairs for charts.
+
+    The series is downsampled on the server with LTTB, so the payload size is
+    bounded by ``points`` however much history exists. Supports conditional
+    GET with the same ETag scheme as history/{city}.
+
+    Args:
+        city (str): Name of the city.
+        metric (str): temperature, humidity, pressure or wind_speed (default temperature).
+        points (int): Maximum number of pairs (default 500, max 5000).
+        start (datetime, optional): Inclusive start of the range (query param "from").
+        end (datetime, optional): Exclusive end of the range (query param "to").
+
+    Returns:
+        FastJSONResponse: ``{"city", "metric", "count", "points", "series": [[timestamp, value], ...]}``.
+    """
+    validate_city_name(city)
+    version = get_city_version(city, db)
+    newest = version.newest if version else None
+    etag = make_etag(city, newest, version.rows if version else 0, "series", request.url.query)
+    if not_modified(request, etag, newest):
+        return not_modified_response(etag, newest)
+    result = get_city_series(city, db=db, metric=metric, points=points, start=start, end=end, version=version)
+    return FastJSONResponse(result, headers=cache_headers(etag, newest))
+
+
+@router.get("/predict/{city}", response_model=dict)
+def predict(
+    city: str,
+    db: Session = Depends(get_db),
+    hours: int = Query(24, ge=1, le=PREDICT_MAX_HOURS)
+) -> dict:
+    """
+    Hourly temperature/humidity predictions from the city's local model.
+
+    The model is trained from stored observations and kept in memory, so no
+    upstream call is made.
+
+    Args:
+        city (str): Name of the city.
+        hours (int): Number of hourly predictions (default 24).
+
+    Returns:
+        dict: Model version, training coverage, in-sample RMSE and predictions.
+    """
+    return predict_city(city, db=db, hours=hours)
+
+
+@router.get("/predict/{city}/backtest", response_model=dict)
+def predict_backtest(
+    city: str,
+    db: Session = Depends(get_db),
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    horizon: int = Query(24, ge=1, le=PREDICT_MAX_HOURS)
+) -> dict:
+    """
+    Walk-forward backtest of the local model against stored actuals.
+
+    Args:
+        city (str): Name of the city.
+        start (datetime, optional): Start of the evaluated range (query param "from"; default: last 7 days).
+        end (datetime, optional): Exclusive end of the evaluated range (query param "to").
+        horizon (int): Forecast horizon in hours (default 24).
+
+    Returns:
+        dict: MAE/RMSE per target for the model and a persistence baseline.
+    """
+    return backtest_city(city, db=db, start=start, end=end, horizon_hours=horizon)
+
+
 @router.get("/forecast/{city}", response_model=list)
-def forecast(city: str) -> list:
+async def forecast(city: str) -> list:
     """
     Fetch 5-day weather forecast from external API.
 
@@ -146,7 +555,7 @@ def forecast(city: str) -> list:
     """
     validate_city_name(city)
     try:
-        data = fetch_5day_forecast(city)
+        data = await fetch_5day_forecast_async(city)
         if not data:
             raise APIError(message=f"No forecast available for {city}", log=True)
         return data
@@ -156,10 +565,51 @@ def forecast(city: str) -> list:
         raise AppError(message="Internal server error.", code=500, log=True)
 
 
+@router.get("/cache/stats", response_model=dict)
+def cache_stats() -> dict:
+    """
+    Report hit/miss/eviction statistics of the upstream weather cache.
+
+    Returns:
+        dict: Cache size, hits, misses, coalesced loads, evictions, expirations and hit rate.
+    """
+    return get_cache_stats()
+
+
+@router.get("/upstream/budget", response_model=dict)
+def upstream_budget() -> dict:
+    """
+    Remaining OpenWeather call budget of the shared rate limiter.
+
+    Returns:
+        dict: Tokens available (overall and for interactive requests), queued
+        callers, grant/reject counters per priority class and daily quota usage.
+    """
+    return upstream_limiter.stats()
+
+
+@router.get("/reverse-geocode/stats", response_model=dict)
+def reverse_geocode_stats() -> dict:
+    """
+    Report hit rate of the reverse geocoding caches.
+
+    Returns:
+        dict: Memory cache stats, database hits, upstream calls and overall local hit rate.
+    """
+    return get_geocode_stats()
+
+
 @router.get("/reverse-geocode", response_model=dict)
-def reverse_geocode(lat: float = Query(...), lon: float = Query(...)) -> dict:
+async def reverse_geocode(
+    lat: float = Query(...),
+    lon: float = Query(...),
+    db: Session = Depends(get_db)
+) -> dict:
     """
-    Reverse geocode coordinates to city name using OpenWeather API.
+    Reverse geocode coordinates to city name.
+
+    Coordinates are quantized to a geohash cell and answered from the in-memory
+    or database cache; OpenWeather is only called for unseen cells.
 
     Args:
         lat (float): Latitude.
@@ -171,30 +621,11 @@ def reverse_geocode(lat: float = Query(...), lon: float = Query(...)) -> dict:
     Raises:
         HTTPException: If coordinates are invalid or city not found.
     """
-    if not (-90 <= lat <= 90) or not (-180 <= lon <= 180):
-        raise ValidationError(message="Invalid latitude or longitude values.")
-    if not OPENWEATHER_API_KEY:
-        raise APIError(message="API key not configured.", log=True)
-    params = {
-        "lat": lat,
-        "lon": lon,
-        "limit": 1,
-        "appid": OPENWEATHER_API_KEY
-    }
-    url = f"{OPENWEATHER_REVERSE_URL}?{urlencode(params)}"
-    try:
-        res = requests.get(url)
-        res.raise_for_status()
-        data = res.json()
-        if not data or "name" not in data[0]:
-            raise APIError(message="City not found for given coordinates.", code=404, log=True)
-        return {"city": data[0]["name"]}
-    except requests.RequestException as e:
-        raise APIError(message="Failed to reverse geocode coordinates.", log=True)
+    return await reverse_geocode_city(lat, lon, db)
 
 
 @router.get("/{city}", response_model=dict)
-def weather(city: str) -> dict:
+async def weather(city: str) -> dict:
     """
     Fetch current weather data from external API for a given city.
 
@@ -216,7 +647,7 @@ def weather(city: str) -> dict:
     """
     validate_city_name(city)
     try:
-        return fetch_current_weather(city)
+        return await fetch_current_weather_async(city)
     except (AppError, APIError, DatabaseError, ValidationError) as e:
         raise e
     except Exception as e:
@@ -1,23 +1,127 @@
 # app/scheduler.py
+"""
+Background scheduler for periodic weather ingestion.
+
+Function:
+- fetch_and_save_all_cities() : fetches every city in CITIES concurrently (by
+  OpenWeather id in group requests once resolved) and bulk-saves all valid
+  observations in a single transaction.
+- ensure_partitions() : daily, creates upcoming monthly weather_data partitions.
+- archive_closed_months() : monthly (ARCHIVE_ENABLED), moves closed months to Parquet.
+
+Every job's duration and failures are exported through app.metrics.
+"""
 from apscheduler.schedulers.background import BackgroundScheduler
-from app.crud import save_weather
+from app.crud import fetch_weather_many, save_weather_batch
+from app.partitions import ensure_partitions
+from app.config import CITIES, SCHEDULER_MAX_WORKERS, SCHEDULER_GROUP_REQUESTS, ARCHIVE_ENABLED
 from app.db import SessionLocal
-from app.config import CITIES
+from app.services.archive import archive_closed_periods
+from app.services.city_registry import get_city_ids, register_cities, unregister_cities
+from app.metrics import timed_job
+from app.utils.rate_limit import upstream_priority, SCHEDULED
 import time
 import logging
 
 logger = logging.getLogger(__name__)
 
-def fetch_and_save_all_cities():
-    db = SessionLocal()
-    for city in CITIES:
+def fetch_and_save_all_cities(cities=None, max_workers: int = SCHEDULER_MAX_WORKERS, db=None) -> dict:
+    """
+    Fetch weather for all tracked cities in parallel and save the results together.
+
+    Upstream calls use the "scheduled" rate-limit class, so they may use the
+    tokens reserved for ingestion and queue longer than interactive requests.
+
+    With SCHEDULER_GROUP_REQUESTS, cities already in the city registry are
+    fetched through OpenWeather group requests (OPENWEATHER_GROUP_SIZE ids per
+    call); the rest are fetched by name and registered from their payloads, so
+    they join the group requests from the next run on. A registered city the
+    group endpoint no longer returns is fetched by name and re-registered with
+    the id from that payload (or left unregistered if that fails too).
+
+    Args:
+        cities (list[str], optional): Cities to ingest. Defaults to CITIES.
+        max_workers (int): Maximum number of concurrent upstream requests.
+        db (Session, optional): Database session. A new one is opened if omitted.
+
+    Returns:
+        dict: Ingestion report with saved cities, per-city failures,
+        per-city latency in milliseconds, upstream calls made and total duration.
+    """
+    start = time.perf_counter()
+    cities = list(cities if cities is not None else CITIES)
+    session = db if db is not None else SessionLocal()
+    try:
+        city_ids = {}
+        if SCHEDULER_GROUP_REQUESTS:
+            try:
+                city_ids = get_city_ids(session, cities)
+            except Exception as e:
+                session.rollback()
+                logger.warning(f"City registry unavailable, fetching cities by name: {e}")
+
+        with upstream_priority(SCHEDULED):
+            fetched = fetch_weather_many(cities, max_workers=max_workers, city_ids=city_ids)
+        results, failures = fetched["results"], fetched["failures"]
+
+        if SCHEDULER_GROUP_REQUESTS:
+            try:
+                stale = unregister_cities(session, fetched["missing_from_group"])
+                if stale:
+                    logger.warning(f"Dropped stale OpenWeather ids for {', '.join(stale)}")
+                resolved = register_cities(
+                    session, {c: data for c, data in results.items() if c not in city_ids or c in stale}
+                )
+                if resolved:
+                    logger.info(f"Registered OpenWeather ids for {', '.join(resolved)}")
+            except Exception as e:
+                session.rollback()
+                logger.warning(f"Could not update the city registry: {e}")
+
+        saved = []
         try:
-            save_weather(city, db=db)
+            batch = save_weather_batch(results, db=session)
+            saved = batch["saved"]
+            failures.update(batch["failures"])
         except Exception as e:
-            logger.error(f"Error saving {city}: {e}")
-    db.close()
+            logger.error(f"Error saving scheduled weather batch: {e}")
+            failures.update({city: getattr(e, "message", str(e)) for city in results})
+    finally:
+        if db is None:
+            session.close()
+
+    report = {
+        "saved": saved,
+        "failures": failures,
+        "latency_ms": fetched["latency_ms"],
+        "upstream_calls": fetched["upstream_calls"],
+        "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+    for city, error in failures.items():
+        logger.error(f"Error saving {city}: {error}")
+    logger.info(
+        f"Scheduled ingestion finished: {len(saved)} saved, {len(failures)} failed "
+        f"with {report['upstream_calls']} upstream calls in {report['duration_ms']} ms"
+    )
+    return report
+
+def archive_closed_months() -> list:
+    """Archive every closed city-month of weather_data to Parquet."""
+    db = SessionLocal()
+    try:
+        archived = archive_closed_periods(db)
+        logger.info(f"Archived {len(archived)} city-months to Parquet.")
+        return archived
+    except Exception as e:
+        logger.error(f"Error archiving closed months: {e}")
+        return []
+    finally:
+        db.close()
 
 def start_scheduler():
     scheduler = BackgroundScheduler()
-    scheduler.add_job(fetch_and_save_all_cities, 'cron', minute=0)
-    scheduler.start()
\ No newline at end of file
+    scheduler.add_job(timed_job("ingest", fetch_and_save_all_cities), 'cron', minute=0)
+    scheduler.add_job(timed_job("ensure_partitions", ensure_partitions), 'cron', hour=0, minute=30)
+    if ARCHIVE_ENABLED:
+        scheduler.add_job(timed_job("archive", archive_closed_months), 'cron', day=1, hour=2, minute=0)
+    scheduler.start()
@@ -9,12 +9,15 @@ Schemas:
 - WeatherCreate : fields required to create a new weather record.
 - WeatherResponse : fields returned in API responses (includes id and created_at).
 - PaginatedWeatherResponse : response wrapper for lists with pagination.
+- CityBatchRequest : list of cities for bulk operations.
+- BatchSaveResponse : per-city outcome of a bulk save.
+- BatchWeatherResponse : per-city current weather and errors of a batch lookup.
 """
-from pydantic import BaseModel, field_serializer
-from typing import List, Optional
+from pydantic import BaseModel, Field, field_serializer
+from typing import Dict, List, Optional
 from datetime import datetime
 from uuid import UUID
-from zoneinfo import ZoneInfo
+from app.utils.serialization import UTC, LOCAL_TZ
 
 class WeatherBase(BaseModel):
     city: str
@@ -61,9 +64,28 @@ class WeatherResponse(WeatherBase):
     def serialize_created_at(self, dt: datetime, _info):
         if dt is None:
             return None
-        return dt.replace(tzinfo=ZoneInfo("UTC")).astimezone(ZoneInfo("Europe/Madrid"))
+        return dt.replace(tzinfo=UTC).astimezone(LOCAL_TZ)
 
 class PaginatedWeatherResponse(BaseModel):
-    """Schema for paginated weather responses."""
-    total: int
-    records: List[WeatherResponse]
\ No newline at end of file
+    """Schema for paginated weather responses.
+
+    ``total`` is None when the count was not requested; ``next_cursor`` is None on the last page.
+    """
+    total: Optional[int] = None
+    records: List[WeatherResponse]
+    next_cursor: Optional[str] = None
+
+class CityBatchRequest(BaseModel):
+    """Schema for requests that operate on several cities at once."""
+    cities: List[str] = Field(..., min_length=1, max_length=100)
+
+class BatchSaveResponse(BaseModel):
+    """Schema for the result of a bulk save."""
+    saved: List[str]
+    failures: Dict[str, str]
+
+class BatchWeatherResponse(BaseModel):
+    """Schema for the result of a batch current-weather lookup."""
+    results: Dict[str, dict]
+    errors: Dict[str, str]
+    duration_ms: float
@@ -0,0 +1,318 @@
+"""
+Analytics Service.
+
+Vectorized statistics over a city's observation history. The requested range
+is loaded once as columnar NumPy arrays (one SELECT of five columns, no ORM
+objects, timestamps converted to epoch seconds by the database) and every
+statistic is computed with array operations, so a multi-year range costs a
+few milliseconds of computation on top of the query. Results are cached until
+the city receives a new observation.
+
+Computed:
+- Per metric (temperature, humidity, pressure, wind_speed): mean, std, min, max,
+  p5/p25/p50/p75/p95 and the least-squares linear trend per day.
+- Pearson correlations of temperature with humidity, pressure and wind speed.
+- Diurnal cycle: mean/max daily temperature range and the mean temperature
+  per hour of day.
+- Daily series: mean/min/max temperature per day plus its moving average over
+  ``window`` days.
+
+Days and hours are UTC, like the stored timestamps.
+
+Functions:
+- load_series(db: Session, city: str, start, end) -> dict[str, np.ndarray]
+- compute_analytics(series: dict, window: int) -> dict
+- get_city_analytics(city: str, db: Session, start, end, window) -> dict
+    Cached per (city, newest observation, range, window).
+- get_city_series(city: str, db: Session, metric, points, start, end) -> dict
+    One metric downsampled with LTTB to at most ``points`` timestamp/value
+    pairs, so chart payloads do not grow with the history.
+"""
+from datetime import datetime, timezone
+from typing import Dict, Optional, Sequence
+import numpy as np
+from sqlalchemy import extract, func, select
+from sqlalchemy.orm import Session
+from app.config import WEATHER_CACHE_TTL_SECONDS
+from app.exceptions import AppError, ValidationError
+from app.models import Weather
+from app.utils.cache import TTLCache
+from app.utils.downsampling import lttb
+from app.utils.validation import validate_city_name
+
+METRICS = ("temperature", "humidity", "pressure", "wind_speed")
+PERCENTILES = (5, 25, 50, 75, 95)
+SECONDS_PER_DAY = 86400
+
+analytics_cache = TTLCache(maxsize=256, ttl=WEATHER_CACHE_TTL_SECONDS)
+
+def _epoch_column(db: Session):
+    """created_at as UTC epoch seconds computed by the database, so no datetime objects are built per row."""
+    if db.get_bind().dialect.name == "postgresql":
+        return extract("epoch", Weather.created_at)
+    # SQLite stores naive UTC timestamps as text; 2440587.5 is the Julian day of 1970-01-01.
+    return (func.julianday(Weather.created_at) - 2440587.5) * SECONDS_PER_DAY
+
+def load_series(
+    db: Session,
+    city: str,
+    start: datetime = None,
+    end: datetime = None,
+    metrics: Sequence[str] = METRICS,
+) -> Dict[str, np.ndarray]:
+    """
+    Load a city's observations as columnar arrays ordered by time.
+
+    Args:
+        db (Session): Database session.
+        city (str): Name of the city.
+        start (datetime, optional): Inclusive start of the range.
+        end (datetime, optional): Exclusive end of the range.
+        metrics (Sequence[str]): Metric columns to load (default: all of METRICS).
+
+    Returns:
+        dict: ``ts`` (UTC epoch seconds) and one float array per metric; missing values are NaN.
+    """
+    columns = [_epoch_column(db)] + [getattr(Weather, name) for name in metrics]
+    stmt = select(*columns).where(Weather.city == city).order_by(Weather.created_at)
+    if start is not None:
+        stmt = stmt.where(Weather.created_at >= start)
+    if end is not None:
+        stmt = stmt.where(Weather.created_at < end)
+
+    rows = db.execute(stmt).all()
+    values = list(zip(*rows)) if rows else [[] for _ in columns]
+    # Rounded to milliseconds: julianday() arithmetic carries ~1e-5 s of float error.
+    series = {"ts": np.round(np.array(values[0], dtype=float), 3)}
+    for name, column in zip(metrics, values[1:]):
+        series[name] = np.array(column, dtype=float)
+    return series
+
+def _num(value, digits: int = 3) -> Optional[float]:
+    """JSON-safe rounded float (NaN and infinities become None)."""
+    value = float(value)
+    return round(value, digits) if np.isfinite(value) else None
+
+def _trend_per_day(days: np.ndarray, values: np.ndarray) -> Optional[float]:
+    """Least-squares slope of values over time, in units per day."""
+    mask = ~np.isnan(values)
+    if mask.sum() < 2:
+        return None
+    x, y = days[mask], values[mask]
+    x = x - x.mean()
+    denominator = np.dot(x, x)
+    return _num(np.dot(x, y - y.mean()) / denominator, 5) if denominator else None
+
+def _correlation(a: np.ndarray, b: np.ndarray) -> Optional[float]:
+    """Pearson correlation over the samples where both values are present."""
+    mask = ~(np.isnan(a) | np.isnan(b))
+    if mask.sum() < 3:
+        return None
+    a, b = a[mask] - a[mask].mean(), b[mask] - b[mask].mean()
+    denominator = np.sqrt(np.dot(a, a) * np.dot(b, b))
+    return _num(np.dot(a, b) / denominator, 4) if denominator else None
+
+def _metric_stats(days: np.ndarray, values: np.ndarray) -> dict:
+    present = values[~np.isnan(values)]
+    if present.size == 0:
+        return {"count": 0}
+    percentiles = np.percentile(present, PERCENTILES)
+    return {
+        "count": int(present.size),
+        "mean": _num(present.mean()),
+        "std": _num(present.std()),
+        "min": _num(present.min()),
+        "max": _num(present.max()),
+        "percentiles": {f"p{p}": _num(v) for p, v in zip(PERCENTILES, percentiles)},
+        "trend_per_day": _trend_per_day(days, values),
+    }
+
+def _daily(ts: np.ndarray, temperature: np.ndarray, window: int) -> tuple:
+    """Per-day temperature mean/min/max and the moving average of the daily means."""
+    mask = ~np.isnan(temperature)
+    ts, temperature = ts[mask], temperature[mask]
+    if ts.size == 0:
+        return [], None, None
+
+    day_index = (ts // SECONDS_PER_DAY).astype(np.int64)
+    # Rows are time-ordered, so each day is one contiguous run.
+    days, starts, counts = np.unique(day_index, return_index=True, return_counts=True)
+    means = np.add.reduceat(temperature, starts) / counts
+    mins = np.minimum.reduceat(temperature, starts)
+    maxs = np.maximum.reduceat(temperature, starts)
+    ranges = maxs - mins
+
+    cumulative = np.concatenate(([0.0], np.cumsum(means)))
+    width = np.minimum(np.arange(1, days.size + 1), window)
+    moving = (cumulative[1:] - cumulative[np.arange(days.size) + 1 - width]) / width
+
+    dates = np.array(days, dtype="datetime64[D]").astype(str)
+    daily = [
+        {
+            "date": d,
+            "mean_temperature": _num(mean),
+            "min_temperature": _num(low),
+            "max_temperature": _num(high),
+            "range": _num(rng),
+            "moving_average": _num(avg),
+        }
+        for d, mean, low, high, rng, avg in zip(
+            dates.tolist(), means.tolist(), mins.tolist(), maxs.tolist(), ranges.tolist(), moving.tolist()
+        )
+    ]
+    return daily, _num(ranges.mean()), _num(ranges.max())
+
+def compute_analytics(series: Dict[str, np.ndarray], window: int = 7) -> dict:
+    """
+    Compute every statistic of the module docstring from loaded arrays.
+
+    Args:
+        series (dict): Output of load_series.
+        window (int): Moving-average window in days.
+
+    Returns:
+        dict: ``count``, ``from``/``to``, ``metrics``, ``correlations``,
+        ``diurnal`` and ``daily``.
+    """
+    ts = series["ts"]
+    if ts.size == 0:
+        return {"count": 0, "from": None, "to": None, "metrics": {}, "correlations": {}, "diurnal": None, "daily": []}
+
+    days = (ts - ts[0]) / SECONDS_PER_DAY
+    temperature = series["temperature"]
+    daily, mean_range, max_range = _daily(ts, temperature, window)
+
+    mask = ~np.isnan(temperature)
+    hours = ((ts[mask] % SECONDS_PER_DAY) // 3600).astype(np.int64)
+    hour_counts = np.bincount(hours, minlength=24)
+    hour_sums = np.bincount(hours, weights=temperature[mask], minlength=24)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        hourly_mean = hour_sums / hour_counts
+
+    return {
+        "count": int(ts.size),
+        "from": datetime.fromtimestamp(ts[0], tz=timezone.utc).isoformat(),
+        "to": datetime.fromtimestamp(ts[-1], tz=timezone.utc).isoformat(),
+        "metrics": {name: _metric_stats(days, series[name]) for name in METRICS},
+        "correlations": {
+            f"temperature_{name}": _correlation(temperature, series[name])
+            for name in ("humidity", "pressure", "wind_speed")
+        },
+        "diurnal": {
+            "mean_range": mean_range,
+            "max_range": max_range,
+            "hourly_mean_temperature": [_num(v) for v in hourly_mean.tolist()],
+        },
+        "window_days": window,
+        "daily": daily,
+    }
+
+def get_city_analytics(
+    city: str,
+    db: Session,
+    start: datetime = None,
+    end: datetime = None,
+    window: int = 7,
+    version: tuple = None,
+) -> dict:
+    """
+    Analytics of a city over an optional time range.
+
+    Results are cached per (city, version, range, window); ``version`` is the
+    city's newest created_at and row count, so new observations and purges
+    invalidate the entry.
+
+    Args:
+        city (str): Name of the city.
+        db (Session): Database session.
+        start (datetime, optional): Inclusive start of the range.
+        end (datetime, optional): Exclusive end of the range.
+        window (int): Moving-average window in days.
+        version (tuple, optional): CityVersion of the city (newest created_at, row count).
+
+    Returns:
+        dict: ``{"city": ..., **compute_analytics(...)}``.
+
+    Raises:
+        ValidationError: If city name or range is invalid.
+        AppError: If the query fails.
+    """
+    validate_city_name(city)
+    if start and end and start >= end:
+        raise ValidationError("'from' must be earlier than 'to'.")
+    key = (city.lower(), version, start, end, window)
+    try:
+        return analytics_cache.get_or_load(
+            key, lambda: {"city": city, **compute_analytics(load_series(db, city, start, end), window)}
+        )
+    except Exception as e:
+        raise AppError(message=f"Error computing analytics for {city}: {str(e)}", code=502)
+
+def downsample_series(ts: np.ndarray, values: np.ndarray, points: int) -> list:
+    """
+    ``[ISO-8601 UTC timestamp, value]`` pairs of the LTTB-selected points.
+
+    Args:
+        ts (np.ndarray): Ascending UTC epoch seconds.
+        values (np.ndarray): Values at ts; NaN samples are dropped first.
+        points (int): Maximum number of pairs.
+
+    Returns:
+        list: Downsampled pairs in time order.
+    """
+    mask = ~np.isnan(values)
+    ts, values = ts[mask], values[mask]
+    keep = lttb(ts, values, points)
+    stamps = (ts[keep] * 1000).round().astype("datetime64[ms]").astype(str)
+    return [[f"{stamp}Z", _num(value)] for stamp, value in zip(stamps.tolist(), values[keep].tolist())]
+
+def get_city_series(
+    city: str,
+    db: Session,
+    metric: str = "temperature",
+    points: int = 500,
+    start: datetime = None,
+    end: datetime = None,
+    version: tuple = None,
+) -> dict:
+    """
+    One metric of a city as chart-ready pairs, downsampled with LTTB.
+
+    Only the timestamp and the metric column are loaded. Results are cached
+    like get_city_analytics.
+
+    Args:
+        city (str): Name of the city.
+        db (Session): Database session.
+        metric (str): One of METRICS.
+        points (int): Maximum number of returned pairs (at least 3).
+        start (datetime, optional): Inclusive start of the range.
+        end (datetime, optional): Exclusive end of the range.
+        version (tuple, optional): CityVersion of the city (newest created_at, row count).
+
+    Returns:
+        dict: ``city``, ``metric``, ``count`` (observations in range),
+        ``points`` and ``series`` (``[timestamp, value]`` pairs).
+
+    Raises:
+        ValidationError: If city name, metric, points or range is invalid.
+        AppError: If the query fails.
+    """
+    validate_city_name(city)
+    if metric not in METRICS:
+        raise ValidationError(f"Unknown metric '{metric}'. Valid metrics: {', '.join(METRICS)}.")
+    if points < 3:
+        raise ValidationError("'points' must be at least 3.")
+    if start and end and start >= end:
+        raise ValidationError("'from' must be earlier than 'to'.")
+
+    def load() -> dict:
+        series = load_series(db, city, start, end, metrics=(metric,))
+        pairs = downsample_series(series["ts"], series[metric], points)
+        return {"city": city, "metric": metric, "count": int(series["ts"].size), "points": len(pairs), "series": pairs}
+
+    key = ("series", city.lower(), version, metric, points, start, end)
+    try:
+        return analytics_cache.get_or_load(key, load)
+    except Exception as e:
+        raise AppError(message=f"Error loading {metric} series for {city}: {str(e)}", code=502)
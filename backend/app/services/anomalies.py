@@ -0,0 +1,209 @@
+"""
+Anomaly Detection.
+
+Per-city streaming detectors updated by the save path. Each detector keeps a
+constant-size state row (detector_state) that is folded forward once per new
+observation, so detection never rescans weather_data and survives restarts.
+
+Detectors:
+- zscore:<metric> (temperature, humidity, pressure, wind_speed) : exponentially
+  weighted mean and variance; once ANOMALY_MIN_SAMPLES have been seen, an
+  observation more than ANOMALY_ZSCORE_THRESHOLD standard deviations from the
+  mean raises a "zscore" alert.
+- pressure_tendency : pressure change against a reference reading at least
+  PRESSURE_TENDENCY_HOURS old; a change of PRESSURE_TENDENCY_ALERT_HPA or more
+  (scaled to that period) raises a "pressure_tendency" alert.
+- Range check (stateless) : temperature/humidity outside TEMP_MIN..TEMP_MAX or
+  HUMIDITY_MIN..HUMIDITY_MAX raise an "out_of_range" alert.
+
+Functions:
+- detect_anomalies(db: Session, rows: list[dict]) -> list[dict]
+    Updates detector state and inserts alerts (same transaction, no commit).
+- get_alerts(db: Session, city, kind, since, limit) -> list[dict]
+    Returns stored alerts, newest first.
+"""
+import math
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from app.config import (
+    ANOMALY_DETECTION_ENABLED,
+    ANOMALY_EWMA_ALPHA,
+    ANOMALY_ZSCORE_THRESHOLD,
+    ANOMALY_MIN_SAMPLES,
+    PRESSURE_TENDENCY_HOURS,
+    PRESSURE_TENDENCY_ALERT_HPA,
+    TEMP_MIN,
+    TEMP_MAX,
+    HUMIDITY_MIN,
+    HUMIDITY_MAX,
+)
+from app.metrics import WEATHER_ALERTS
+from app.models import Alert, DetectorState
+from app.utils.serialization import to_utc
+
+ZSCORE_METRICS = ("temperature", "humidity", "pressure", "wind_speed")
+PRESSURE_TENDENCY = "pressure_tendency"
+RANGES = {"temperature": (TEMP_MIN, TEMP_MAX), "humidity": (HUMIDITY_MIN, HUMIDITY_MAX)}
+# Readings further apart than this are a gap in the data, not a tendency.
+MAX_TENDENCY_GAP_FACTOR = 4
+
+def _alert(row: dict, kind: str, metric: str, value: float, message: str,
+           expected: float = None, score: float = None) -> dict:
+    return {
+        "city": row["city"], "kind": kind, "metric": metric, "value": value,
+        "expected": None if expected is None else round(expected, 3),
+        "score": None if score is None else round(score, 3),
+        "message": message[:255], "observed_at": row["created_at"],
+    }
+
+def _zscore(state: DetectorState, row: dict, metric: str, value: float) -> Optional[dict]:
+    """Score value against the EWMA mean/variance, then fold it into them."""
+    alert = None
+    if state.count >= ANOMALY_MIN_SAMPLES and state.variance and state.variance > 0:
+        score = (value - state.mean) / math.sqrt(state.variance)
+        if abs(score) >= ANOMALY_ZSCORE_THRESHOLD:
+            alert = _alert(
+                row, "zscore", metric, value,
+                f"{metric} {value:g} is {score:+.1f} standard deviations from the recent mean {state.mean:.1f}",
+                expected=state.mean, score=score,
+            )
+
+    if state.count == 0 or state.mean is None:
+        state.mean, state.variance = value, 0.0
+    else:
+        # Incremental exponentially weighted mean and variance (Finch, 2009).
+        diff = value - state.mean
+        increment = ANOMALY_EWMA_ALPHA * diff
+        state.mean += increment
+        state.variance = (1 - ANOMALY_EWMA_ALPHA) * (state.variance + diff * increment)
+    state.count += 1
+    state.last_value, state.last_at = value, row["created_at"]
+    return alert
+
+def _pressure_tendency(state: DetectorState, row: dict, pressure: float) -> Optional[dict]:
+    """Compare pressure with the reference reading once it is PRESSURE_TENDENCY_HOURS old."""
+    now = to_utc(row["created_at"])
+    state.count += 1
+    if state.last_at is None or state.last_value is None:
+        state.last_value, state.last_at = pressure, now
+        return None
+
+    hours = (now - to_utc(state.last_at)).total_seconds() / 3600
+    if hours < PRESSURE_TENDENCY_HOURS:
+        return None
+
+    alert = None
+    if hours <= PRESSURE_TENDENCY_HOURS * MAX_TENDENCY_GAP_FACTOR:
+        tendency = (pressure - state.last_value) * PRESSURE_TENDENCY_HOURS / hours
+        if abs(tendency) >= PRESSURE_TENDENCY_ALERT_HPA:
+            direction = "falling" if tendency < 0 else "rising"
+            alert = _alert(
+                row, PRESSURE_TENDENCY, "pressure", pressure,
+                f"Pressure {direction} {abs(tendency):.1f} hPa per {PRESSURE_TENDENCY_HOURS:g} h",
+                expected=state.last_value, score=tendency,
+            )
+    state.last_value, state.last_at = pressure, now
+    return alert
+
+def _out_of_range(row: dict) -> List[dict]:
+    alerts = []
+    for metric, (low, high) in RANGES.items():
+        value = row.get(metric)
+        if value is not None and not (low <= value <= high):
+            alerts.append(_alert(row, "out_of_range", metric, value,
+                                 f"{metric} {value:g} outside the valid range {low:g}..{high:g}"))
+    return alerts
+
+def _load_states(db: Session, cities: List[str]) -> Dict[tuple, DetectorState]:
+    """Detector states of the given cities, locked for update where the database supports it."""
+    query = select(DetectorState).where(DetectorState.city.in_(cities)).with_for_update()
+    return {(s.city, s.detector): s for s in db.scalars(query)}
+
+def detect_anomalies(db: Session, rows: List[dict]) -> List[dict]:
+    """
+    Run every detector over newly inserted observations.
+
+    Runs inside the caller's transaction and does not commit, so detector state
+    only advances together with the observations it has seen. Cost is one
+    SELECT of the batch's detector states plus O(1) work per observation.
+
+    Args:
+        db (Session): Database session.
+        rows (list[dict]): Inserted observations (Weather column values incl. created_at).
+
+    Returns:
+        list[dict]: Alerts raised (also inserted into the alerts table).
+    """
+    if not ANOMALY_DETECTION_ENABLED or not rows:
+        return []
+
+    states = _load_states(db, sorted({row["city"] for row in rows}))
+
+    def state(city: str, detector: str) -> DetectorState:
+        key = (city, detector)
+        if key not in states:
+            states[key] = DetectorState(city=city, detector=detector, count=0)
+            db.add(states[key])
+        return states[key]
+
+    alerts = []
+    for row in sorted(rows, key=lambda r: to_utc(r["created_at"])):
+        alerts.extend(_out_of_range(row))
+        for metric in ZSCORE_METRICS:
+            value = row.get(metric)
+            if value is not None:
+                alerts.append(_zscore(state(row["city"], f"zscore:{metric}"), row, metric, float(value)))
+        if row.get("pressure") is not None:
+            alerts.append(_pressure_tendency(state(row["city"], PRESSURE_TENDENCY), row, float(row["pressure"])))
+
+    alerts = [a for a in alerts if a is not None]
+    if alerts:
+        db.execute(insert(Alert), alerts)
+        for a in alerts:
+            WEATHER_ALERTS.labels(a["kind"]).inc()
+    return alerts
+
+def get_alerts(
+    db: Session,
+    city: str = None,
+    kind: str = None,
+    since: datetime = None,
+    limit: int = 50,
+) -> List[dict]:
+    """
+    Return stored alerts, newest first.
+
+    Args:
+        db (Session): Database session.
+        city (str, optional): Only alerts of this city.
+        kind (str, optional): Only alerts of this kind (zscore, pressure_tendency, out_of_range).
+        since (datetime, optional): Only alerts observed at or after this time.
+        limit (int): Maximum number of alerts.
+
+    Returns:
+        list[dict]: Alerts with ISO-8601 UTC observed_at.
+    """
+    query = select(Alert)
+    if city:
+        query = query.where(Alert.city == city)
+    if kind:
+        query = query.where(Alert.kind == kind)
+    if since is not None:
+        query = query.where(Alert.observed_at >= since)
+    query = query.order_by(Alert.observed_at.desc(), Alert.id.desc()).limit(limit)
+    return [
+        {
+            "id": a.id,
+            "city": a.city,
+            "kind": a.kind,
+            "metric": a.metric,
+            "value": a.value,
+            "expected": a.expected,
+            "score": a.score,
+            "message": a.message,
+            "observed_at": to_utc(a.observed_at).isoformat(),
+        }
+        for a in db.scalars(query)
+    ]
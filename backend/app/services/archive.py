@@ -0,0 +1,258 @@
+"""
+Columnar Archive.
+
+Moves closed months of weather_data into compressed Parquet files (one per
+city per month) and serves range exports straight from them, so long-range
+analytics read only the requested columns from memory-mapped files instead of
+re-querying the hot table row by row.
+
+Layout: ``{ARCHIVE_DIR}/city={slug}-{hash}/{YYYY}-{MM}.parquet``, where the
+hash of the exact city name keeps cities with the same slug apart.
+
+Functions:
+- archive_month(db, city, year, month, purge) -> dict
+    Writes one city-month to Parquet, optionally deleting the archived rows.
+- archive_closed_periods(db, before, purge) -> list
+    Archives every city-month that ended before ``before`` (default: current month)
+    and still has rows in weather_data.
+- read_archive(city, start, end, columns) -> pyarrow.Table
+    Reads a time range from the archive with column pruning and memory mapping.
+- serialize_table(table, fmt) -> bytes
+    Encodes a table as Arrow IPC stream, Parquet or NDJSON.
+"""
+import io
+import json
+import logging
+import os
+import re
+import zlib
+from datetime import date, datetime, timezone
+from typing import List, Optional
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc
+import pyarrow.parquet
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+from app.config import ARCHIVE_DIR, ARCHIVE_PURGE
+from app.exceptions import AppError
+from app.models import Weather
+from app.partitions import month_ranges
+from app.utils.serialization import to_utc
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMATS = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+    "ndjson": "application/x-ndjson",
+}
+ARCHIVE_COLUMNS = [c.name for c in Weather.__table__.columns]
+
+def _schema():
+    """Arrow schema matching the weather_data columns."""
+    types = {
+        "id": pa.string(),
+        "city": pa.string(),
+        "country": pa.string(),
+        "description": pa.string(),
+        "icon": pa.string(),
+        "pressure": pa.int64(),
+        "sea_level": pa.int64(),
+        "grnd_level": pa.int64(),
+        "wind_deg": pa.int64(),
+        "visibility": pa.int64(),
+        "clouds": pa.int64(),
+        "sunrise": pa.int64(),
+        "sunset": pa.int64(),
+        "created_at": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(name, types.get(name, pa.float64())) for name in ARCHIVE_COLUMNS])
+
+def _slug(city: str) -> str:
+    """Readable directory name for a city, unique per exact city name."""
+    readable = re.sub(r"[^a-z0-9]+", "_", city.strip().lower()).strip("_") or "city"
+    return f"{readable}-{zlib.crc32(city.encode()):08x}"
+
+def _month_bounds(year: int, month: int) -> tuple:
+    lower, upper = month_ranges(date(year, month, 1), 0)[0]
+    return (datetime.combine(lower, datetime.min.time(), tzinfo=timezone.utc),
+            datetime.combine(upper, datetime.min.time(), tzinfo=timezone.utc))
+
+def _in_month(city: str, year: int, month: int) -> tuple:
+    lower, upper = _month_bounds(year, month)
+    return (Weather.city == city, Weather.created_at >= lower, Weather.created_at < upper)
+
+def archive_path(city: str, year: int, month: int) -> str:
+    """Return the Parquet file path for a city-month."""
+    return os.path.join(ARCHIVE_DIR, f"city={_slug(city)}", f"{year:04d}-{month:02d}.parquet")
+
+def archive_month(db: Session, city: str, year: int, month: int, purge: bool = ARCHIVE_PURGE) -> dict:
+    """
+    Write one city-month of weather_data to a zstd-compressed Parquet file.
+
+    The file is written to a temporary path and renamed, so readers never see a
+    partial archive. Rows are only deleted (``purge``) after the file is in place.
+    If the month was archived before, rows already in the file that are no
+    longer in the database (purged earlier) are kept.
+
+    Args:
+        db (Session): Database session.
+        city (str): City name.
+        year (int): Year of the month to archive.
+        month (int): Month to archive.
+        purge (bool): Delete the archived rows from weather_data.
+
+    Returns:
+        dict: ``{"city", "path", "rows"}`` with the number of database rows archived.
+    """
+    in_month = _in_month(city, year, month)
+
+    columns = {name: [] for name in ARCHIVE_COLUMNS}
+    query = select(*Weather.__table__.columns).where(*in_month).order_by(Weather.created_at)
+    for row in db.execute(query.execution_options(yield_per=5000, stream_results=True)).mappings():
+        for name in ARCHIVE_COLUMNS:
+            value = row[name]
+            if name == "id":
+                value = str(value)
+            elif name == "created_at":
+                value = to_utc(value)
+            columns[name].append(value)
+
+    rows = len(columns["id"])
+    path = archive_path(city, year, month)
+    if rows:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        table = pa.table(columns, schema=_schema())
+        if os.path.exists(path):
+            existing = pa.parquet.read_table(path)
+            archived_only = pc.invert(pc.is_in(existing["id"], value_set=table["id"]))
+            table = pa.concat_tables([existing.filter(archived_only), table]).sort_by("created_at")
+        tmp_path = f"{path}.tmp"
+        pa.parquet.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+        if purge:
+            db.execute(delete(Weather).where(*in_month))
+            db.commit()
+        logger.info(f"Archived {rows} rows for {city} {year:04d}-{month:02d} to {path}")
+    return {"city": city, "path": path if rows else None, "rows": rows}
+
+def archive_closed_periods(db: Session, before: Optional[date] = None, purge: bool = ARCHIVE_PURGE) -> List[dict]:
+    """
+    Archive every city-month that ended before ``before``.
+
+    A month is (re)archived while it still has rows in weather_data: always
+    when purging, so months archived earlier with purge off are purged once it
+    is turned on, and otherwise only when the database holds more rows than
+    the file (late observations), so unchanged months are not rewritten.
+
+    Args:
+        db (Session): Database session.
+        before (date, optional): First day of the first month to keep hot. Defaults to the current UTC month.
+        purge (bool): Delete archived rows from weather_data.
+
+    Returns:
+        list[dict]: One entry per archived city-month.
+    """
+    cutoff = (before or datetime.now(timezone.utc).date()).replace(day=1)
+    cutoff_ts = datetime.combine(cutoff, datetime.min.time(), tzinfo=timezone.utc)
+    oldest = db.execute(
+        select(Weather.city, func.min(Weather.created_at))
+        .where(Weather.created_at < cutoff_ts)
+        .group_by(Weather.city)
+    ).all()
+
+    archived = []
+    for city, first_ts in oldest:
+        first = to_utc(first_ts).date().replace(day=1)
+        months = (cutoff.year - first.year) * 12 + cutoff.month - first.month
+        for lower, _ in month_ranges(first, months - 1):
+            path = archive_path(city, lower.year, lower.month)
+            if not purge and os.path.exists(path):
+                hot = db.scalar(select(func.count()).select_from(Weather).where(*_in_month(city, lower.year, lower.month)))
+                if hot <= pa.parquet.ParquetFile(path).metadata.num_rows:
+                    continue
+            result = archive_month(db, city, lower.year, lower.month, purge=purge)
+            if result["rows"]:
+                archived.append(result)
+    return archived
+
+def read_archive(
+    city: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    columns: Optional[List[str]] = None,
+):
+    """
+    Read a city's archived observations for a time range.
+
+    Only the files overlapping the range are opened, only the requested columns
+    are decoded, and files are memory-mapped.
+
+    Args:
+        city (str): City name.
+        start (datetime, optional): Inclusive lower bound on created_at.
+        end (datetime, optional): Exclusive upper bound on created_at.
+        columns (list[str], optional): Columns to return (created_at is always included).
+
+    Returns:
+        pyarrow.Table: Matching rows ordered by created_at.
+    """
+    directory = os.path.dirname(archive_path(city, 2000, 1))
+    selected = None
+    if columns:
+        unknown = set(columns) - set(ARCHIVE_COLUMNS)
+        if unknown:
+            raise AppError(message=f"Unknown archive columns: {', '.join(sorted(unknown))}", code=422)
+        selected = ["created_at"] + [c for c in columns if c != "created_at"]
+
+    filters = []
+    if start is not None:
+        start = to_utc(start)
+        filters.append(("created_at", ">=", start))
+    if end is not None:
+        end = to_utc(end)
+        filters.append(("created_at", "<", end))
+
+    tables = []
+    if os.path.isdir(directory):
+        for name in sorted(os.listdir(directory)):
+            match = re.fullmatch(r"(\d{4})-(\d{2})\.parquet", name)
+            if not match:
+                continue
+            lower, upper = _month_bounds(int(match[1]), int(match[2]))
+            if (start is not None and upper <= start) or (end is not None and lower >= end):
+                continue
+            tables.append(pa.parquet.read_table(
+                os.path.join(directory, name),
+                columns=selected,
+                filters=filters or None,
+                memory_map=True,
+            ))
+
+    if not tables:
+        schema = _schema()
+        return schema.empty_table().select(selected) if selected else schema.empty_table()
+    return pa.concat_tables(tables)
+
+def serialize_table(table, fmt: str = "arrow") -> bytes:
+    """
+    Encode an Arrow table for an HTTP response.
+
+    Args:
+        table (pyarrow.Table): Table to encode.
+        fmt (str): "arrow" (IPC stream), "parquet" or "ndjson".
+
+    Returns:
+        bytes: Encoded body.
+    """
+    sink = io.BytesIO()
+    if fmt == "parquet":
+        pa.parquet.write_table(table, sink, compression="zstd")
+    elif fmt == "ndjson":
+        for row in table.to_pylist():
+            sink.write(json.dumps(row, default=str, separators=(",", ":")).encode() + b"\n")
+    else:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue()
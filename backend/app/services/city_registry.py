@@ -0,0 +1,95 @@
+"""
+City Registry.
+
+Persistent mapping from the city names we track (CITIES) to OpenWeather city
+ids and coordinates. A city is resolved once, from the first current-weather
+payload fetched by name; afterwards ingestion can fetch it by id through
+OpenWeather's multi-city group endpoint (up to 20 ids per request).
+
+Functions:
+- get_city_ids(db: Session, cities: list[str]) -> dict
+    Returns {name: owm_id} for the given cities that are already resolved.
+- register_cities(db: Session, payloads: dict) -> list[str]
+    Stores the id/coordinates of cities fetched by name; returns the names added.
+- unregister_cities(db: Session, cities: list[str]) -> list[str]
+    Forgets the ids of cities so they are resolved again by name.
+"""
+from typing import Dict, List
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from app.models import City
+
+def get_city_ids(db: Session, cities: List[str]) -> Dict[str, int]:
+    """
+    Look up the OpenWeather ids of already resolved cities.
+
+    Args:
+        db (Session): Database session.
+        cities (list[str]): City names as configured.
+
+    Returns:
+        dict: ``{name: owm_id}``; unresolved cities are absent.
+    """
+    if not cities:
+        return {}
+    rows = db.execute(
+        select(City.name, City.owm_id).where(City.name.in_(list(cities)), City.owm_id.isnot(None))
+    ).all()
+    return {name: owm_id for name, owm_id in rows}
+
+def register_cities(db: Session, payloads: Dict[str, dict]) -> List[str]:
+    """
+    Resolve cities from current-weather payloads fetched by name and commit them.
+
+    Payloads without an ``id`` (or for cities already registered) are skipped.
+
+    Args:
+        db (Session): Database session.
+        payloads (dict): Raw OpenWeather payloads keyed by configured city name.
+
+    Returns:
+        list[str]: Names newly added to the registry.
+    """
+    candidates = {name: data for name, data in payloads.items() if data and data.get("id") is not None}
+    if not candidates:
+        return []
+    known = set(db.execute(select(City.name).where(City.name.in_(list(candidates)))).scalars())
+
+    added = []
+    for name, data in candidates.items():
+        if name in known:
+            continue
+        coord = data.get("coord") or {}
+        db.add(City(
+            name=name,
+            owm_id=int(data["id"]),
+            resolved_name=data.get("name"),
+            country=(data.get("sys") or {}).get("country"),
+            lat=coord.get("lat"),
+            lon=coord.get("lon"),
+        ))
+        added.append(name)
+    if added:
+        db.commit()
+    return added
+
+def unregister_cities(db: Session, cities: List[str]) -> List[str]:
+    """
+    Forget the OpenWeather ids of cities and commit.
+
+    Used when the group endpoint stops returning an id (merged or retired
+    upstream): the city is fetched by name again and re-registered from that
+    payload.
+
+    Args:
+        db (Session): Database session.
+        cities (list[str]): City names as configured.
+
+    Returns:
+        list[str]: Names removed from the registry.
+    """
+    if not cities:
+        return []
+    removed = list(db.execute(delete(City).where(City.name.in_(list(cities))).returning(City.name)).scalars())
+    db.commit()
+    return removed
@@ -0,0 +1,120 @@
+"""
+Export Service.
+
+Streams weather history as NDJSON or CSV with constant memory: rows are read
+through a server-side cursor (``yield_per`` / ``stream_results``) and encoded
+in chunks as they arrive, so millions of rows can be exported without being
+loaded at once.
+
+Functions:
+- iter_weather_rows(db, city, start, end) -> Iterator[RowMapping]
+    Streams raw rows ordered by created_at.
+- stream_export(db, city, fmt, start, end) -> Iterator[str]
+    Encodes the stream as NDJSON lines or CSV.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models import Weather
+
+EXPORT_BATCH_SIZE = 2000
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+EXPORT_COLUMNS = [c for c in Weather.__table__.columns]
+
+def iter_weather_rows(
+    db: Session,
+    city: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+):
+    """
+    Stream weather rows for a city through a server-side cursor.
+
+    Args:
+        db (Session): Database session.
+        city (str): City name.
+        start (datetime, optional): Inclusive lower bound on created_at.
+        end (datetime, optional): Exclusive upper bound on created_at.
+        batch_size (int): Rows fetched per round-trip.
+
+    Yields:
+        RowMapping: One row per observation, oldest first.
+    """
+    query = select(*EXPORT_COLUMNS).where(Weather.city == city)
+    if start is not None:
+        query = query.where(Weather.created_at >= start)
+    if end is not None:
+        query = query.where(Weather.created_at < end)
+    query = query.order_by(Weather.created_at, Weather.id)
+    result = db.execute(query.execution_options(yield_per=batch_size, stream_results=True))
+    try:
+        yield from result.mappings()
+    finally:
+        result.close()
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+def _ndjson_chunks(rows, batch_size: int) -> Iterator[str]:
+    buffer = []
+    for row in rows:
+        buffer.append(json.dumps({k: _encode_value(v) for k, v in row.items()}, separators=(",", ":")))
+        if len(buffer) >= batch_size:
+            yield "\n".join(buffer) + "\n"
+            buffer.clear()
+    if buffer:
+        yield "\n".join(buffer) + "\n"
+
+def _csv_chunks(rows, batch_size: int) -> Iterator[str]:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow([c.name for c in EXPORT_COLUMNS])
+    pending = 0
+    for row in rows:
+        writer.writerow([_encode_value(v) for v in row.values()])
+        pending += 1
+        if pending >= batch_size:
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate()
+            pending = 0
+    yield out.getvalue()
+
+def stream_export(
+    db: Session,
+    city: str,
+    fmt: str = "ndjson",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[str]:
+    """
+    Encode a city's history as NDJSON or CSV chunks.
+
+    Args:
+        db (Session): Database session.
+        city (str): City name.
+        fmt (str): "ndjson" or "csv".
+        start (datetime, optional): Inclusive lower bound on created_at.
+        end (datetime, optional): Exclusive upper bound on created_at.
+        batch_size (int): Rows per chunk and per database round-trip.
+
+    Yields:
+        str: Encoded chunks ready to be written to the response.
+    """
+    rows = iter_weather_rows(db, city, start, end, batch_size)
+    if fmt == "csv":
+        return _csv_chunks(rows, batch_size)
+    return _ndjson_chunks(rows, batch_size)
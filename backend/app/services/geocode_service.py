@@ -0,0 +1,131 @@
+"""
+Geocode Service.
+
+Reverse geocoding with a two-level cache keyed by quantized coordinates:
+
+1. In-memory LRU+TTL cache (microseconds, per process).
+2. geocode_cache table (survives restarts, shared by workers).
+3. OpenWeather geo API, only when both miss.
+
+Coordinates are quantized to a geohash cell of GEOCODE_PRECISION characters, so
+browsers in the same neighborhood share one entry. Entries of both levels
+expire after GEOCODE_CACHE_TTL_SECONDS. Cells with no matching city (sea,
+unpopulated areas) are cached too, as rows with a NULL city and a separate
+in-memory cache, for GEOCODE_NEGATIVE_TTL_SECONDS.
+
+Functions:
+- reverse_geocode_city(lat: float, lon: float, db: Session) -> dict
+    Returns {"city": ...} for the coordinates.
+- get_geocode_stats() -> dict
+    Returns memory/database/upstream hit counters and the local hit rate.
+"""
+import threading
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.config import (
+    GEOCODE_PRECISION, GEOCODE_CACHE_TTL_SECONDS, GEOCODE_CACHE_MAX_ENTRIES, GEOCODE_NEGATIVE_TTL_SECONDS,
+)
+from app.exceptions import AppError
+from app.models import GeocodeCache
+from app.services.openweather_async import reverse_geocode_async
+from app.utils.cache import TTLCache
+from app.utils.geo import geohash_encode, validate_coordinates
+
+geocode_cache = TTLCache(maxsize=GEOCODE_CACHE_MAX_ENTRIES, ttl=GEOCODE_CACHE_TTL_SECONDS)
+geocode_misses = TTLCache(maxsize=GEOCODE_CACHE_MAX_ENTRIES, ttl=GEOCODE_NEGATIVE_TTL_SECONDS)
+
+_stats_lock = threading.Lock()
+_stats = {"db_hits": 0, "upstream_calls": 0, "negative_hits": 0}
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+def _not_found() -> AppError:
+    return AppError(message="City not found for given coordinates.", code=404, log=True)
+
+def _load_cell(db: Session, cell: str):
+    """Return the cached place of a cell (``{"city": None}`` for a known miss), or None if absent or expired."""
+    entry = db.get(GeocodeCache, cell)
+    if entry is None:
+        return None
+    ttl = GEOCODE_CACHE_TTL_SECONDS if entry.city is not None else GEOCODE_NEGATIVE_TTL_SECONDS
+    created_at = entry.created_at
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    if created_at <= datetime.now(timezone.utc) - timedelta(seconds=ttl):
+        return None
+    return {"city": entry.city, "country": entry.country}
+
+def _store_cell(db: Session, cell: str, place: dict) -> None:
+    try:
+        db.merge(GeocodeCache(
+            cell=cell, city=place["city"], country=place.get("country"), created_at=datetime.now(timezone.utc),
+        ))
+        db.commit()
+    except Exception:
+        db.rollback()
+
+async def reverse_geocode_city(lat: float, lon: float, db: Session) -> dict:
+    """
+    Resolve coordinates to a city name, answering from the local caches when possible.
+
+    Args:
+        lat (float): Latitude.
+        lon (float): Longitude.
+        db (Session): Database session.
+
+    Returns:
+        dict: ``{"city": name}``.
+
+    Raises:
+        ValidationError: If coordinates are out of range.
+        AppError: 404 if no city matches the coordinates.
+        APIError: If the upstream request fails.
+    """
+    validate_coordinates(lat, lon)
+    cell = geohash_encode(lat, lon, GEOCODE_PRECISION)
+    if geocode_misses.get(cell):
+        _count("negative_hits")
+        raise _not_found()
+
+    async def load() -> dict:
+        place = await run_in_threadpool(_load_cell, db, cell)
+        if place:
+            _count("db_hits")
+        else:
+            _count("upstream_calls")
+            data = await reverse_geocode_async(lat, lon)
+            if data and "name" in data[0]:
+                place = {"city": data[0]["name"], "country": data[0].get("country")}
+            else:
+                place = {"city": None}
+            await run_in_threadpool(_store_cell, db, cell, place)
+        if place["city"] is None:
+            geocode_misses.set(cell, True)
+            raise _not_found()
+        return place
+
+    place = await geocode_cache.aget_or_load(cell, load)
+    return {"city": place["city"]}
+
+def get_geocode_stats() -> dict:
+    """
+    Returns reverse geocoding cache statistics.
+
+    ``hit_rate`` counts memory, database and negative-cache hits as local answers.
+    """
+    memory = geocode_cache.stats()
+    with _stats_lock:
+        db_hits, upstream, negative = _stats["db_hits"], _stats["upstream_calls"], _stats["negative_hits"]
+    lookups = memory["hits"] + memory["misses"] + negative
+    local = memory["hits"] + memory["coalesced"] + db_hits + negative
+    return {
+        "precision": GEOCODE_PRECISION,
+        "memory": memory,
+        "db_hits": db_hits,
+        "negative_hits": negative,
+        "upstream_calls": upstream,
+        "hit_rate": round(local / lookups, 4) if lookups else 0.0,
+    }
@@ -0,0 +1,129 @@
+"""
+Latest Observation Store.
+
+In-process, write-through map of the newest stored observation per city, so
+``/weather/latest`` endpoints are answered from memory instead of an
+ORDER BY ... LIMIT 1 query per request.
+
+- Filled from the database at startup (load).
+- Updated by the save path after every successful commit (update).
+- Misses fall back to the database in weather_service and populate the store.
+
+The store is per process, so rows committed by another process (cron job,
+another worker, seeds) do not reach it through update. Every entry therefore
+remembers when it was last confirmed against the database (load, a database
+read or a local save): weather_service serves it without a query only while
+that is less than LATEST_SNAPSHOT_TTL_SECONDS ago (see get's ``max_age``), and
+reloads the all-cities snapshot once it is older than that (see age).
+
+Example usage:
+    latest_store.load(db)
+    latest_store.update([row])
+    latest_store.get("Madrid")  # {"id": ..., "city": "Madrid", "created_at": ..., ...}
+"""
+import threading
+import time
+from typing import Dict, Iterable, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.models import Weather
+from app.schemas import WeatherResponse
+from app.utils.serialization import to_utc
+
+FIELDS = tuple(WeatherResponse.model_fields)
+
+class LatestStore:
+    """Thread-safe newest-observation-per-city map."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records: Dict[str, dict] = {}
+        self._confirmed_at: Dict[str, float] = {}
+        self._loaded_at: Optional[float] = None
+
+    def update(self, rows: Iterable[dict]) -> None:
+        """
+        Record committed observations, keeping only the newest per city.
+
+        The cities of ``rows`` count as confirmed against the database now.
+
+        Args:
+            rows (Iterable[dict]): Weather column values including id, city and created_at.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for row in rows:
+                record = {name: row.get(name) for name in FIELDS}
+                record["created_at"] = to_utc(record["created_at"])
+                current = self._records.get(record["city"])
+                if current is None or (record["created_at"], str(record["id"])) >= (current["created_at"], str(current["id"])):
+                    self._records[record["city"]] = record
+                self._confirmed_at[record["city"]] = now
+
+    def get(self, city: str, max_age: Optional[float] = None) -> Optional[dict]:
+        """
+        Return the newest observation of a city, or None if unknown.
+
+        Args:
+            city (str): City name.
+            max_age (float, optional): Also return None when the entry was last
+                confirmed against the database more than this many seconds ago.
+        """
+        with self._lock:
+            record = self._records.get(city)
+            if record and max_age is not None and time.monotonic() - self._confirmed_at[city] > max_age:
+                return None
+            return dict(record) if record else None
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Return a copy of the newest observation of every known city."""
+        with self._lock:
+            return {city: dict(record) for city, record in self._records.items()}
+
+    def load(self, db: Session) -> int:
+        """
+        Replace the store contents with the newest row of every city in the database.
+
+        Args:
+            db (Session): Database session.
+
+        Returns:
+            int: Number of cities loaded.
+        """
+        rank = func.row_number().over(
+            partition_by=Weather.city,
+            order_by=(Weather.created_at.desc(), Weather.id.desc()),
+        ).label("rank")
+        ranked = select(*(Weather.__table__.c[name] for name in FIELDS), rank).subquery()
+        rows = db.execute(select(*(ranked.c[name] for name in FIELDS)).where(ranked.c.rank == 1)).mappings().all()
+        with self._lock:
+            self._records.clear()
+            self._confirmed_at.clear()
+            self._loaded_at = time.monotonic()
+        self.update(rows)
+        return len(rows)
+
+    def age(self) -> Optional[float]:
+        """Seconds since the last full load, or None if never loaded."""
+        with self._lock:
+            return None if self._loaded_at is None else time.monotonic() - self._loaded_at
+
+    def discard(self, city: str) -> None:
+        """Forget one city (e.g. its rows were deleted by another process)."""
+        with self._lock:
+            self._records.pop(city, None)
+            self._confirmed_at.pop(city, None)
+
+    def clear(self) -> None:
+        """Forget every city."""
+        with self._lock:
+            self._records.clear()
+            self._confirmed_at.clear()
+            self._loaded_at = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
+
+
+latest_store = LatestStore()
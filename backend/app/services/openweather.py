@@ -14,6 +14,7 @@ import requests
 from datetime import datetime
 from app.config import OPENWEATHER_API_KEY, OPENWEATHER_BASE_URL, OPENWEATHER_FORECAST_URL
 from app.exceptions import APIError
+from app.http_client import http_client
 from app.utils.validation import validate_city_name
 
 def fetch_current_weather(city: str) -> dict:
@@ -42,7 +43,7 @@ def fetch_current_weather(city: str) -> dict:
     }
 
     try:
-        res = requests.get(OPENWEATHER_BASE_URL, params=params, timeout=10)
+        res = http_client.get(OPENWEATHER_BASE_URL, params=params)
         res.raise_for_status()
         data = res.json()
 
@@ -107,7 +108,7 @@ def fetch_historical_weather(lat: float, lon: float, dt: int) -> dict:
         "units": "metric",
     }
     try:
-        res = requests.get(OPENWEATHER_FORECAST_URL, params=params, timeout=10)
+        res = http_client.get(OPENWEATHER_FORECAST_URL, params=params)
         res.raise_for_status()
         return res.json()
     except requests.exceptions.RequestException as e:
@@ -14,6 +14,7 @@ Functions:
 import requests
 from app.config import OPENWEATHER_BASE_URL, OPENWEATHER_API_KEY, OPENWEATHER_FORECAST_URL
 from app.exceptions import APIError
+from app.http_client import http_client
 from app.utils.validation import validate_city_name
 
 def get_weather(city: str) -> dict:
@@ -38,7 +39,7 @@ def get_weather(city: str) -> dict:
         "units": "metric"
     }
     try:
-        res = requests.get(OPENWEATHER_BASE_URL, params=params, timeout=5)
+        res = http_client.get(OPENWEATHER_BASE_URL, params=params)
         res.raise_for_status()
         return res.json()
     except requests.RequestException as e:
@@ -66,7 +67,7 @@ def get_5day_forecast(city: str) -> dict:
         "units": "metric"
     }
     try:
-        res = requests.get(OPENWEATHER_FORECAST_URL, params=params, timeout=5)
+        res = http_client.get(OPENWEATHER_FORECAST_URL, params=params)
         res.raise_for_status()
         return res.json()
     except requests.RequestException as e:
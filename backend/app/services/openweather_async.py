@@ -0,0 +1,164 @@
+"""
+Async OpenWeather Adapter.
+
+httpx-based counterpart of openweather_adapter for async route handlers, so a
+single worker can keep many upstream calls in flight without blocking threads.
+
+Functions:
+- get_weather_async(city: str) -> dict
+    Fetches the current weather for a city in JSON format.
+- get_5day_forecast_async(city: str) -> dict
+    Fetches the 5-day forecast for a city.
+- reverse_geocode_async(lat: float, lon: float) -> list
+    Fetches the places matching a pair of coordinates.
+- close_async_client()
+    Closes the shared AsyncClient (called on application shutdown).
+
+All functions raise APIError if the request fails after retries.
+"""
+import asyncio
+import time
+from typing import Optional
+import httpx
+from app.config import (
+    OPENWEATHER_API_KEY,
+    OPENWEATHER_BASE_URL,
+    OPENWEATHER_FORECAST_URL,
+    OPENWEATHER_REVERSE_URL,
+    HTTP_POOL_SIZE,
+    HTTP_ASYNC_MAX_CONNECTIONS,
+    HTTP_TIMEOUT_SECONDS,
+    HTTP_MAX_RETRIES,
+    HTTP_BACKOFF_FACTOR,
+)
+from app.exceptions import APIError
+from app.http_client import RETRY_STATUS_CODES
+from app.metrics import observe_upstream
+from app.utils.rate_limit import upstream_limiter
+from app.utils.validation import validate_city_name
+
+_client: Optional[httpx.AsyncClient] = None
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=HTTP_ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_POOL_SIZE,
+            ),
+        )
+    return _client
+
+async def close_async_client() -> None:
+    """Close the shared AsyncClient and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+async def _get_json(url: str, params: dict, error_message: str):
+    """
+    GET a JSON document, retrying connection errors and 429/5xx with exponential backoff.
+
+    Every attempt first takes a token from the shared upstream rate limiter.
+
+    Raises:
+        APIError: If the request still fails after HTTP_MAX_RETRIES retries.
+        RateLimitError: If the rate limiter cannot grant a call before the deadline.
+    """
+    client = get_async_client()
+    start = time.perf_counter()
+    status = "error"
+    try:
+        for attempt in range(HTTP_MAX_RETRIES + 1):
+            last_attempt = attempt == HTTP_MAX_RETRIES
+            await upstream_limiter.acquire_async()
+            try:
+                res = await client.get(url, params=params)
+                status = res.status_code
+                if res.status_code in RETRY_STATUS_CODES and not last_attempt:
+                    await asyncio.sleep(HTTP_BACKOFF_FACTOR * (2 ** attempt))
+                    continue
+                res.raise_for_status()
+                return res.json()
+            except httpx.TransportError as e:
+                status = "error"
+                if last_attempt:
+                    raise APIError(f"{error_message}: {str(e)}")
+                await asyncio.sleep(HTTP_BACKOFF_FACTOR * (2 ** attempt))
+            except httpx.HTTPError as e:
+                raise APIError(f"{error_message}: {str(e)}")
+    finally:
+        observe_upstream(url, status, time.perf_counter() - start)
+
+async def get_weather_async(city: str) -> dict:
+    """Fetch current weather for a city from OpenWeatherMap.
+
+    Args:
+        city (str): City name.
+
+    Raises:
+        ValidationError: If city name is invalid.
+        APIError: If the request fails.
+
+    Returns:
+        dict: Weather data in JSON format.
+    """
+    validate_city_name(city)
+    if not OPENWEATHER_API_KEY:
+        raise APIError("API key not configured.")
+    params = {
+        "q": city,
+        "appid": OPENWEATHER_API_KEY,
+        "units": "metric"
+    }
+    return await _get_json(OPENWEATHER_BASE_URL, params, f"Error fetching weather for {city}")
+
+async def get_5day_forecast_async(city: str) -> dict:
+    """Fetch 5-day forecast data for a city from OpenWeatherMap.
+
+    Args:
+        city (str): City name.
+
+    Raises:
+        ValidationError: If city name is invalid.
+        APIError: If the request fails.
+
+    Returns:
+        dict: 5-day forecast data in JSON format.
+    """
+    validate_city_name(city)
+    if not OPENWEATHER_API_KEY:
+        raise APIError("API key not configured.")
+    params = {
+        "q": city,
+        "appid": OPENWEATHER_API_KEY,
+        "units": "metric"
+    }
+    return await _get_json(OPENWEATHER_FORECAST_URL, params, f"Error fetching 5-day forecast for {city}")
+
+async def reverse_geocode_async(lat: float, lon: float) -> list:
+    """Fetch places for a pair of coordinates from the OpenWeatherMap geo API.
+
+    Args:
+        lat (float): Latitude.
+        lon (float): Longitude.
+
+    Raises:
+        APIError: If the request fails.
+
+    Returns:
+        list[dict]: Matching places (at most one).
+    """
+    if not OPENWEATHER_API_KEY:
+        raise APIError("API key not configured.")
+    params = {
+        "lat": lat,
+        "lon": lon,
+        "limit": 1,
+        "appid": OPENWEATHER_API_KEY
+    }
+    return await _get_json(OPENWEATHER_REVERSE_URL, params, "Failed to reverse geocode coordinates")
@@ -0,0 +1,336 @@
+"""
+Local Prediction Model.
+
+Per-city diurnal harmonic regression of temperature and humidity, trained
+incrementally from stored observations and served from memory, so predictions
+cost no upstream call.
+
+Model: y(t) = b0 + b1 sin(w t) + b2 cos(w t) + b3 sin(2w t) + b4 cos(2w t),
+w = 2*pi / 1 day (UTC), fitted by weighted least squares. Only the sufficient
+statistics are kept (X'WX, X'Wy, y'Wy and the weight sum), so:
+
+- Adding an observation is O(1): decay the statistics by its age
+  (half-life PREDICT_HALF_LIFE_DAYS) and add its outer product. The level
+  therefore follows the season while the harmonics capture the daily cycle.
+- A cold model is trained from the database in one vectorized pass
+  (analytics.load_series) and then kept current by the save path. Rows saved
+  by other processes (cron job, other workers) are caught up on the next
+  request: when the city's newest created_at is ahead of the model, only the
+  rows after the model's last timestamp are loaded and folded in.
+- Each update bumps the model version; coefficients are solved once per version
+  and a prediction is a 5-term dot product.
+
+Functions:
+- predict_city(city: str, db: Session, hours: int) -> dict
+- backtest_city(city: str, db: Session, start, end, horizon_hours: int) -> dict
+    Walk-forward comparison of the model with stored actuals and a persistence baseline.
+
+Example usage:
+    model_store.observe(rows)          # save path, after commit
+    predict_city("Madrid", db, hours=24)
+"""
+import math
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.config import PREDICT_HALF_LIFE_DAYS, PREDICT_MIN_SAMPLES, PREDICT_MAX_HOURS, PREDICT_RIDGE
+from app.exceptions import AppError, ValidationError
+from app.models import Weather
+from app.services.analytics import load_series
+from app.utils.validation import validate_city_name
+
+TARGETS = ("temperature", "humidity")
+SECONDS_PER_DAY = 86400
+OMEGA = 2 * math.pi / SECONDS_PER_DAY
+N_FEATURES = 5
+
+def _features(ts: np.ndarray) -> np.ndarray:
+    """Design matrix rows [1, sin wt, cos wt, sin 2wt, cos 2wt] for UTC epoch seconds."""
+    phase = OMEGA * (np.asarray(ts, dtype=float) % SECONDS_PER_DAY)
+    return np.column_stack([np.ones_like(phase), np.sin(phase), np.cos(phase), np.sin(2 * phase), np.cos(2 * phase)])
+
+def _to_epoch(ts: datetime) -> float:
+    """UTC epoch seconds rounded to milliseconds, like analytics.load_series."""
+    return round((ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts).timestamp(), 3)
+
+
+class HarmonicModel:
+    """Exponentially weighted least-squares model over sufficient statistics."""
+
+    def __init__(self, half_life_days: float = PREDICT_HALF_LIFE_DAYS, ridge: float = PREDICT_RIDGE):
+        self.half_life = half_life_days * SECONDS_PER_DAY
+        self.ridge = ridge
+        self.xtx = np.zeros((N_FEATURES, N_FEATURES))
+        self.xty = np.zeros((N_FEATURES, len(TARGETS)))
+        self.yty = np.zeros(len(TARGETS))
+        self.samples = 0
+        self.last_ts: Optional[float] = None
+        self.version = 0
+        self._lock = threading.Lock()
+        self._solved_version = -1
+        self._coef = None
+        self._rmse = None
+
+    def _decay_to(self, ts: float) -> None:
+        if self.last_ts is not None and ts > self.last_ts:
+            factor = 0.5 ** ((ts - self.last_ts) / self.half_life)
+            self.xtx *= factor
+            self.xty *= factor
+            self.yty *= factor
+
+    def fit(self, ts: np.ndarray, y: np.ndarray) -> int:
+        """
+        Fold a time-ordered batch in one vectorized pass.
+
+        Rows not newer than last_ts are skipped atomically, so concurrent
+        catch-ups and save-path updates never count an observation twice.
+
+        Args:
+            ts (np.ndarray): UTC epoch seconds, ascending.
+            y (np.ndarray): Targets, shape (n, len(TARGETS)); rows with NaN are skipped.
+
+        Returns:
+            int: Number of observations folded in.
+        """
+        mask = ~np.isnan(y).any(axis=1)
+        with self._lock:
+            if self.last_ts is not None:
+                mask &= ts > self.last_ts
+            ts, y = ts[mask], y[mask]
+            if ts.size == 0:
+                return 0
+            self._decay_to(ts[-1])
+            weights = 0.5 ** ((ts[-1] - ts) / self.half_life)
+            x = _features(ts)
+            xw = x * weights[:, None]
+            self.xtx += xw.T @ x
+            self.xty += xw.T @ y
+            self.yty += weights @ (y * y)
+            self.samples += int(ts.size)
+            self.last_ts = float(ts[-1])
+            self.version += 1
+            return int(ts.size)
+
+    def update(self, ts: float, values) -> bool:
+        """
+        Add one observation in O(1). Observations not newer than the model are ignored.
+
+        Returns:
+            bool: Whether the observation was used.
+        """
+        return self.fit(np.array([ts]), np.array([values], dtype=float)) > 0
+
+    def _solve(self):
+        """Coefficients and weighted RMSE per target, recomputed once per version."""
+        with self._lock:
+            if self._solved_version != self.version:
+                a = self.xtx + self.ridge * np.eye(N_FEATURES)
+                coef = np.linalg.solve(a, self.xty)
+                weight = self.xtx[0, 0]
+                sse = self.yty - 2 * np.einsum("ij,ij->j", coef, self.xty) + np.einsum("ij,ik,kj->j", coef, self.xtx, coef)
+                self._rmse = np.sqrt(np.maximum(sse, 0) / weight) if weight > 0 else np.full(len(TARGETS), np.nan)
+                self._coef, self._solved_version = coef, self.version
+            return self._coef, self._rmse
+
+    def predict(self, ts: np.ndarray) -> np.ndarray:
+        """Predicted targets for UTC epoch seconds, shape (n, len(TARGETS))."""
+        coef, _ = self._solve()
+        return _features(ts) @ coef
+
+    def predict_one(self, ts: float) -> list:
+        """Single prediction without building arrays (a few microseconds)."""
+        coef, _ = self._solve()
+        phase = OMEGA * (ts % SECONDS_PER_DAY)
+        s1, c1 = math.sin(phase), math.cos(phase)
+        row = (1.0, s1, c1, 2 * s1 * c1, c1 * c1 - s1 * s1)
+        return [sum(r * coef[i, j] for i, r in enumerate(row)) for j in range(len(TARGETS))]
+
+    def rmse(self) -> dict:
+        _, rmse = self._solve()
+        return {name: _round(value) for name, value in zip(TARGETS, rmse)}
+
+
+def _round(value, digits: int = 2) -> Optional[float]:
+    value = float(value)
+    return round(value, digits) if math.isfinite(value) else None
+
+def _load_training_data(db: Session, city: str, start: datetime = None, end: datetime = None):
+    """Time-ordered epoch seconds and (n, len(TARGETS)) targets of a city."""
+    series = load_series(db, city, start=start, end=end, metrics=TARGETS)
+    if series["ts"].size == 0:
+        return series["ts"], np.empty((0, len(TARGETS)))
+    return series["ts"], np.column_stack([series[name] for name in TARGETS])
+
+
+class ModelStore:
+    """Per-process map of trained city models, kept current by the save path."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models: Dict[str, HarmonicModel] = {}
+
+    def get(self, city: str, db: Session) -> HarmonicModel:
+        """
+        Return the city's model, up to date with the database.
+
+        A cold model is trained from the full history. A warm one is checked
+        against the city's newest created_at (one index probe) and, when the
+        database is ahead (rows from other processes, or committed while the
+        model was being trained), only the newer rows are loaded.
+        """
+        with self._lock:
+            model = self._models.get(city)
+        if model is None:
+            model = HarmonicModel()
+            model.fit(*_load_training_data(db, city))
+            with self._lock:
+                # Another request may have trained it meanwhile; keep the first one.
+                model = self._models.setdefault(city, model)
+
+        newest = db.scalar(select(func.max(Weather.created_at)).where(Weather.city == city))
+        if newest is not None and (model.last_ts is None or _to_epoch(newest) > model.last_ts):
+            start = None if model.last_ts is None else datetime.fromtimestamp(model.last_ts, tz=timezone.utc)
+            model.fit(*_load_training_data(db, city, start=start))
+        return model
+
+    def observe(self, rows: Iterable[dict]) -> None:
+        """
+        Fold committed observations into the models already in memory.
+
+        Cities without a model are skipped: they are trained from the database,
+        including these rows, when first requested.
+        """
+        for row in sorted(rows, key=lambda r: _to_epoch(r["created_at"])):
+            with self._lock:
+                model = self._models.get(row["city"])
+            values = [row.get(name) for name in TARGETS]
+            if model is not None and None not in values:
+                model.update(_to_epoch(row["created_at"]), values)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+
+model_store = ModelStore()
+
+def predict_city(city: str, db: Session, hours: int = 24, now: datetime = None) -> dict:
+    """
+    Hourly predictions for the next ``hours`` hours from the city's local model.
+
+    Args:
+        city (str): Name of the city.
+        db (Session): Database session (only used to train a cold model).
+        hours (int): Number of hourly predictions (1..PREDICT_MAX_HOURS).
+        now (datetime, optional): Reference time; defaults to the current UTC time.
+
+    Returns:
+        dict: Model version, training coverage, in-sample RMSE and predictions
+        from the next full hour on.
+
+    Raises:
+        ValidationError: If city name or hours is invalid.
+        AppError: 404 if the city has fewer than PREDICT_MIN_SAMPLES observations.
+    """
+    validate_city_name(city)
+    if not 1 <= hours <= PREDICT_MAX_HOURS:
+        raise ValidationError(f"'hours' must be between 1 and {PREDICT_MAX_HOURS}.")
+    model = model_store.get(city, db)
+    if model.samples < PREDICT_MIN_SAMPLES:
+        raise AppError(message=f"Not enough observations to predict {city} "
+                               f"({model.samples} of {PREDICT_MIN_SAMPLES}).", code=404)
+
+    now = now or datetime.now(timezone.utc)
+    first = now.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    ts = first.timestamp() + np.arange(hours) * 3600.0
+    predicted = model.predict(ts)
+    return {
+        "city": city,
+        "model_version": model.version,
+        "trained_through": datetime.fromtimestamp(model.last_ts, tz=timezone.utc).isoformat(),
+        "samples": model.samples,
+        "rmse": model.rmse(),
+        "predictions": [
+            {"time": (first + timedelta(hours=i)).isoformat(),
+             **{name: _round(value) for name, value in zip(TARGETS, values)}}
+            for i, values in enumerate(predicted.tolist())
+        ],
+    }
+
+def backtest_city(
+    city: str,
+    db: Session,
+    start: datetime = None,
+    end: datetime = None,
+    horizon_hours: int = 24,
+) -> dict:
+    """
+    Walk-forward backtest of the local model against stored actuals.
+
+    Observations are replayed in time order. Each one in [start, end) is
+    predicted by a model that has only seen observations at least
+    ``horizon_hours`` older, and compared with the persistence baseline (the
+    latest value at least ``horizon_hours`` older). Defaults to the last 7 days.
+
+    Args:
+        city (str): Name of the city.
+        db (Session): Database session.
+        start (datetime, optional): Inclusive start of the evaluated range.
+        end (datetime, optional): Exclusive end of the evaluated range.
+        horizon_hours (int): Forecast horizon in hours.
+
+    Returns:
+        dict: Number of evaluated observations and MAE/RMSE per target for the
+        model and the persistence baseline.
+
+    Raises:
+        ValidationError: If city name or range is invalid.
+    """
+    validate_city_name(city)
+    if start and end and start >= end:
+        raise ValidationError("'from' must be earlier than 'to'.")
+    ts, y = _load_training_data(db, city, end=end)
+    if ts.size == 0:
+        return {"city": city, "evaluated": 0, "horizon_hours": horizon_hours, "model": None, "persistence": None}
+
+    start_ts = _to_epoch(start) if start else ts[-1] - 7 * SECONDS_PER_DAY
+    horizon = horizon_hours * 3600.0
+    first_eval = int(np.searchsorted(ts, start_ts))
+
+    model = HarmonicModel()
+    trained = int(np.searchsorted(ts, ts[first_eval] - horizon, side="right")) if first_eval < ts.size else ts.size
+    model.fit(ts[:trained], y[:trained])
+
+    model_errors, baseline_errors = [], []
+    for i in range(first_eval, ts.size):
+        cutoff = ts[i] - horizon
+        while trained < ts.size and ts[trained] <= cutoff:
+            if not np.isnan(y[trained]).any():
+                model.update(ts[trained], y[trained])
+            trained += 1
+        if model.samples < PREDICT_MIN_SAMPLES or np.isnan(y[i]).any():
+            continue
+        model_errors.append(np.array(model.predict_one(ts[i])) - y[i])
+        baseline_errors.append(y[trained - 1] - y[i])
+
+    def _scores(errors):
+        if not errors:
+            return None
+        errors = np.array(errors)
+        return {
+            name: {"mae": _round(np.nanmean(np.abs(errors[:, j]))), "rmse": _round(np.sqrt(np.nanmean(errors[:, j] ** 2)))}
+            for j, name in enumerate(TARGETS)
+        }
+
+    return {
+        "city": city,
+        "from": datetime.fromtimestamp(max(start_ts, ts[0]), tz=timezone.utc).isoformat(),
+        "to": datetime.fromtimestamp(ts[-1], tz=timezone.utc).isoformat(),
+        "horizon_hours": horizon_hours,
+        "evaluated": len(model_errors),
+        "model": _scores(model_errors),
+        "persistence": _scores(baseline_errors),
+    }
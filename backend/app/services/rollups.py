@@ -0,0 +1,328 @@
+"""
+Weather Rollups.
+
+Multi-resolution aggregates (hour, day, week, month) of weather_data, kept up to
+date incrementally by the save path so long-range charts read one row per
+bucket instead of every raw observation.
+
+Functions:
+- bucket_start(ts: datetime, bucket: str) -> datetime
+    Truncates a timestamp to the start of its bucket (UTC; weeks start on Monday).
+- window_start(end: datetime, bucket: str, count: int) -> datetime
+    Start of the window made of the ``count`` buckets up to ``end``.
+- update_rollups(db: Session, rows: list[dict])
+    Folds newly inserted observations into their buckets (same transaction, no commit).
+- rebuild_rollups(db: Session, city: str = None)
+    Recomputes rollups from raw rows, e.g. after deploying on an existing database.
+- get_rollups(db: Session, city: str, bucket: str, start: datetime, end: datetime) -> list
+    Returns aggregated buckets for a city and time range.
+- compare_rollups(db: Session, cities: list[str], metric: str, bucket: str, start, end) -> dict
+    Returns one metric of several cities aligned on a shared bucket axis.
+"""
+from datetime import datetime, timedelta
+from typing import Iterable, List
+from sqlalchemy import case, delete, select
+from sqlalchemy.orm import Session
+from app.models import Weather, WeatherRollup
+from app.utils.serialization import to_utc
+
+BUCKETS = ("hour", "day", "week", "month")
+# Metric -> (sum column, count column) of its average.
+AVERAGES = {
+    "temperature": (WeatherRollup.temp_sum, WeatherRollup.count),
+    "humidity": (WeatherRollup.humidity_sum, WeatherRollup.count),
+    "pressure": (WeatherRollup.pressure_sum, WeatherRollup.pressure_count),
+    "wind_speed": (WeatherRollup.wind_speed_sum, WeatherRollup.wind_speed_count),
+}
+
+def bucket_start(ts: datetime, bucket: str) -> datetime:
+    """
+    Truncate a timestamp to the start of its bucket.
+
+    Args:
+        ts (datetime): Observation timestamp.
+        bucket (str): One of "hour", "day", "week", "month".
+
+    Returns:
+        datetime: Aware UTC datetime at the start of the bucket.
+    """
+    ts = to_utc(ts)
+    if bucket == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    day = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    if bucket == "day":
+        return day
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    raise ValueError(f"Unknown rollup bucket: {bucket}")
+
+def window_start(end: datetime, bucket: str, count: int) -> datetime:
+    """
+    Start of the window made of the last ``count`` buckets up to ``end``.
+
+    Args:
+        end (datetime): Exclusive end of the window.
+        bucket (str): One of "hour", "day", "week", "month".
+        count (int): Number of buckets in the window (at least 1).
+
+    Returns:
+        datetime: Aware UTC start of the oldest bucket of the window.
+    """
+    last = bucket_start(to_utc(end) - timedelta(microseconds=1), bucket)
+    steps = max(1, count) - 1
+    if bucket == "month":
+        months = last.year * 12 + last.month - 1 - steps
+        return last.replace(year=months // 12, month=months % 12 + 1)
+    span = {"hour": timedelta(hours=1), "day": timedelta(days=1), "week": timedelta(weeks=1)}[bucket]
+    return last - span * steps
+
+def _empty_bucket(city: str, bucket: str, start: datetime) -> dict:
+    return {
+        "city": city, "bucket": bucket, "bucket_start": start, "count": 0,
+        "temp_sum": 0.0, "temp_min": None, "temp_max": None,
+        "humidity_sum": 0.0, "humidity_min": None, "humidity_max": None,
+        "pressure_sum": 0.0, "pressure_count": 0,
+        "wind_speed_sum": 0.0, "wind_speed_count": 0, "wind_speed_max": None,
+    }
+
+def _min(a, b):
+    return b if a is None else a if b is None else min(a, b)
+
+def _max(a, b):
+    return b if a is None else a if b is None else max(a, b)
+
+def _accumulate(acc: dict, row: dict) -> None:
+    """Fold one observation into an in-memory bucket."""
+    acc["count"] += 1
+    temp, humidity = row.get("temperature"), row.get("humidity")
+    if temp is not None:
+        acc["temp_sum"] += temp
+        acc["temp_min"] = _min(acc["temp_min"], temp)
+        acc["temp_max"] = _max(acc["temp_max"], temp)
+    if humidity is not None:
+        acc["humidity_sum"] += humidity
+        acc["humidity_min"] = _min(acc["humidity_min"], humidity)
+        acc["humidity_max"] = _max(acc["humidity_max"], humidity)
+    if row.get("pressure") is not None:
+        acc["pressure_sum"] += row["pressure"]
+        acc["pressure_count"] += 1
+    if row.get("wind_speed") is not None:
+        acc["wind_speed_sum"] += row["wind_speed"]
+        acc["wind_speed_count"] += 1
+        acc["wind_speed_max"] = _max(acc["wind_speed_max"], row["wind_speed"])
+
+def _group(rows: Iterable[dict], groups: dict = None) -> dict:
+    """Group observations into per-(city, bucket, start) accumulators."""
+    groups = {} if groups is None else groups
+    for row in rows:
+        for bucket in BUCKETS:
+            start = bucket_start(row["created_at"], bucket)
+            key = (row["city"], bucket, start)
+            if key not in groups:
+                groups[key] = _empty_bucket(*key)
+            _accumulate(groups[key], row)
+    return groups
+
+def _null_safe(existing, incoming, pick_incoming):
+    """SQL expression choosing between two nullable values (LEAST/GREATEST ignoring NULLs)."""
+    return case(
+        (existing.is_(None), incoming),
+        (incoming.is_(None), existing),
+        (pick_incoming, incoming),
+        else_=existing,
+    )
+
+def _upsert(db: Session, values: List[dict]) -> None:
+    """
+    Add bucket deltas to existing rows, inserting missing buckets atomically.
+
+    ``values`` holds one already aggregated delta per (city, bucket, bucket_start);
+    they are sent as a single executemany INSERT ... ON CONFLICT DO UPDATE, in key
+    order so concurrent batches lock rows in the same order.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        _merge(db, values)
+        return
+
+    table = WeatherRollup.__table__
+    stmt = insert(table)
+    ex = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.city, table.c.bucket, table.c.bucket_start],
+        set_={
+            "count": table.c.count + ex.count,
+            "temp_sum": table.c.temp_sum + ex.temp_sum,
+            "temp_min": _null_safe(table.c.temp_min, ex.temp_min, ex.temp_min < table.c.temp_min),
+            "temp_max": _null_safe(table.c.temp_max, ex.temp_max, ex.temp_max > table.c.temp_max),
+            "humidity_sum": table.c.humidity_sum + ex.humidity_sum,
+            "humidity_min": _null_safe(table.c.humidity_min, ex.humidity_min, ex.humidity_min < table.c.humidity_min),
+            "humidity_max": _null_safe(table.c.humidity_max, ex.humidity_max, ex.humidity_max > table.c.humidity_max),
+            "pressure_sum": table.c.pressure_sum + ex.pressure_sum,
+            "pressure_count": table.c.pressure_count + ex.pressure_count,
+            "wind_speed_sum": table.c.wind_speed_sum + ex.wind_speed_sum,
+            "wind_speed_count": table.c.wind_speed_count + ex.wind_speed_count,
+            "wind_speed_max": _null_safe(table.c.wind_speed_max, ex.wind_speed_max, ex.wind_speed_max > table.c.wind_speed_max),
+        },
+    )
+    db.execute(stmt, sorted(values, key=lambda v: (v["city"], v["bucket"], v["bucket_start"])))
+
+def _merge(db: Session, values: List[dict]) -> None:
+    """Portable read-modify-write fallback for dialects without ON CONFLICT."""
+    for value in values:
+        existing = db.get(WeatherRollup, (value["city"], value["bucket"], value["bucket_start"]))
+        if existing is None:
+            db.add(WeatherRollup(**value))
+            continue
+        for field in ("count", "temp_sum", "humidity_sum", "pressure_sum", "pressure_count",
+                      "wind_speed_sum", "wind_speed_count"):
+            setattr(existing, field, getattr(existing, field) + value[field])
+        for field in ("temp_min", "humidity_min"):
+            setattr(existing, field, _min(getattr(existing, field), value[field]))
+        for field in ("temp_max", "humidity_max", "wind_speed_max"):
+            setattr(existing, field, _max(getattr(existing, field), value[field]))
+
+def update_rollups(db: Session, rows: Iterable[dict]) -> None:
+    """
+    Fold newly inserted observations into the hourly/daily/weekly/monthly rollups.
+
+    Runs inside the caller's transaction and does not commit, so the rollups
+    stay consistent with weather_data. Observations are aggregated per bucket
+    in Python first, so a batch costs one upsert statement whatever its size.
+
+    Args:
+        db (Session): Database session.
+        rows (Iterable[dict]): Inserted observations (Weather column values incl. created_at).
+    """
+    groups = _group(rows)
+    if groups:
+        _upsert(db, list(groups.values()))
+
+def rebuild_rollups(db: Session, city: str = None, batch_size: int = 5000) -> int:
+    """
+    Recompute rollups from the raw weather_data rows and commit.
+
+    Args:
+        db (Session): Database session.
+        city (str, optional): Only rebuild this city.
+        batch_size (int): Rows fetched per round-trip.
+
+    Returns:
+        int: Number of raw rows folded into the rollups.
+    """
+    purge = delete(WeatherRollup)
+    query = select(Weather.city, Weather.created_at, Weather.temperature,
+                   Weather.humidity, Weather.pressure, Weather.wind_speed)
+    if city:
+        purge = purge.where(WeatherRollup.city == city)
+        query = query.where(Weather.city == city)
+    db.execute(purge)
+
+    groups, total = {}, 0
+    for row in db.execute(query.execution_options(yield_per=batch_size)).mappings():
+        total += 1
+        _group([row], groups)
+    if groups:
+        db.execute(WeatherRollup.__table__.insert(), list(groups.values()))
+    db.commit()
+    return total
+
+def _avg(total, count):
+    return round(total / count, 2) if count else None
+
+def get_rollups(db: Session, city: str, bucket: str, start: datetime = None, end: datetime = None) -> list:
+    """
+    Return aggregated buckets for a city, oldest first.
+
+    Args:
+        db (Session): Database session.
+        city (str): City name.
+        bucket (str): One of "hour", "day", "week", "month".
+        start (datetime, optional): Inclusive lower bound on bucket start.
+        end (datetime, optional): Exclusive upper bound on bucket start.
+
+    Returns:
+        list[dict]: One entry per bucket with count, averages and extremes.
+    """
+    query = select(WeatherRollup).where(WeatherRollup.city == city, WeatherRollup.bucket == bucket)
+    if start is not None:
+        query = query.where(WeatherRollup.bucket_start >= bucket_start(start, bucket))
+    if end is not None:
+        query = query.where(WeatherRollup.bucket_start < to_utc(end))
+    query = query.order_by(WeatherRollup.bucket_start)
+
+    return [
+        {
+            "bucket_start": to_utc(r.bucket_start).isoformat(),
+            "count": r.count,
+            "temperature_avg": _avg(r.temp_sum, r.count),
+            "temperature_min": r.temp_min,
+            "temperature_max": r.temp_max,
+            "humidity_avg": _avg(r.humidity_sum, r.count),
+            "humidity_min": r.humidity_min,
+            "humidity_max": r.humidity_max,
+            "pressure_avg": _avg(r.pressure_sum, r.pressure_count),
+            "wind_speed_avg": _avg(r.wind_speed_sum, r.wind_speed_count),
+            "wind_speed_max": r.wind_speed_max,
+        }
+        for r in db.scalars(query)
+    ]
+
+def compare_rollups(
+    db: Session,
+    cities: List[str],
+    metric: str,
+    bucket: str,
+    start: datetime = None,
+    end: datetime = None,
+) -> dict:
+    """
+    Return one metric of several cities aligned on a shared bucket axis.
+
+    All cities are read in a single SELECT over the rollup primary key
+    (city IN (...), bucket, bucket_start range), so the cost is one query
+    whatever the number of cities. Buckets are already truncated to the same
+    UTC boundaries, so aligning is a merge on bucket_start.
+
+    Args:
+        db (Session): Database session.
+        cities (list[str]): City names, in the order of the result.
+        metric (str): One of AVERAGES (temperature, humidity, pressure, wind_speed).
+        bucket (str): One of "hour", "day", "week", "month".
+        start (datetime, optional): Inclusive lower bound on bucket start.
+        end (datetime, optional): Exclusive upper bound on bucket start.
+
+    Returns:
+        dict: ``buckets`` (ISO-8601 bucket starts, oldest first) and ``series``
+        mapping each city to its average per bucket (None where it has no data).
+    """
+    total, count = AVERAGES[metric]
+    query = select(WeatherRollup.city, WeatherRollup.bucket_start, total, count).where(
+        WeatherRollup.city.in_(cities), WeatherRollup.bucket == bucket
+    )
+    if start is not None:
+        query = query.where(WeatherRollup.bucket_start >= bucket_start(start, bucket))
+    if end is not None:
+        query = query.where(WeatherRollup.bucket_start < to_utc(end))
+    rows = db.execute(query.order_by(WeatherRollup.bucket_start)).all()
+
+    starts = sorted({to_utc(r.bucket_start) for r in rows})
+    position = {ts: i for i, ts in enumerate(starts)}
+    series = {city: [None] * len(starts) for city in cities}
+    for city, ts, row_total, row_count in rows:
+        series[city][position[to_utc(ts)]] = _avg(row_total, row_count)
+    return {"buckets": [ts.isoformat() for ts in starts], "series": series}
+
+if __name__ == "__main__":
+    from app.db import SessionLocal
+    session = SessionLocal()
+    try:
+        print(f"Rebuilt rollups from {rebuild_rollups(session)} rows")
+    finally:
+        session.close()
@@ -4,30 +4,93 @@ Weather Service.
 Service layer that centralizes weather-related business logic:
 
 - fetch_current_weather(city: str) -> dict
-    Retrieves current weather using openweather_adapter.
+    Retrieves current weather using openweather_adapter (cached).
 
 - save_weather_data(city: str, db: Session)
     Saves the current weather of a city into the database.
 
-- get_weather_history(db: Session, city: str, limit: int, offset: int) -> PaginatedWeatherResponse
-    Fetches historical weather records (with optional pagination).
+- save_weather_batch_data(cities: list[str], db: Session) -> dict
+    Fetches several cities concurrently and saves them in one transaction.
+
+- get_weather_history(db: Session, city: str, limit: int, offset: int, cursor: str) -> PaginatedWeatherResponse
+    Fetches historical weather records (offset or keyset pagination).
 
 - get_daily_summary(city: str, db: Session) -> dict
-    Computes min/max/average weather metrics for the current day.
+    Computes min/max/average weather metrics for the current day in one aggregate query.
 
-- get_latest_weather(city: str, db: Session) -> Weather
-    Returns the most recent weather record for a city.
+- get_latest_weather(city: str, db: Session) -> dict
+    Returns the most recent weather record for a city (served from latest_store).
+
+- get_latest_record(city: str, db: Session) -> dict | None / get_latest_snapshot() -> list
+    Raw newest observation of one city / of every known city, from memory.
+
+- get_city_version(city: str, db: Session) -> CityVersion | None
+    Returns the newest created_at and row count of a city (drives ETag/Last-Modified).
+
+- get_weather_aggregates(city: str, bucket: str, start, end, db: Session) -> list
+    Returns hourly/daily/weekly/monthly aggregates from the rollup tables.
+
+- get_weather_comparison(cities: list[str], metric: str, bucket: str, start, end, db: Session) -> dict
+    Returns one metric of several cities on a shared bucket axis, in one query.
+
+- fetch_5day_forecast(city: str) -> list
+    Retrieves the 5-day forecast using openweather_adapter (cached).
+
+- fetch_current_weather_async / fetch_5day_forecast_async
+    Async counterparts backed by openweather_async, for async route handlers.
+
+- fetch_current_weather_batch(cities: list[str], timeout: float) -> dict
+    Current weather of many cities fetched concurrently under one deadline.
+
+Upstream responses are kept in a bounded LRU+TTL cache keyed by normalized city
+and units, so repeated dashboard requests do not reach OpenWeather.
 """
+import asyncio
+import time
+from typing import NamedTuple, Optional
+from sqlalchemy import and_, or_, func, select
 from sqlalchemy.orm import Session
-from app.crud import save_weather
+from app.crud import save_weather, fetch_weather_many, save_weather_batch
+from app.config import (
+    SCHEDULER_MAX_WORKERS,
+    WEATHER_CACHE_TTL_SECONDS,
+    WEATHER_CACHE_MAX_ENTRIES,
+    LATEST_SNAPSHOT_TTL_SECONDS,
+    BATCH_CONCURRENCY,
+    BATCH_TIMEOUT_SECONDS,
+    BATCH_MAX_CITIES,
+    COMPARE_DEFAULT_BUCKETS,
+)
+from app.utils.cache import TTLCache
 from app.models import Weather
 from app.services.openweather_adapter import get_weather
-from app.schemas import PaginatedWeatherResponse
+from app.schemas import PaginatedWeatherResponse, WeatherResponse
 from fastapi import HTTPException
-from datetime import date, timedelta
+from datetime import datetime, timedelta, timezone
 from app.services.openweather_adapter import get_5day_forecast
+from app.services.openweather_async import get_weather_async, get_5day_forecast_async
 from app.utils.validation import validate_city_name
-from app.exceptions import AppError
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.services.rollups import AVERAGES, BUCKETS, compare_rollups, get_rollups, window_start
+from app.services.latest_store import latest_store
+from app.exceptions import AppError, ValidationError, RateLimitError
+
+UNITS = "metric"
+
+# Only the columns exposed by WeatherResponse are fetched for history pages.
+HISTORY_COLUMNS = [Weather.__table__.c[name] for name in WeatherResponse.model_fields]
+
+weather_cache = TTLCache(maxsize=WEATHER_CACHE_MAX_ENTRIES, ttl=WEATHER_CACHE_TTL_SECONDS)
+
+def _cache_key(kind: str, city: str, units: str = UNITS) -> tuple:
+    """Build a cache key from a normalized city name (case and whitespace insensitive)."""
+    return (kind, " ".join(city.split()).lower(), units)
+
+def get_cache_stats() -> dict:
+    """
+    Returns hit/miss/eviction statistics of the upstream response cache.
+    """
+    return weather_cache.stats()
 
 def fetch_current_weather(city: str) -> dict:
     """
@@ -42,10 +105,13 @@ def fetch_current_weather(city: str) -> dict:
     Raises:
         ValidationError: If city name is invalid.
         APIError: If external API fails.
+        RateLimitError: If the upstream rate limiter rejects the call.
     """
     validate_city_name(city)
     try:
-        return get_weather(city)
+        return weather_cache.get_or_load(_cache_key("weather", city), lambda: get_weather(city))
+    except RateLimitError:
+        raise
     except Exception as e:
         raise AppError(message=f"Error fetching weather for {city}: {str(e)}", code=502)
 
@@ -59,45 +125,106 @@ def save_weather_data(city: str, db: Session):
 
     Raises:
         ValidationError: If city name is invalid.
+        RateLimitError: If the upstream rate limiter rejects the call.
         APIError, DatabaseError: On failure.
     """
     validate_city_name(city)
     try:
         save_weather(city, db=db)
+    except RateLimitError:
+        raise
     except Exception as e:
         raise AppError(message=f"Error saving weather for {city}: {str(e)}", code=502)
 
-def get_weather_history(db: Session, city: str = None, limit: int = 50, offset: int = 0) -> PaginatedWeatherResponse:
+def save_weather_batch_data(cities: list, db: Session) -> dict:
+    """
+    Fetches the current weather of several cities and saves them in one transaction.
+
+    Args:
+        cities (list[str]): City names.
+        db (Session): Database session.
+
+    Returns:
+        dict: Saved cities and per-city errors.
+
+    Raises:
+        ValidationError: If any city name is invalid.
+        DatabaseError: If the batch transaction fails.
+    """
+    for city in cities:
+        validate_city_name(city)
+    fetched = fetch_weather_many(cities, max_workers=SCHEDULER_MAX_WORKERS)
+    result = save_weather_batch(fetched["results"], db=db)
+    result["failures"].update(fetched["failures"])
+    return result
+
+def get_weather_history(
+    db: Session,
+    city: str = None,
+    limit: int = 50,
+    offset: int = 0,
+    cursor: str = None,
+    include_total: bool = True,
+) -> PaginatedWeatherResponse:
     """
     Fetches historical weather records (with optional pagination).
 
+    Records are ordered by ``(created_at, id)`` descending. When ``cursor`` is
+    given, keyset pagination is used and ``offset`` is ignored, so every page
+    costs the same regardless of depth. Records are lightweight Core rows with
+    only the WeatherResponse columns (see app.utils.serialization for the fast
+    JSON path).
+
     Args:
         db (Session): Database session.
         city (str, optional): City name.
         limit (int): Max records to return.
-        offset (int): Records to skip.
+        offset (int): Records to skip (ignored when a cursor is given).
+        cursor (str, optional): Opaque cursor from a previous ``next_cursor``.
+        include_total (bool): Whether to run the COUNT query for ``total``.
 
     Returns:
-        PaginatedWeatherResponse: Paginated weather records.
+        PaginatedWeatherResponse: Paginated weather records and the next cursor.
 
     Raises:
-        ValidationError: If city name is invalid.
+        ValidationError: If city name or cursor is invalid.
     """
     if city:
         validate_city_name(city)
+    position = decode_cursor(cursor) if cursor else None
     try:
-        query = db.query(Weather)
+        query = select(*HISTORY_COLUMNS)
         if city:
-            query = query.filter(Weather.city == city)
-        total = query.count()
-        records = query.order_by(Weather.created_at.desc()).offset(offset).limit(limit).all()
-        return {"total": total, "records": records}
+            query = query.where(Weather.city == city)
+        total = None
+        if include_total:
+            total = db.scalar(select(func.count()).select_from(query.with_only_columns(Weather.id).subquery()))
+        if position:
+            created_at, record_id = position
+            query = query.where(or_(
+                Weather.created_at < created_at,
+                and_(Weather.created_at == created_at, Weather.id < record_id),
+            ))
+        query = query.order_by(Weather.created_at.desc(), Weather.id.desc())
+        if not position and offset:
+            query = query.offset(offset)
+        records = db.execute(query.limit(limit + 1)).all()
+
+        next_cursor = None
+        if len(records) > limit:
+            records = records[:limit]
+            next_cursor = encode_cursor(records[-1].created_at, records[-1].id)
+        return {"total": total, "records": records, "next_cursor": next_cursor}
     except Exception as e:
         raise AppError(message=f"Error fetching weather history: {str(e)}", code=502)
 
 def get_daily_summary(city: str, db: Session):
     """
-    Computes min/max/average weather metrics for the current day.
+    Computes min/max/average weather metrics for the current UTC day.
+
+    Days are UTC, like the daily rollups, whatever the server's local time zone.
+    The aggregation runs as a single SQL statement backed by the
+    (city, created_at) index, so no rows are loaded into Python.
 
     Args:
         city (str): Name of the city.
@@ -113,40 +240,157 @@ def get_daily_summary(city: str, db: Session):
     """
     validate_city_name(city)
     try:
-        today = date.today()
+        today = datetime.combine(datetime.now(timezone.utc).date(), datetime.min.time(), tzinfo=timezone.utc)
         tomorrow = today + timedelta(days=1)
-        records = db.query(Weather).filter(
+        row = db.query(
+            func.count(Weather.id).label("records"),
+            func.min(Weather.temperature).label("temp_min"),
+            func.max(Weather.temperature).label("temp_max"),
+            func.min(Weather.humidity).label("humidity_min"),
+            func.max(Weather.humidity).label("humidity_max"),
+            func.avg(Weather.feels_like).label("feels_like_avg"),
+            func.avg(Weather.pressure).label("pressure_avg"),
+            func.min(Weather.wind_speed).label("wind_speed_min"),
+            func.max(Weather.wind_speed).label("wind_speed_max"),
+            func.avg(Weather.clouds).label("cloudiness_avg"),
+        ).filter(
             Weather.city == city,
             Weather.created_at >= today,
             Weather.created_at < tomorrow
-        ).all()
-        if not records:
+        ).one()
+        if not row.records:
             raise HTTPException(status_code=404, detail="No weather data today")
 
-        temps = [r.temperature for r in records]
-        humidities = [r.humidity for r in records]
-        feels_like = [r.feels_like for r in records if r.feels_like is not None]
-        pressures = [r.pressure for r in records if r.pressure is not None]
-        winds = [r.wind_speed for r in records if r.wind_speed is not None]
-        clouds = [r.clouds for r in records if r.clouds is not None]
+        def _avg(value):
+            return round(float(value), 2) if value is not None else None
 
         return {
             "city": city,
-            "temp_min": min(temps),
-            "temp_max": max(temps),
-            "humidity_min": min(humidities),
-            "humidity_max": max(humidities),
-            "feels_like_avg": round(sum(feels_like)/len(feels_like), 2) if feels_like else None,
-            "pressure_avg": round(sum(pressures)/len(pressures), 2) if pressures else None,
-            "wind_speed_min": min(winds) if winds else None,
-            "wind_speed_max": max(winds) if winds else None,
-            "cloudiness_avg": round(sum(clouds)/len(clouds), 2) if clouds else None,
+            "temp_min": row.temp_min,
+            "temp_max": row.temp_max,
+            "humidity_min": row.humidity_min,
+            "humidity_max": row.humidity_max,
+            "feels_like_avg": _avg(row.feels_like_avg),
+            "pressure_avg": _avg(row.pressure_avg),
+            "wind_speed_min": row.wind_speed_min,
+            "wind_speed_max": row.wind_speed_max,
+            "cloudiness_avg": _avg(row.cloudiness_avg),
         }
     except HTTPException:
         raise
     except Exception as e:
         raise AppError(message=f"Error getting daily summary for {city}: {str(e)}", code=502)
 
+def get_weather_aggregates(city: str, bucket: str, db: Session, start: datetime = None, end: datetime = None) -> list:
+    """
+    Returns pre-aggregated weather metrics for a city at the given resolution.
+
+    Args:
+        city (str): Name of the city.
+        bucket (str): "hour", "day", "week" or "month".
+        db (Session): Database session.
+        start (datetime, optional): Inclusive start of the range.
+        end (datetime, optional): Exclusive end of the range.
+
+    Returns:
+        list[dict]: One entry per bucket, oldest first.
+
+    Raises:
+        ValidationError: If city name or range is invalid.
+    """
+    validate_city_name(city)
+    if start and end and start >= end:
+        raise ValidationError("'from' must be earlier than 'to'.")
+    try:
+        return get_rollups(db, city, bucket, start, end)
+    except Exception as e:
+        raise AppError(message=f"Error getting aggregates for {city}: {str(e)}", code=502)
+
+def get_weather_comparison(
+    cities: list,
+    metric: str,
+    bucket: str,
+    db: Session,
+    start: datetime = None,
+    end: datetime = None,
+) -> dict:
+    """
+    Returns one metric of several cities aligned on the same buckets.
+
+    Args:
+        cities (list[str]): City names; duplicates are dropped, order is kept.
+        metric (str): temperature, humidity, pressure or wind_speed.
+        bucket (str): "hour", "day", "week" or "month".
+        db (Session): Database session.
+        start (datetime, optional): Inclusive start of the range. Defaults to the
+            last COMPARE_DEFAULT_BUCKETS buckets before ``end`` (or now), so an
+            open range does not return the whole history.
+        end (datetime, optional): Exclusive end of the range.
+
+    Returns:
+        dict: ``metric``, ``bucket``, ``cities``, ``buckets`` (bucket starts)
+        and ``series`` (one list of averages per city, aligned with ``buckets``).
+
+    Raises:
+        ValidationError: If a city name, the metric, the bucket or the range is
+            invalid, or more than BATCH_MAX_CITIES cities are given.
+    """
+    cities = list(dict.fromkeys(city.strip() for city in cities if city.strip()))
+    if not cities:
+        raise ValidationError("At least one city is required.")
+    if len(cities) > BATCH_MAX_CITIES:
+        raise ValidationError(f"At most {BATCH_MAX_CITIES} cities per comparison.")
+    for city in cities:
+        validate_city_name(city)
+    if metric not in AVERAGES:
+        raise ValidationError(f"Unknown metric '{metric}'. Valid metrics: {', '.join(AVERAGES)}.")
+    if bucket not in BUCKETS:
+        raise ValidationError(f"Unknown bucket '{bucket}'. Valid buckets: {', '.join(BUCKETS)}.")
+    if start and end and start >= end:
+        raise ValidationError("'from' must be earlier than 'to'.")
+    if start is None:
+        start = window_start(end or datetime.now(timezone.utc), bucket, COMPARE_DEFAULT_BUCKETS)
+    try:
+        aligned = compare_rollups(db, cities, metric, bucket, start, end)
+    except Exception as e:
+        raise AppError(message=f"Error comparing {', '.join(cities)}: {str(e)}", code=502)
+    return {"metric": metric, "bucket": bucket, "cities": cities, **aligned}
+
+def get_latest_record(city: str, db: Session) -> Optional[dict]:
+    """
+    Returns the newest stored observation of a city as raw column values.
+
+    Served from the in-memory latest_store without a query while the entry was
+    confirmed against the database less than LATEST_SNAPSHOT_TTL_SECONDS ago.
+    Otherwise the newest row is read with one indexed query and the entry is
+    refreshed, so rows committed by other processes appear within that delay.
+
+    Args:
+        city (str): Name of the city.
+        db (Session): Database session.
+
+    Returns:
+        dict | None: WeatherResponse column values (created_at in UTC), or None if the city has no data.
+    """
+    record = latest_store.get(city, max_age=LATEST_SNAPSHOT_TTL_SECONDS)
+    if record is not None:
+        return record
+    row = db.execute(
+        select(*HISTORY_COLUMNS)
+        .where(Weather.city == city)
+        .order_by(Weather.created_at.desc(), Weather.id.desc())
+        .limit(1)
+    ).mappings().first()
+    if row is None:
+        latest_store.discard(city)
+        return None
+    latest_store.update([row])
+    return latest_store.get(city)
+
+def serialize_weather(record: dict) -> dict:
+    """Serializes stored column values exactly like WeatherResponse."""
+    return WeatherResponse.model_validate(record).model_dump(mode="json")
+
 def get_latest_weather(city: str, db: Session):
     """
     Returns the most recent weather record for a city.
@@ -156,21 +400,89 @@ def get_latest_weather(city: str, db: Session):
         db (Session): Database session.
 
     Returns:
-        Weather: Latest weather record or current weather from API.
+        dict: Latest stored record (serialized like WeatherResponse) or current weather from API.
 
     Raises:
         ValidationError: If city name is invalid.
+        RateLimitError: If the live fallback is rejected by the upstream rate limiter.
         APIError: If DB/API fails.
     """
     validate_city_name(city)
     try:
-        record = db.query(Weather).filter(Weather.city == city).order_by(Weather.created_at.desc()).first()
+        record = get_latest_record(city, db)
         if record:
-            return record
+            return serialize_weather(record)
         return fetch_current_weather(city)
+    except RateLimitError:
+        raise
     except Exception as e:
         raise AppError(message=f"Error getting latest weather for {city}: {str(e)}", code=502)
 
+def get_latest_snapshot(db: Session = None) -> list:
+    """
+    Returns the newest observation of every city known to the latest store.
+
+    The store is reloaded from the database first when it has not been loaded
+    for LATEST_SNAPSHOT_TTL_SECONDS, so rows from other processes appear
+    within that delay.
+
+    Args:
+        db (Session, optional): Database session used to reload a stale store.
+
+    Returns:
+        list[dict]: Raw column values, ordered by city name.
+    """
+    age = latest_store.age()
+    if db is not None and (age is None or age > LATEST_SNAPSHOT_TTL_SECONDS):
+        latest_store.load(db)
+    snapshot = latest_store.snapshot()
+    return [snapshot[city] for city in sorted(snapshot)]
+
+class CityVersion(NamedTuple):
+    """Version of a city's stored data: newest created_at and number of rows."""
+    newest: datetime
+    rows: int
+
+def get_city_version(city: str, db: Session) -> Optional[CityVersion]:
+    """
+    Returns the newest created_at and the row count stored for a city.
+
+    Stored-data responses for a city change when a row is saved (newest moves)
+    or when old rows are deleted, e.g. purged after archiving (rows drops
+    while newest stays), so both version them. One query over the city's
+    range of ix_weather_city_created_at.
+
+    Args:
+        city (str): Name of the city.
+        db (Session): Database session.
+
+    Returns:
+        CityVersion | None: Newest created_at and row count, or None if the city has no data.
+    """
+    newest, rows = db.execute(
+        select(func.max(Weather.created_at), func.count()).where(Weather.city == city)
+    ).one()
+    return CityVersion(newest, rows) if rows else None
+
+def _parse_forecast(data: dict) -> list:
+    """Map a raw 5-day forecast payload to the list of records returned to clients."""
+    if not data or "list" not in data:
+        return []
+    forecast = []
+    for item in data["list"]:
+        forecast.append({
+            "created_at": item.get("dt_txt"),
+            "temperature": item.get("main", {}).get("temp"),
+            "feels_like": item.get("main", {}).get("feels_like"),
+            "humidity": item.get("main", {}).get("humidity"),
+            "pressure": item.get("main", {}).get("pressure"),
+            "wind_speed": item.get("wind", {}).get("speed"),
+            "wind_deg": item.get("wind", {}).get("deg"),
+            "cloudiness": item.get("clouds", {}).get("all"),
+            "icon": item.get("weather", [{}])[0].get("icon"),
+        })
+    return forecast
+
 def fetch_5day_forecast(city: str):
     """
     Fetch the 5-day forecast for a given city from the external API.
@@ -187,22 +499,108 @@ def fetch_5day_forecast(city: str):
     """
     validate_city_name(city)
     try:
-        data = get_5day_forecast(city)
-        if not data or "list" not in data:
-            return []
-        forecast = []
-        for item in data["list"]:
-            forecast.append({
-                "created_at": item.get("dt_txt"),
-                "temperature": item.get("main", {}).get("temp"),
-                "feels_like": item.get("main", {}).get("feels_like"),
-                "humidity": item.get("main", {}).get("humidity"),
-                "pressure": item.get("main", {}).get("pressure"),
-                "wind_speed": item.get("wind", {}).get("speed"),
-                "wind_deg": item.get("wind", {}).get("deg"),
-                "cloudiness": item.get("clouds", {}).get("all"),
-                "icon": item.get("weather", [{}])[0].get("icon"),
-            })
-        return forecast
+        data = weather_cache.get_or_load(_cache_key("forecast", city), lambda: get_5day_forecast(city))
+        return _parse_forecast(data)
+    except RateLimitError:
+        raise
+    except Exception as e:
+        raise AppError(message=f"Error fetching 5-day forecast for {city}: {str(e)}", code=502)
+
+async def fetch_current_weather_async(city: str) -> dict:
+    """
+    Async version of fetch_current_weather; shares the same cache entries.
+
+    Raises:
+        ValidationError: If city name is invalid.
+        APIError: If external API fails.
+    """
+    validate_city_name(city)
+    try:
+        return await weather_cache.aget_or_load(_cache_key("weather", city), lambda: get_weather_async(city))
+    except RateLimitError:
+        raise
+    except Exception as e:
+        raise AppError(message=f"Error fetching weather for {city}: {str(e)}", code=502)
+
+async def fetch_current_weather_batch(
+    cities: list,
+    timeout: float = BATCH_TIMEOUT_SECONDS,
+    concurrency: int = BATCH_CONCURRENCY,
+) -> dict:
+    """
+    Fetch the current weather of several cities concurrently.
+
+    Every city goes through the same validation and cache as
+    fetch_current_weather_async; spellings of the same city (case, spaces) are
+    fetched once. Cities still pending when ``timeout`` expires are cancelled and
+    reported as errors, so the call never takes much longer than ``timeout``.
+
+    Args:
+        cities (list[str]): City names, in the order to report them.
+        timeout (float): Deadline in seconds for the whole batch.
+        concurrency (int): Upstream lookups in flight at once.
+
+    Returns:
+        dict: ``results`` (city -> weather data), ``errors`` (city -> message)
+        and ``duration_ms``.
+    """
+    start = time.perf_counter()
+    unique = {}
+    for city in cities:
+        unique.setdefault(_cache_key("weather", city), city)
+
+    errors = {}
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _fetch(city: str) -> dict:
+        async with semaphore:
+            return await fetch_current_weather_async(city)
+
+    tasks = {}
+    for city in unique.values():
+        try:
+            validate_city_name(city)
+        except ValidationError as e:
+            errors[city] = e.message
+            continue
+        tasks[city] = asyncio.create_task(_fetch(city))
+
+    if tasks:
+        _, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    results = {}
+    for city, task in tasks.items():
+        if task.cancelled():
+            errors[city] = f"Timed out after {timeout:g}s"
+        elif task.exception() is not None:
+            exc = task.exception()
+            errors[city] = getattr(exc, "message", None) or str(exc)
+        else:
+            results[city] = task.result()
+
+    order = {city: i for i, city in enumerate(unique.values())}
+    return {
+        "results": results,
+        "errors": dict(sorted(errors.items(), key=lambda item: order[item[0]])),
+        "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+
+async def fetch_5day_forecast_async(city: str) -> list:
+    """
+    Async version of fetch_5day_forecast; shares the same cache entries.
+
+    Raises:
+        ValidationError: If city name is invalid.
+        APIError: If external API fails.
+    """
+    validate_city_name(city)
+    try:
+        data = await weather_cache.aget_or_load(_cache_key("forecast", city), lambda: get_5day_forecast_async(city))
+        return _parse_forecast(data)
+    except RateLimitError:
+        raise
     except Exception as e:
-        raise AppError(message=f"Error fetching 5-day forecast for {city}: {str(e)}", code=502)
\ No newline at end of file
+        raise AppError(message=f"Error fetching 5-day forecast for {city}: {str(e)}", code=502)
@@ -0,0 +1,187 @@
+"""
+In-memory caching utilities.
+
+Provides:
+- TTLCache : bounded LRU cache whose entries expire after a fixed TTL. Concurrent
+  misses for the same key are coalesced into a single loader call (singleflight),
+  both for threads (get_or_load) and for coroutines (aget_or_load).
+
+Example usage:
+    cache = TTLCache(maxsize=1024, ttl=600)
+    data = cache.get_or_load(("weather", "madrid", "metric"), lambda: get_weather("Madrid"))
+    data = await cache.aget_or_load(("weather", "madrid", "metric"), lambda: get_weather_async("Madrid"))
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class _InFlight:
+    """Pending loader call shared by every thread waiting on the same key."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTL, singleflight loading and stats."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            maxsize (int): Maximum number of entries before the least recently used is evicted.
+            ttl (float): Seconds an entry stays fresh.
+            clock (Callable): Monotonic time source, overridable in tests.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._inflight: dict = {}
+        self._inflight_async: dict = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._coalesced = 0
+
+    def _lookup(self, key: Hashable):
+        """Return (found, value); must be called with the lock held."""
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            self._expirations += 1
+            return False, None
+        self._data.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        """Insert a value and evict LRU entries; must be called with the lock held."""
+        self._data[key] = (self._clock() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self._evictions += 1
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a fresh cached value or ``default``."""
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self._hits += 1
+                return value
+            self._misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, replacing any previous entry."""
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for ``key`` or load it.
+
+        Only one caller runs ``loader`` for a given key at a time; concurrent
+        callers wait for its result. Loader errors are propagated to every
+        waiter and are never cached.
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self._hits += 1
+                return value
+            self._misses += 1
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _InFlight()
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = loader()
+        except BaseException as e:
+            call.error = e
+            raise
+        else:
+            with self._lock:
+                self._store(key, call.value)
+            return call.value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.event.set()
+
+    async def aget_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async variant of get_or_load: concurrent coroutines missing the same key
+        await a single ``loader()`` call.
+
+        The load runs in its own task, so cancelling any caller (including the
+        one that started it) never cancels the shared load: the other callers
+        still get its result, which is cached as usual.
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self._hits += 1
+                return value
+            self._misses += 1
+            task = self._inflight_async.get(key)
+            if task is None:
+                task = self._inflight_async[key] = asyncio.ensure_future(self._aload(key, loader))
+                # Retrieve the outcome even if every caller was cancelled.
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            else:
+                self._coalesced += 1
+        return await asyncio.shield(task)
+
+    async def _aload(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Run one shared async load and cache its result (errors are not cached)."""
+        try:
+            value = await loader()
+            with self._lock:
+                self._store(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight_async.pop(key, None)
+
+    def invalidate(self, key: Hashable = None) -> None:
+        """Drop one key, or every entry when ``key`` is None."""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self) -> dict:
+        """Return hit/miss/eviction counters and current size."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "coalesced": self._coalesced,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,51 @@
+"""
+Time series downsampling.
+
+- lttb(x, y, threshold) : Largest-Triangle-Three-Buckets (Steinarsson, 2013).
+  Picks ``threshold`` of the original points so that a line drawn through
+  them keeps the visual shape of the full series (peaks and troughs survive,
+  unlike with striding or bucket averages).
+"""
+import numpy as np
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; the rest are split into
+    ``threshold - 2`` buckets of equal size and, bucket by bucket, the point
+    forming the largest triangle with the previously kept point and the mean
+    of the next bucket is kept. Work is O(n) with one NumPy pass per bucket.
+
+    Args:
+        x (np.ndarray): Ascending x values (e.g. epoch seconds), without NaN.
+        y (np.ndarray): Values at x, without NaN.
+        threshold (int): Number of points to keep (at least 3).
+
+    Returns:
+        np.ndarray: Ascending indices into x/y; all indices if the series
+        already has at most ``threshold`` points.
+    """
+    n = x.size
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Bucket i (1..threshold-2) covers [edges[i-1], edges[i]) of points 1..n-2.
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < edges.size:
+            next_lo, next_hi = hi, edges[bucket + 2]
+            next_x, next_y = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        px, py = x[previous], y[previous]
+        # Twice the triangle area; the constant factor does not change the argmax.
+        area = np.abs((px - next_x) * (y[lo:hi] - py) - (px - x[lo:hi]) * (next_y - py))
+        previous = lo + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
@@ -0,0 +1,50 @@
+"""
+Geospatial helpers.
+
+- validate_coordinates(lat, lon) : rejects latitudes/longitudes out of range.
+- geohash_encode(lat, lon, precision) : quantizes coordinates to a geohash cell,
+  so nearby points share the same key (precision 6 is roughly 1.2 km x 0.6 km).
+"""
+from app.exceptions import ValidationError
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+def validate_coordinates(lat: float, lon: float) -> None:
+    """
+    Check that coordinates are within the valid latitude/longitude ranges.
+
+    Raises:
+        ValidationError: If lat is outside [-90, 90] or lon outside [-180, 180].
+    """
+    if not (-90 <= lat <= 90) or not (-180 <= lon <= 180):
+        raise ValidationError(message="Invalid latitude or longitude values.")
+
+def geohash_encode(lat: float, lon: float, precision: int = 6) -> str:
+    """
+    Encode coordinates as a geohash string.
+
+    Args:
+        lat (float): Latitude in [-90, 90].
+        lon (float): Longitude in [-180, 180].
+        precision (int): Number of characters (1-12).
+
+    Returns:
+        str: Geohash of the cell containing the point.
+    """
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bit, ch, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            ch = (ch << 1) | 1
+            rng[0] = mid
+        else:
+            ch <<= 1
+            rng[1] = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(_BASE32[ch])
+            bit, ch = 0, 0
+    return "".join(chars)
@@ -0,0 +1,91 @@
+"""
+HTTP conditional request helpers (ETag / Last-Modified).
+
+Stored-data endpoints only change when an observation is saved or old rows
+are deleted, so their validators are derived from the city's newest
+``created_at`` and row count (its "version") plus the request parameters. A matching ``If-None-Match`` or a fresh
+``If-Modified-Since`` is answered with 304 before the main query runs.
+
+Provides:
+- make_etag(city, version, *parts) -> str
+- not_modified(request, etag, last_modified) -> bool
+- cache_headers(etag, last_modified) -> dict
+- not_modified_response(etag, last_modified) -> Response
+
+Example usage:
+    version = get_city_version(city, db)
+    etag = make_etag(city, version.newest, version.rows, request.url.query)
+    if not_modified(request, etag, version.newest):
+        return not_modified_response(etag, version.newest)
+"""
+import hashlib
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request, Response
+from app.utils.serialization import to_utc
+
+def make_etag(city: str, version: Optional[datetime], *parts: object) -> str:
+    """
+    Build a strong ETag from a city, its data version and any extra request parts.
+
+    Args:
+        city (str): City name (case-insensitive).
+        version (datetime, optional): Newest created_at stored for the city.
+        *parts: Anything else the representation depends on (query string, date...).
+
+    Returns:
+        str: Quoted ETag value.
+    """
+    stamp = to_utc(version).isoformat() if version else "-"
+    raw = "|".join([city.strip().lower(), stamp, *(str(p) for p in parts)])
+    return f'"{hashlib.sha1(raw.encode()).hexdigest()[:20]}"'
+
+def not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since against the current validators.
+
+    If-None-Match takes precedence; If-Modified-Since is only consulted when the
+    client sent no ETag (RFC 9110, section 13.2.2).
+
+    Args:
+        request (Request): Incoming request.
+        etag (str): Current ETag.
+        last_modified (datetime, optional): Current Last-Modified time.
+
+    Returns:
+        bool: True when the client's copy is still valid.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return to_utc(last_modified).replace(microsecond=0) <= to_utc(since)
+    return False
+
+def cache_headers(etag: str, last_modified: Optional[datetime] = None) -> dict:
+    """
+    Validator headers for a response; clients must revalidate before reuse.
+
+    Args:
+        etag (str): Current ETag.
+        last_modified (datetime, optional): Current Last-Modified time.
+
+    Returns:
+        dict: ETag, Last-Modified and Cache-Control headers.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(to_utc(last_modified), usegmt=True)
+    return headers
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """Return an empty 304 response carrying the current validators."""
+    return Response(status_code=304, headers=cache_headers(etag, last_modified))
@@ -0,0 +1,48 @@
+"""
+Cursor helpers for keyset pagination.
+
+A cursor is an opaque, URL-safe token encoding the ``(created_at, id)`` of the
+last record of a page. The next page is fetched with
+``WHERE (created_at, id) < (cursor.created_at, cursor.id)``, so its cost does
+not depend on how deep the client has paged.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+from app.exceptions import ValidationError
+
+def encode_cursor(created_at: datetime, record_id: UUID) -> str:
+    """
+    Encode the sort key of a record into an opaque cursor.
+
+    Args:
+        created_at (datetime): Record timestamp.
+        record_id (UUID): Record id (tie-breaker for equal timestamps).
+
+    Returns:
+        str: URL-safe cursor.
+    """
+    raw = json.dumps([created_at.isoformat(), str(record_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): Opaque cursor.
+
+    Returns:
+        tuple[datetime, UUID]: ``(created_at, id)`` of the last record of the previous page.
+
+    Raises:
+        ValidationError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, record_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), UUID(record_id)
+    except (ValueError, TypeError):
+        raise ValidationError(f"Invalid pagination cursor: {cursor}")
@@ -0,0 +1,234 @@
+"""
+Upstream rate limiting.
+
+Every OpenWeather call made by this process, from the scheduler or from any
+route, goes through one token bucket so traffic spikes cannot burn the
+per-minute quota that the hourly ingestion depends on. Retries count: both
+HTTP clients take a token for every attempt.
+
+The bucket is per process, not shared between processes: with several uvicorn
+workers (or the cron job running alongside the API) each one has its own
+budget, so configure OPENWEATHER_RATE_PER_MINUTE, OPENWEATHER_BURST and
+OPENWEATHER_DAILY_QUOTA as the provider's limits divided by the number of
+processes.
+
+Provides:
+- RateLimiter : token bucket with priority classes, deadline-bounded queueing,
+  an optional daily quota and stats.
+- upstream_limiter : module-level instance configured from app.config.
+- upstream_priority(name) : context manager setting the priority of calls made
+  in the current context ("scheduled" or "interactive", the default).
+
+Priorities:
+- scheduled   : may use every token; waits up to RATE_LIMIT_SCHEDULED_TIMEOUT.
+- interactive : cannot dip into the last OPENWEATHER_RESERVED_TOKENS tokens (nor
+  the last OPENWEATHER_DAILY_RESERVE calls of the day); waits up to
+  RATE_LIMIT_INTERACTIVE_TIMEOUT.
+
+Callers reserve a token and then sleep until it is theirs, so waiting callers
+are served in reservation order and a caller whose deadline cannot be met is
+rejected immediately (RateLimitError) instead of queueing in vain.
+
+Example usage:
+    upstream_limiter.acquire()              # threads
+    await upstream_limiter.acquire_async()  # coroutines
+    with upstream_priority(SCHEDULED):
+        fetch_weather_many(cities)
+"""
+import asyncio
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+from app.config import (
+    OPENWEATHER_RATE_PER_MINUTE,
+    OPENWEATHER_BURST,
+    OPENWEATHER_RESERVED_TOKENS,
+    OPENWEATHER_DAILY_QUOTA,
+    OPENWEATHER_DAILY_RESERVE,
+    RATE_LIMIT_INTERACTIVE_TIMEOUT,
+    RATE_LIMIT_SCHEDULED_TIMEOUT,
+)
+from app.exceptions import RateLimitError
+from app.metrics import UPSTREAM_RATE_LIMITED, UPSTREAM_TOKENS_AVAILABLE
+
+SCHEDULED = "scheduled"
+INTERACTIVE = "interactive"
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("upstream_priority", default=INTERACTIVE)
+
+@contextmanager
+def upstream_priority(name: str):
+    """Run the enclosed upstream calls with the given priority class."""
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def current_priority() -> str:
+    """Priority class of upstream calls made from the current context."""
+    return _priority.get()
+
+def seconds_until_utc_midnight() -> float:
+    """Seconds until the daily quota resets (next UTC midnight)."""
+    now = datetime.now(timezone.utc)
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+    return (midnight - now).total_seconds()
+
+
+class RateLimiter:
+    """Per-process, thread- and asyncio-safe token bucket with priority reserves and deadlines."""
+
+    def __init__(
+        self,
+        rate_per_minute: float = OPENWEATHER_RATE_PER_MINUTE,
+        burst: int = OPENWEATHER_BURST,
+        reserved: int = OPENWEATHER_RESERVED_TOKENS,
+        daily_quota: int = OPENWEATHER_DAILY_QUOTA,
+        daily_reserve: int = OPENWEATHER_DAILY_RESERVE,
+        timeouts: Optional[dict] = None,
+        clock: Callable[[], float] = time.monotonic,
+        today: Callable[[], object] = lambda: datetime.now(timezone.utc).date(),
+    ):
+        """
+        Args:
+            rate_per_minute (float): Sustained calls per minute (0 disables limiting).
+            burst (int): Bucket capacity.
+            reserved (int): Tokens only the scheduled class may use.
+            daily_quota (int): Calls allowed per UTC day (0 = unlimited).
+            daily_reserve (int): Calls of the daily quota only the scheduled class may use.
+            timeouts (dict, optional): Longest wait in seconds per priority class.
+            clock (Callable): Monotonic time source, overridable in tests.
+            today (Callable): Current UTC date, overridable in tests.
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst)
+        self.reserved = min(float(reserved), self.capacity - 1)
+        self.daily_quota = daily_quota
+        self.daily_reserve = daily_reserve
+        self.timeouts = timeouts or {
+            SCHEDULED: RATE_LIMIT_SCHEDULED_TIMEOUT,
+            INTERACTIVE: RATE_LIMIT_INTERACTIVE_TIMEOUT,
+        }
+        self._clock = clock
+        self._today = today
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._day = today()
+        self._used_today = 0
+        self._waiting = 0
+        self._granted = {SCHEDULED: 0, INTERACTIVE: 0}
+        self._rejected = {SCHEDULED: 0, INTERACTIVE: 0}
+        self._waited_seconds = 0.0
+
+    def _refill(self, now: float) -> None:
+        """Add tokens earned since the last update; must be called with the lock held."""
+        if self.rate > 0:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        day = self._today()
+        if day != self._day:
+            self._day, self._used_today = day, 0
+
+    def _reserve(self, priority: str, timeout: Optional[float]) -> float:
+        """
+        Take a token (possibly on credit) and return how long to wait before using it.
+
+        Raises:
+            RateLimitError: If the token would not be available before the deadline,
+            or the daily quota is exhausted for this priority.
+        """
+        timeout = self.timeouts.get(priority, RATE_LIMIT_INTERACTIVE_TIMEOUT) if timeout is None else timeout
+        with self._lock:
+            self._refill(self._clock())
+            if self.rate <= 0:
+                self._granted[priority] = self._granted.get(priority, 0) + 1
+                return 0.0
+            if self.daily_quota:
+                allowed = self.daily_quota - (0 if priority == SCHEDULED else self.daily_reserve)
+                if self._used_today >= allowed:
+                    self._rejected[priority] = self._rejected.get(priority, 0) + 1
+                    UPSTREAM_RATE_LIMITED.labels(priority).inc()
+                    raise RateLimitError(
+                        f"Daily OpenWeather quota exhausted for {priority} requests.",
+                        retry_after=seconds_until_utc_midnight(),
+                    )
+            floor = 0.0 if priority == SCHEDULED else self.reserved
+            wait = max(0.0, (floor + 1 - self._tokens) / self.rate)
+            if wait > timeout:
+                self._rejected[priority] = self._rejected.get(priority, 0) + 1
+                UPSTREAM_RATE_LIMITED.labels(priority).inc()
+                raise RateLimitError(
+                    f"OpenWeather rate limit: next {priority} slot in {wait:.1f}s exceeds the {timeout:.1f}s deadline.",
+                    retry_after=wait,
+                )
+            self._tokens -= 1
+            self._used_today += 1
+            self._granted[priority] = self._granted.get(priority, 0) + 1
+            self._waited_seconds += wait
+            return wait
+
+    def acquire(self, priority: str = None, timeout: float = None) -> float:
+        """
+        Block until an upstream call may be made.
+
+        Args:
+            priority (str, optional): Priority class; defaults to the context's (upstream_priority).
+            timeout (float, optional): Longest wait; defaults to the class timeout.
+
+        Returns:
+            float: Seconds waited.
+
+        Raises:
+            RateLimitError: If no token can be granted before the deadline.
+        """
+        wait = self._reserve(priority or current_priority(), timeout)
+        if wait > 0:
+            with self._lock:
+                self._waiting += 1
+            try:
+                time.sleep(wait)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+        return wait
+
+    async def acquire_async(self, priority: str = None, timeout: float = None) -> float:
+        """Async variant of acquire: awaits instead of blocking the event loop."""
+        wait = self._reserve(priority or current_priority(), timeout)
+        if wait > 0:
+            with self._lock:
+                self._waiting += 1
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+        return wait
+
+    def stats(self) -> dict:
+        """Return the remaining budget and grant/reject counters."""
+        with self._lock:
+            self._refill(self._clock())
+            return {
+                "rate_per_minute": round(self.rate * 60, 2),
+                "capacity": self.capacity,
+                "reserved_for_scheduled": self.reserved,
+                "tokens_available": round(max(self._tokens, 0.0), 2),
+                "interactive_tokens_available": round(max(self._tokens - self.reserved, 0.0), 2),
+                "waiting": self._waiting,
+                "granted": dict(self._granted),
+                "rejected": dict(self._rejected),
+                "total_wait_seconds": round(self._waited_seconds, 3),
+                "daily_quota": self.daily_quota or None,
+                "used_today": self._used_today,
+                "remaining_today": max(self.daily_quota - self._used_today, 0) if self.daily_quota else None,
+            }
+
+
+upstream_limiter = RateLimiter()
+UPSTREAM_TOKENS_AVAILABLE.set_function(lambda: upstream_limiter.stats()["tokens_available"])
@@ -0,0 +1,85 @@
+"""
+Fast JSON serialization for bulk responses.
+
+Large history pages spend most of their time in per-row pydantic validation
+and timezone conversion. These helpers serialize Core rows directly:
+
+- LOCAL_TZ / UTC : timezone constants shared by every serializer (built once).
+- to_utc(ts) -> datetime
+    Normalizes a timestamp to aware UTC (naive values are stored UTC).
+- localize_batch(timestamps) -> list[datetime]
+    Converts stored UTC timestamps to LOCAL_TZ, resolving the UTC offset once per batch.
+- rows_to_records(rows) -> list[dict]
+    Turns Core rows into plain dicts with localized created_at.
+- FastJSONResponse : Response rendered with orjson (UUIDs and datetimes encoded natively).
+
+Example usage:
+    page = get_weather_history(db, city="Madrid", limit=500)
+    return FastJSONResponse({**page, "records": rows_to_records(page["records"])})
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, List, Sequence
+from zoneinfo import ZoneInfo
+import orjson
+from fastapi.responses import Response
+
+UTC = ZoneInfo("UTC")
+LOCAL_TZ = ZoneInfo("Europe/Madrid")
+
+# A batch shorter than this cannot span two DST transitions, so equal offsets at
+# both ends mean the offset is constant across the batch.
+_FIXED_OFFSET_SPAN = timedelta(days=60)
+
+def to_utc(ts: datetime) -> datetime:
+    """Return an aware UTC datetime; naive values are assumed to be UTC, as stored."""
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+def localize_batch(timestamps: Sequence[datetime]) -> List[datetime]:
+    """
+    Convert stored timestamps (UTC, possibly naive) to LOCAL_TZ.
+
+    When the whole batch falls under a single UTC offset, the zone rules are
+    looked up twice instead of once per row.
+
+    Args:
+        timestamps (Sequence[datetime]): Stored created_at values.
+
+    Returns:
+        list[datetime]: Aware datetimes in LOCAL_TZ (None entries are kept).
+    """
+    present = [ts for ts in timestamps if ts is not None]
+    if not present:
+        return list(timestamps)
+    lo = min(present).replace(tzinfo=UTC)
+    hi = max(present).replace(tzinfo=UTC)
+    offset = lo.astimezone(LOCAL_TZ).utcoffset()
+    if hi - lo < _FIXED_OFFSET_SPAN and hi.astimezone(LOCAL_TZ).utcoffset() == offset:
+        fixed = timezone(offset)
+        return [None if ts is None else (ts.replace(tzinfo=None) + offset).replace(tzinfo=fixed)
+                for ts in timestamps]
+    return [None if ts is None else ts.replace(tzinfo=UTC).astimezone(LOCAL_TZ) for ts in timestamps]
+
+def rows_to_records(rows: Iterable[Any]) -> List[dict]:
+    """
+    Convert Core rows (or mappings) into JSON-ready dicts with localized created_at.
+
+    Args:
+        rows (Iterable): SQLAlchemy Row objects or dicts including created_at.
+
+    Returns:
+        list[dict]: One dict per row.
+    """
+    records = [dict(row._mapping) if hasattr(row, "_mapping") else dict(row) for row in rows]
+    for record, local in zip(records, localize_batch([r.get("created_at") for r in records])):
+        record["created_at"] = local
+    return records
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson instead of the standard library encoder."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
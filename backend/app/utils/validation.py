@@ -13,7 +13,7 @@ def validate_temperature(temp: float) -> None:
         ValidationError: If temperature is outside the range -90 to 60 Celsius.
     """
     if not (-90 <= temp <= 60):
-        raise ValidationError(detail=f"Temperature {temp} out of valid range (-90 to 60°C).")
+        raise ValidationError(f"Temperature {temp} out of valid range (-90 to 60°C).")
 
 def validate_date(date_str: str) -> None:
     """
@@ -28,7 +28,7 @@ def validate_date(date_str: str) -> None:
     try:
         datetime.strptime(date_str, "%Y-%m-%d")
     except ValueError:
-        raise ValidationError(detail=f"Invalid date format: {date_str}. Expected YYYY-MM-DD.")
+        raise ValidationError(f"Invalid date format: {date_str}. Expected YYYY-MM-DD.")
 
 def validate_city_name(city: str) -> None:
     """
@@ -41,7 +41,7 @@ def validate_city_name(city: str) -> None:
         ValidationError: If city name contains invalid characters.
     """
     if not re.match(r"^[a-zA-Z\s\-]+$", city):
-        raise ValidationError(detail=f"Invalid city name: {city}. Only letters, spaces, and hyphens allowed.")
+        raise ValidationError(f"Invalid city name: {city}. Only letters, spaces, and hyphens allowed.")
 
 def validate_weather_data(data: dict, city: str) -> dict:
     """
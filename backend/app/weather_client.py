@@ -9,12 +9,17 @@ Functions:
 ----------
 get_weather(city: str, units: str = "metric", lang: str = "en") -> dict
     Fetches current weather for a given city, returning the data as a JSON dictionary.
+get_weather_group(city_ids: list, units: str = "metric", lang: str = "en") -> list
+    Fetches current weather for up to 20 OpenWeather city ids in one request.
 """
-import os
+import logging
 import requests
-from app.config import OPENWEATHER_API_KEY, OPENWEATHER_BASE_URL
+from app.config import OPENWEATHER_API_KEY, OPENWEATHER_BASE_URL, OPENWEATHER_GROUP_URL
+from app.http_client import http_client
 from app.exceptions import APIError
 
+logger = logging.getLogger(__name__)
+
 def get_weather(city: str, units: str = "metric", lang: str = "en") -> dict:
     """
     Fetch current weather for a given city from OpenWeatherMap API.
@@ -40,18 +45,55 @@ def get_weather(city: str, units: str = "metric", lang: str = "en") -> dict:
     APIError
         If the API request fails or returns a non-200 status code.
     """
-    print("city - get_weather - weather_client:", city)
+    logger.debug(f"Fetching current weather for {city}")
     params = {
         "q": city,
         "appid": OPENWEATHER_API_KEY,
         "units": units,
         "lang": lang,
     }
-    print("params - get_weather:", params)
     try:
-        response = requests.get(OPENWEATHER_BASE_URL, params=params, timeout=10)
+        response = http_client.get(OPENWEATHER_BASE_URL, params=params)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         raise APIError(f"Error fetching weather for {city}: {str(e)}")
 
-    return response.json()
\ No newline at end of file
+    return response.json()
+
+def get_weather_group(city_ids: list, units: str = "metric", lang: str = "en") -> list:
+    """
+    Fetch current weather for several cities by OpenWeather id in a single request.
+
+    Parameters
+    ----------
+    city_ids : list[int]
+        OpenWeather city ids (the API accepts at most 20 per call).
+    units : str, optional
+        Measurement units ("metric", "imperial", "standard").
+    lang : str, optional
+        Response language code.
+
+    Returns
+    -------
+    list[dict]
+        One current-weather document per id found, shaped like get_weather's.
+
+    Raises
+    ------
+    APIError
+        If the API request fails or returns a non-200 status code.
+    """
+    logger.debug(f"Fetching current weather for {len(city_ids)} city ids")
+    params = {
+        "id": ",".join(str(city_id) for city_id in city_ids),
+        "appid": OPENWEATHER_API_KEY,
+        "units": units,
+        "lang": lang,
+    }
+    try:
+        response = http_client.get(OPENWEATHER_GROUP_URL, params=params)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        raise APIError(f"Error fetching weather for city ids {params['id']}: {str(e)}")
+
+    return response.json().get("list", [])
@@ -0,0 +1,82 @@
+"""
+Benchmark: city analytics over a multi-year range.
+
+Times the two stages of GET /weather/analytics/{city} separately on an
+in-memory SQLite database holding hourly observations: loading the columns
+into NumPy arrays, and computing every statistic from them. Also times the
+LTTB downsampling behind GET /weather/series/{city}.
+
+Usage (from backend/):
+    python -m benchmarks.bench_analytics --years 3 --repeat 20
+    python -m benchmarks.bench_analytics --max-compute-ms 250   # exit 1 if compute is slower
+"""
+import argparse
+import math
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db import Base
+from app.models import Weather
+from app.services.analytics import compute_analytics, downsample_series, load_series
+
+
+def seed(session, hours: int) -> None:
+    start = datetime(2022, 1, 1)
+    session.execute(insert(Weather), [
+        {"city": "Madrid", "description": "clear sky", "humidity": 60.0 - 10 * math.sin(i * math.pi / 12),
+         "temperature": 15.0 + 8 * math.sin(i * math.pi / 12) + 10 * math.sin(i * math.pi / 4380),
+         "pressure": 1013 + i % 7, "wind_speed": 3.0 + i % 5, "created_at": start + timedelta(hours=i)}
+        for i in range(hours)
+    ])
+    session.commit()
+
+
+def timed(fn, repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--max-compute-ms", type=float, default=None,
+                        help="Fail (exit 1) when the median compute stage exceeds this budget")
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    hours = args.years * 365 * 24
+    seed(session, hours)
+
+    series = load_series(session, "Madrid")
+    stages = (
+        ("load", lambda: load_series(session, "Madrid")),
+        ("compute", lambda: compute_analytics(series)),
+        ("lttb", lambda: downsample_series(series["ts"], series["temperature"], 500)),
+    )
+    medians = {}
+    for name, fn in stages:
+        fn()
+        samples = timed(fn, args.repeat)
+        medians[name] = statistics.median(samples)
+        print(f"{name:>8}: median {medians[name]:7.2f} ms  "
+              f"p95 {sorted(samples)[int(len(samples) * 0.95) - 1]:7.2f} ms  ({hours} rows)")
+
+    if args.max_compute_ms is not None and medians["compute"] > args.max_compute_ms:
+        print(f"compute median {medians['compute']:.2f} ms exceeds budget of {args.max_compute_ms:.2f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
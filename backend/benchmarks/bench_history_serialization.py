@@ -0,0 +1,96 @@
+"""
+Benchmark: history page serialization.
+
+Compares the previous path (ORM objects validated into PaginatedWeatherResponse,
+created_at converted with fresh ZoneInfo objects per row) with the fast path
+(Core rows, batch timezone conversion, orjson rendering) on an in-memory
+SQLite database.
+
+Usage (from backend/):
+    python -m benchmarks.bench_history_serialization --rows 500 --repeat 200
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+from uuid import UUID
+from zoneinfo import ZoneInfo
+from pydantic import BaseModel, field_serializer
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.db import Base
+from app.models import Weather
+from app.schemas import WeatherBase
+from app.services.weather_service import get_weather_history
+from app.utils.serialization import FastJSONResponse, rows_to_records
+
+
+class LegacyWeatherResponse(WeatherBase):
+    """WeatherResponse as it was before the fast path (ZoneInfo built per row)."""
+    id: UUID
+    created_at: datetime
+
+    @field_serializer("created_at")
+    def serialize_created_at(self, dt: datetime, _info):
+        return dt.replace(tzinfo=ZoneInfo("UTC")).astimezone(ZoneInfo("Europe/Madrid"))
+
+
+class LegacyPage(BaseModel):
+    total: Optional[int] = None
+    records: List[LegacyWeatherResponse]
+    next_cursor: Optional[str] = None
+
+
+def seed(session, rows: int) -> None:
+    start = datetime(2025, 1, 1)
+    session.add_all(
+        Weather(city="Madrid", description="clear sky", temperature=20.0 + i % 10, humidity=50.0,
+                pressure=1010, wind_speed=3.0, clouds=10, created_at=start + timedelta(hours=i))
+        for i in range(rows)
+    )
+    session.commit()
+
+
+def legacy_page(session, limit: int) -> bytes:
+    records = (session.query(Weather).filter(Weather.city == "Madrid")
+               .order_by(Weather.created_at.desc(), Weather.id.desc()).limit(limit).all())
+    page = LegacyPage.model_validate({"total": None, "records": records, "next_cursor": None}, from_attributes=True)
+    return page.model_dump_json().encode()
+
+
+def fast_page(session, limit: int) -> bytes:
+    page = get_weather_history(session, city="Madrid", limit=limit, include_total=False)
+    return FastJSONResponse({**page, "records": rows_to_records(page["records"])}).body
+
+
+def timed(fn, repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    seed(session, args.rows)
+
+    for name, fn in (("legacy", legacy_page), ("fast", fast_page)):
+        fn(session, args.rows)
+        samples = timed(lambda: fn(session, args.rows), args.repeat)
+        print(f"{name:>6}: median {statistics.median(samples):7.2f} ms  "
+              f"p95 {sorted(samples)[int(len(samples) * 0.95) - 1]:7.2f} ms  ({args.rows} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Load driver for the weather API.
+
+Fires a fixed number of requests at every route of app/routers/weather.py with
+bounded concurrency, reports p50/p95/p99 latency and throughput per route,
+optionally times the scheduler ingestion job in-process, and saves the results
+as JSON so runs can be compared.
+
+Typical run (from backend/), against a server started with the stub
+(see benchmarks/stub_server.py) and a seeded database (benchmarks/seed.py):
+    python -m benchmarks.load --base-url http://127.0.0.1:8000 --requests 300 --concurrency 32
+    python -m benchmarks.load --compare benchmarks/results/20250115T120000Z.json
+
+Flags:
+    --routes history_city,latest_city   only run these routes
+    --scheduler-runs 5                  also time fetch_and_save_all_cities (uses this process' env)
+    --no-writes                         skip POST routes (they insert rows)
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+import httpx
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+CITY = "Madrid"
+_NOW = datetime.now(timezone.utc).replace(microsecond=0)
+_WEEK_AGO = (_NOW - timedelta(days=7)).isoformat()
+
+# name -> (method, path, query params, JSON body)
+ROUTES: Dict[str, tuple] = {
+    "history": ("GET", "/weather/history", {"limit": 50}, None),
+    "history_city": ("GET", f"/weather/history/{CITY}", {"limit": 500}, None),
+    "export": ("GET", f"/weather/export/{CITY}", {"format": "ndjson", "from": _WEEK_AGO}, None),
+    "archive": ("GET", f"/weather/archive/{CITY}", {"columns": "temperature,humidity"}, None),
+    "save_city": ("POST", f"/weather/save/{CITY}", None, None),
+    "save_batch": ("POST", "/weather/save", None, {"cities": ["Madrid", "London", "Arrecife"]}),
+    "batch": ("POST", "/weather/batch", None, {"cities": ["Madrid", "London", "Arrecife", "Barcelona"]}),
+    "batch_query": ("GET", "/weather/batch", {"cities": "Madrid,London,Arrecife,Barcelona"}, None),
+    "compare": ("GET", "/weather/compare", {"cities": "Madrid,London,Arrecife,Barcelona", "bucket": "day"}, None),
+    "alerts": ("GET", "/weather/alerts", {"limit": 50}, None),
+    "latest": ("GET", "/weather/latest", None, None),
+    "latest_city": ("GET", f"/weather/latest/{CITY}", None, None),
+    "daily_summary": ("GET", f"/weather/daily-summary/{CITY}", None, None),
+    "aggregate": ("GET", f"/weather/aggregate/{CITY}", {"bucket": "day"}, None),
+    "analytics": ("GET", f"/weather/analytics/{CITY}", None, None),
+    "series": ("GET", f"/weather/series/{CITY}", {"points": 500}, None),
+    "predict": ("GET", f"/weather/predict/{CITY}", {"hours": 48}, None),
+    "predict_backtest": ("GET", f"/weather/predict/{CITY}/backtest", None, None),
+    "forecast": ("GET", f"/weather/forecast/{CITY}", None, None),
+    "cache_stats": ("GET", "/weather/cache/stats", None, None),
+    "geocode_stats": ("GET", "/weather/reverse-geocode/stats", None, None),
+    "upstream_budget": ("GET", "/weather/upstream/budget", None, None),
+    "reverse_geocode": ("GET", "/weather/reverse-geocode", {"lat": 40.4168, "lon": -3.7038}, None),
+    "current": ("GET", f"/weather/{CITY}", None, None),
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(latencies_ms: List[float], errors: int, wall_seconds: float) -> dict:
+    """Latency distribution and throughput of one run."""
+    ordered = sorted(latencies_ms)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "p50_ms": _round(percentile(ordered, 50)),
+        "p95_ms": _round(percentile(ordered, 95)),
+        "p99_ms": _round(percentile(ordered, 99)),
+        "max_ms": _round(ordered[-1] if ordered else None),
+        "mean_ms": _round(sum(ordered) / len(ordered) if ordered else None),
+        "throughput_rps": _round(len(ordered) / wall_seconds if wall_seconds else None),
+    }
+
+
+def _round(value):
+    return round(value, 2) if value is not None else None
+
+
+def uncovered_routes() -> List[str]:
+    """Router paths without an entry in ROUTES (so new endpoints are not forgotten)."""
+    from app.routers.weather import router
+
+    covered = {(method, path) for method, path, _, _ in ROUTES.values()}
+    missing = []
+    for route in router.routes:
+        for method in route.methods - {"HEAD", "OPTIONS"}:
+            concrete = "/weather" + route.path.replace("{city}", CITY)
+            if (method, concrete) not in covered:
+                missing.append(f"{method} /weather{route.path}")
+    return missing
+
+
+async def run_route(client: httpx.AsyncClient, name: str, requests: int, concurrency: int, warmup: int) -> dict:
+    method, path, params, body = ROUTES[name]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(record: bool) -> None:
+        nonlocal errors
+        async with semaphore:
+            t0 = time.perf_counter()
+            try:
+                response = await client.request(method, path, params=params, json=body)
+                await response.aread()
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            elapsed = (time.perf_counter() - t0) * 1000
+        if record:
+            latencies.append(elapsed)
+            errors += failed
+
+    await asyncio.gather(*(one(False) for _ in range(warmup)))
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(True) for _ in range(requests)))
+    return summarize(latencies, errors, time.perf_counter() - t0)
+
+
+async def run_routes(base_url: str, names: List[str], requests: int, concurrency: int, warmup: int) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    results = {}
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        for name in names:
+            results[name] = await run_route(client, name, requests, concurrency, warmup)
+            r = results[name]
+            print(f"{name:>16}: p50 {r['p50_ms']:>8} ms  p95 {r['p95_ms']:>8} ms  p99 {r['p99_ms']:>8} ms  "
+                  f"{r['throughput_rps']:>8} req/s  errors {r['errors']}")
+    return results
+
+
+def run_scheduler(runs: int) -> dict:
+    """Time the scheduled ingestion job in-process (OpenWeather URLs/DB come from the environment)."""
+    from app.scheduler import fetch_and_save_all_cities
+
+    durations, failures = [], 0
+    t0 = time.perf_counter()
+    for _ in range(runs):
+        report = fetch_and_save_all_cities()
+        durations.append(report["duration_ms"])
+        failures += len(report["failures"])
+    result = summarize(durations, failures, time.perf_counter() - t0)
+    print(f"{'scheduler':>16}: p50 {result['p50_ms']} ms  p95 {result['p95_ms']} ms  failures {failures}")
+    return result
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(results: dict, out_dir: str = RESULTS_DIR) -> str:
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ") + ".json")
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def compare(current: dict, baseline: dict) -> None:
+    """Print p50/p95/p99 and throughput deltas against a previous run."""
+    sections = [(name, stats, baseline.get("routes", {}).get(name)) for name, stats in current.get("routes", {}).items()]
+    if current.get("scheduler"):
+        sections.append(("scheduler", current["scheduler"], baseline.get("scheduler")))
+    for name, stats, old in sections:
+        if not old:
+            continue
+        deltas = []
+        for key in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+            if stats.get(key) is not None and old.get(key):
+                deltas.append(f"{key} {old[key]} -> {stats[key]} ({(stats[key] - old[key]) / old[key]:+.1%})")
+        print(f"{name:>16}: " + ", ".join(deltas))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per route")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--routes", help="Comma-separated route names (default: all)")
+    parser.add_argument("--no-writes", action="store_true")
+    parser.add_argument("--scheduler-runs", type=int, default=0)
+    parser.add_argument("--out", default=RESULTS_DIR)
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    args = parser.parse_args()
+
+    for route in uncovered_routes():
+        print(f"warning: {route} has no benchmark entry in ROUTES")
+
+    names = args.routes.split(",") if args.routes else list(ROUTES)
+    if args.no_writes:
+        names = [n for n in names if ROUTES[n][0] == "GET"]
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "base_url": args.base_url,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "routes": asyncio.run(run_routes(args.base_url, names, args.requests, args.concurrency, args.warmup)),
+        "scheduler": run_scheduler(args.scheduler_runs) if args.scheduler_runs else None,
+    }
+    print(f"Results saved to {save_results(results, args.out)}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Local OpenWeather stub for benchmarks.
+
+Serves deterministic payloads for the endpoints the backend calls, with
+configurable latency, jitter and error rate, so benchmark runs do not depend
+on (or spend quota of) the real API.
+
+Endpoints:
+- /data/2.5/weather?q=<city>        current weather
+- /data/2.5/group?id=<id>,<id>...    current weather of cities previously fetched by name
+- /data/2.5/forecast?q=<city>       5-day / 3-hour forecast (40 items)
+- /geo/1.0/reverse?lat=..&lon=..    reverse geocoding
+
+Usage (from backend/):
+    python -m benchmarks.stub_server --port 8090 --latency-ms 80 --jitter-ms 20 --error-rate 0.01
+
+Then start the API against it:
+    OPENWEATHER_API_KEY=stub \
+    OPENWEATHER_BASE_URL=http://127.0.0.1:8090/data/2.5/weather \
+    OPENWEATHER_FORECAST_URL=http://127.0.0.1:8090/data/2.5/forecast \
+    OPENWEATHER_GROUP_URL=http://127.0.0.1:8090/data/2.5/group \
+    OPENWEATHER_REVERSE_URL=http://127.0.0.1:8090/geo/1.0/reverse \
+    uvicorn app.main:app
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def _seed(city: str) -> int:
+    return zlib.crc32(city.strip().lower().encode())
+
+
+def weather_payload(city: str, now: datetime = None) -> dict:
+    """Current-weather document shaped like OpenWeather's /data/2.5/weather."""
+    now = now or datetime.now(timezone.utc)
+    rng = random.Random(_seed(city) + int(now.timestamp()) // 600)
+    temp = round(rng.uniform(-5, 35), 2)
+    return {
+        "coord": {"lon": round(rng.uniform(-180, 180), 4), "lat": round(rng.uniform(-60, 70), 4)},
+        "weather": [{"id": 800, "main": "Clear", "description": "clear sky", "icon": "01d"}],
+        "main": {
+            "temp": temp,
+            "feels_like": round(temp - rng.uniform(0, 3), 2),
+            "temp_min": round(temp - rng.uniform(0, 2), 2),
+            "temp_max": round(temp + rng.uniform(0, 2), 2),
+            "pressure": rng.randint(990, 1030),
+            "humidity": rng.randint(20, 95),
+            "sea_level": rng.randint(990, 1030),
+            "grnd_level": rng.randint(950, 1020),
+        },
+        "visibility": 10000,
+        "wind": {"speed": round(rng.uniform(0, 12), 2), "deg": rng.randint(0, 359), "gust": round(rng.uniform(0, 18), 2)},
+        "clouds": {"all": rng.randint(0, 100)},
+        "dt": int(now.timestamp()),
+        "sys": {"country": "ES", "sunrise": int(now.timestamp()) - 21600, "sunset": int(now.timestamp()) + 21600},
+        "id": _seed(city) % 10_000_000,
+        "name": city,
+        "cod": 200,
+    }
+
+
+def forecast_payload(city: str, now: datetime = None) -> dict:
+    """Forecast document shaped like OpenWeather's /data/2.5/forecast."""
+    now = (now or datetime.now(timezone.utc)).replace(minute=0, second=0, microsecond=0)
+    items = []
+    for i in range(40):
+        ts = now + timedelta(hours=3 * i)
+        current = weather_payload(city, ts)
+        items.append({
+            "dt": int(ts.timestamp()),
+            "main": current["main"],
+            "weather": current["weather"],
+            "clouds": current["clouds"],
+            "wind": current["wind"],
+            "dt_txt": ts.strftime("%Y-%m-%d %H:%M:%S"),
+        })
+    return {"cod": "200", "cnt": len(items), "list": items, "city": {"name": city}}
+
+
+def reverse_payload(lat: float, lon: float) -> list:
+    """Reverse-geocoding result shaped like OpenWeather's /geo/1.0/reverse."""
+    return [{"name": f"City {round(lat, 1)},{round(lon, 1)}", "lat": lat, "lon": lon, "country": "ES"}]
+
+
+class StubConfig:
+    """Latency/error settings shared by every handler thread."""
+
+    def __init__(self, latency_ms: float = 50, jitter_ms: float = 0, error_rate: float = 0.0, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        # OpenWeather id -> city name, learned from by-name requests (ids are derived from the name).
+        self.cities = {}
+
+    def next_delay_and_error(self):
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+            return delay, failed
+
+
+def make_handler(config: StubConfig):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            delay, failed = config.next_delay_and_error()
+            time.sleep(delay)
+
+            if failed:
+                return self._send(503, {"cod": 503, "message": "stub: injected error"})
+            if url.path.endswith("/data/2.5/weather"):
+                payload = weather_payload(query.get("q", "Madrid"))
+                config.cities[payload["id"]] = payload["name"]
+                return self._send(200, payload)
+            if url.path.endswith("/data/2.5/group"):
+                ids = [int(i) for i in query.get("id", "").split(",") if i]
+                items = [weather_payload(config.cities[i]) for i in ids if i in config.cities]
+                return self._send(200, {"cnt": len(items), "list": items})
+            if url.path.endswith("/data/2.5/forecast"):
+                return self._send(200, forecast_payload(query.get("q", "Madrid")))
+            if url.path.endswith("/geo/1.0/reverse"):
+                return self._send(200, reverse_payload(float(query.get("lat", 0)), float(query.get("lon", 0))))
+            if url.path == "/stats":
+                return self._send(200, {"requests": config.requests, "errors": config.errors})
+            return self._send(404, {"cod": "404", "message": "stub: unknown endpoint"})
+
+        def _send(self, status: int, body) -> None:
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, **config) -> ThreadingHTTPServer:
+    """
+    Start the stub in a background thread.
+
+    Args:
+        host (str): Interface to bind.
+        port (int): Port to bind (0 picks a free port; see ``server.server_address``).
+        **config: StubConfig options (latency_ms, jitter_ms, error_rate, seed).
+
+    Returns:
+        ThreadingHTTPServer: Running server; call ``shutdown()`` to stop it.
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(StubConfig(**config)))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(
+        (args.host, args.port),
+        make_handler(StubConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.seed)),
+    )
+    server.daemon_threads = True
+    print(f"OpenWeather stub listening on http://{args.host}:{args.port} "
+          f"(latency {args.latency_ms}±{args.jitter_ms} ms, error rate {args.error_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,14 @@
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from app.models import Base
 
 TEST_DATABASE_URL = "sqlite:///:memory:"
 
 @pytest.fixture(scope="function")
 def db_session():
-    engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+    engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool)
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
     Base.metadata.create_all(bind=engine)
@@ -17,4 +18,27 @@ def db_session():
         yield session
     finally:
         session.close()
-        Base.metadata.drop_all(bind=engine)  
\ No newline at end of file
+        Base.metadata.drop_all(bind=engine)  
+
+@pytest.fixture(scope="function")
+def api_client(db_session):
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.db import get_db
+    from app.services.weather_service import weather_cache
+    from app.services.latest_store import latest_store
+    from app.services.prediction import model_store
+    from app.services.geocode_service import geocode_cache, geocode_misses
+
+    def override_get_db():
+        yield db_session
+
+    weather_cache.invalidate()
+    geocode_cache.invalidate()
+    geocode_misses.invalidate()
+    latest_store.clear()
+    model_store.clear()
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as c:
+        yield c
+    app.dependency_overrides.clear()
@@ -0,0 +1,102 @@
+# tests/test_analytics.py
+from datetime import timedelta, timezone
+import numpy as np
+import pytest
+from app.services.analytics import compute_analytics, load_series
+from app.utils.downsampling import lttb
+from tests.test_weather_service import add_records, BASE_TIME
+
+def synthetic_series(days: int):
+    ts = BASE_TIME.replace(tzinfo=timezone.utc).timestamp() + np.arange(days * 24) * 3600.0
+    hours = np.arange(days * 24)
+    temperature = 15 + 5 * np.sin(2 * np.pi * (hours % 24) / 24) + 0.1 * hours / 24
+    return {
+        "ts": ts,
+        "temperature": temperature,
+        "humidity": 80 - temperature,
+        "pressure": np.full(ts.size, 1013.0),
+        "wind_speed": np.where(hours % 2 == 0, np.nan, 3.0),
+    }
+
+def test_compute_analytics_statistics():
+    series = synthetic_series(10)
+    result = compute_analytics(series, window=3)
+    temperature = result["metrics"]["temperature"]
+    days = (series["ts"] - series["ts"][0]) / 86400
+
+    assert result["count"] == 240
+    assert temperature["trend_per_day"] == pytest.approx(np.polyfit(days, series["temperature"], 1)[0], abs=1e-5)
+    assert temperature["percentiles"]["p50"] == pytest.approx(np.percentile(series["temperature"], 50), abs=1e-3)
+    assert result["correlations"]["temperature_humidity"] == pytest.approx(-1.0)
+    assert result["correlations"]["temperature_pressure"] is None
+    assert result["metrics"]["wind_speed"]["count"] == 120
+
+    assert len(result["daily"]) == 11  # BASE_TIME is midday, so 240 hours touch 11 UTC days
+    assert result["daily"][1]["range"] == pytest.approx(10.0, abs=0.2)
+    assert result["diurnal"]["max_range"] == max(day["range"] for day in result["daily"])
+    hourly = result["diurnal"]["hourly_mean_temperature"]
+    assert hourly.index(max(hourly)) == (6 - BASE_TIME.hour) % 24
+
+    means = [day["mean_temperature"] for day in result["daily"]]
+    assert result["daily"][0]["moving_average"] == means[0]
+    assert result["daily"][5]["moving_average"] == pytest.approx(sum(means[3:6]) / 3, abs=1e-3)
+
+def test_compute_analytics_multi_year():
+    # Timing lives in benchmarks/bench_analytics.py (--max-compute-ms); this only checks the result.
+    series = synthetic_series(3 * 365)
+    result = compute_analytics(series)
+    assert len(result["daily"]) == 3 * 365 + 1
+    assert result["metrics"]["temperature"]["count"] == series["ts"].size
+
+def test_load_series_range(db_session):
+    add_records(db_session, count=6)
+    series = load_series(db_session, "Madrid", start=BASE_TIME + timedelta(hours=2), end=BASE_TIME + timedelta(hours=5))
+    assert series["temperature"].tolist() == [22.0, 23.0, 24.0]
+    assert series["ts"][0] == (BASE_TIME + timedelta(hours=2)).replace(tzinfo=timezone.utc).timestamp()
+
+def test_analytics_endpoint(api_client, db_session):
+    add_records(db_session, count=48)
+    response = api_client.get("/weather/analytics/Madrid", params={"window": 2})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 48
+    assert body["metrics"]["temperature"]["trend_per_day"] == pytest.approx(24.0)
+    assert body["window_days"] == 2
+
+    cached = api_client.get("/weather/analytics/Madrid", params={"window": 2},
+                            headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+    assert api_client.get("/weather/analytics/Nowhere").json()["count"] == 0
+
+def test_lttb_keeps_endpoints_and_extremes():
+    x = np.arange(10_000, dtype=float)
+    y = np.sin(x / 500)
+    y[4321] = 50.0  # a single spike that striding would likely miss
+
+    keep = lttb(x, y, 200)
+    assert keep.size == 200
+    assert keep[0] == 0 and keep[-1] == x.size - 1
+    assert np.all(np.diff(keep) > 0)
+    assert 4321 in keep
+    assert y[keep].min() == pytest.approx(-1, abs=1e-3)
+    assert lttb(x[:50], y[:50], 200).tolist() == list(range(50))
+
+def test_series_endpoint(api_client, db_session):
+    add_records(db_session, count=1000, step=timedelta(minutes=10))
+    response = api_client.get("/weather/series/Madrid", params={"points": 100})
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["count"], body["points"], len(body["series"])) == (1000, 100, 100)
+    assert body["series"][0] == ["2025-01-15T12:00:00.000Z", 20.0]
+    assert body["series"][-1][1] == 1019.0
+
+    pressure = api_client.get("/weather/series/Madrid", params={
+        "metric": "pressure", "from": (BASE_TIME + timedelta(minutes=10)).isoformat(), "points": 5000,
+    }).json()
+    assert pressure["points"] == 999 and pressure["series"][0][1] == 1011.0
+
+    cached = api_client.get("/weather/series/Madrid", params={"points": 100},
+                            headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+    assert api_client.get("/weather/series/Madrid", params={"metric": "clouds"}).status_code == 422
+    assert api_client.get("/weather/series/Madrid", params={"points": 2}).status_code == 422
@@ -0,0 +1,61 @@
+# tests/test_anomalies.py
+from datetime import datetime, timedelta, timezone
+from app.crud import save_weather_batch
+from app.models import Alert, DetectorState
+from app.services.anomalies import detect_anomalies, get_alerts
+from tests.test_rollups import observation
+
+BASE = datetime(2025, 3, 13, 0, tzinfo=timezone.utc)
+
+def feed(db, rows):
+    alerts = detect_anomalies(db, rows)
+    db.commit()
+    return alerts
+
+def test_zscore_alert_after_warmup_and_state_persists(db_session):
+    for i in range(60):
+        assert feed(db_session, [observation(BASE + timedelta(hours=i), 20.0 + (i % 3) * 0.5,
+                                             pressure=None)]) == []
+
+    # A fresh session identity map, as after a restart: state comes from detector_state.
+    db_session.expunge_all()
+    state = db_session.get(DetectorState, ("Madrid", "zscore:temperature"))
+    assert state.count == 60
+    assert 20.0 < state.mean < 21.0
+
+    alerts = feed(db_session, [observation(BASE + timedelta(hours=60), 35.0, pressure=None)])
+    assert [(a["kind"], a["metric"]) for a in alerts] == [("zscore", "temperature")]
+    assert alerts[0]["score"] > 4
+    assert db_session.get(DetectorState, ("Madrid", "zscore:temperature")).count == 61
+
+def test_pressure_tendency_alerts_on_rapid_fall_only(db_session):
+    readings = [(0, 1010), (1.5, 1008), (3, 1002), (3.5, 1001), (26, 985)]
+    alerts = []
+    for hours, pressure in readings:
+        alerts += feed(db_session, [observation(BASE + timedelta(hours=hours), 20.0, pressure=pressure)])
+
+    tendency = [a for a in alerts if a["kind"] == "pressure_tendency"]
+    # 1010 -> 1002 in 3 h alerts; 1002 -> 985 spans a 23 h gap and is ignored.
+    assert len(tendency) == 1
+    assert tendency[0]["score"] == -8.0
+    assert "falling" in tendency[0]["message"]
+
+def test_batch_rows_are_processed_in_time_order(db_session):
+    rows = [observation(BASE + timedelta(hours=3), 20.0, pressure=1000),
+            observation(BASE, 20.0, pressure=1010)]
+    alerts = feed(db_session, rows)
+    assert [a["kind"] for a in alerts] == ["pressure_tendency"]
+
+def test_out_of_range_alert_from_save_path_and_endpoint(api_client, db_session):
+    hot = {"name": "Sevilla", "main": {"temp": 70.0, "humidity": 20}, "weather": [{"description": "clear"}]}
+    mild = {"name": "Madrid", "main": {"temp": 12.0, "humidity": 40}, "weather": [{"description": "clear"}]}
+    save_weather_batch({"Sevilla": hot, "Madrid": mild}, db=db_session)
+
+    assert db_session.query(Alert).count() == 1
+    assert get_alerts(db_session, city="Madrid") == []
+
+    body = api_client.get("/weather/alerts", params={"kind": "out_of_range"}).json()
+    assert body["count"] == 1
+    assert body["alerts"][0]["city"] == "Sevilla"
+    assert body["alerts"][0]["metric"] == "temperature"
+    assert api_client.get("/weather/alerts", params={"kind": "bogus"}).status_code == 422
@@ -0,0 +1,77 @@
+# tests/test_archive.py
+import io
+import os
+from datetime import datetime, timedelta
+import pyarrow as pa
+import pytest
+from app.models import Weather
+from app.services.archive import archive_path
+from tests.test_weather_service import add_records
+
+@pytest.fixture
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("app.services.archive.ARCHIVE_DIR", str(tmp_path))
+    return tmp_path
+
+def test_archive_closed_periods_writes_one_file_per_city_month(db_session, archive_dir):
+    from app.services.archive import archive_closed_periods, read_archive
+
+    add_records(db_session, count=3, start=datetime(2025, 1, 30), step=timedelta(days=1))
+    add_records(db_session, city="Valencia", count=2, start=datetime(2025, 1, 10))
+    archived = archive_closed_periods(db_session, before=datetime(2025, 3, 1).date(), purge=True)
+
+    assert sorted((a["city"], a["rows"]) for a in archived) == [("Madrid", 1), ("Madrid", 2), ("Valencia", 2)]
+    assert os.path.exists(archive_path("Madrid", 2025, 1))
+    assert os.path.dirname(archive_path("Madrid", 2025, 1)).startswith(str(archive_dir / "city=madrid-"))
+    assert db_session.query(Weather).count() == 0
+
+    table = read_archive("Madrid", start=datetime(2025, 1, 31), columns=["temperature"])
+    assert table.column_names == ["created_at", "temperature"]
+    assert table.column("temperature").to_pylist() == [21.0, 22.0]
+
+def test_archive_endpoint_returns_arrow_stream(api_client, db_session, archive_dir):
+    from app.services.archive import archive_month
+
+    add_records(db_session, count=4, start=datetime(2025, 1, 5))
+    archive_month(db_session, "Madrid", 2025, 1)
+    response = api_client.get("/weather/archive/Madrid", params={"columns": "temperature,humidity"})
+
+    assert response.status_code == 200
+    table = pa.ipc.open_stream(io.BytesIO(response.content)).read_all()
+    assert table.num_rows == 4
+    assert table.column_names == ["created_at", "temperature", "humidity"]
+
+def test_months_archived_without_purge_are_purged_later(db_session, archive_dir):
+    from app.services.archive import archive_closed_periods, archive_month, read_archive
+
+    add_records(db_session, count=3, start=datetime(2025, 1, 5))
+    before = datetime(2025, 2, 1).date()
+    assert [a["rows"] for a in archive_closed_periods(db_session, before=before, purge=False)] == [3]
+    # Unchanged months are not rewritten while purge is off.
+    assert archive_closed_periods(db_session, before=before, purge=False) == []
+
+    assert [a["rows"] for a in archive_closed_periods(db_session, before=before, purge=True)] == [3]
+    assert db_session.query(Weather).count() == 0
+
+    # A late observation is merged with the rows purged earlier.
+    add_records(db_session, count=1, start=datetime(2025, 1, 20), temperature=5.0)
+    archive_month(db_session, "Madrid", 2025, 1, purge=True)
+    assert read_archive("Madrid").column("temperature").to_pylist() == [20.0, 21.0, 22.0, 5.0]
+
+def test_cities_with_the_same_slug_do_not_share_files(archive_dir):
+    assert archive_path("New York", 2025, 1) != archive_path("new-york", 2025, 1)
+
+def test_purge_invalidates_history_etag(api_client, db_session, archive_dir):
+    from app.services.archive import archive_closed_periods
+
+    add_records(db_session, count=2, start=datetime(2025, 1, 20))
+    add_records(db_session, count=2, start=datetime(2025, 2, 20))
+    first = api_client.get("/weather/history/Madrid")
+    assert first.json()["total"] == 4
+
+    # The purge removes January only: the newest row, and so Last-Modified, is unchanged.
+    archive_closed_periods(db_session, before=datetime(2025, 2, 1).date(), purge=True)
+    again = api_client.get("/weather/history/Madrid", headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 200
+    assert again.json()["total"] == 2
+    assert again.headers["last-modified"] == first.headers["last-modified"]
@@ -0,0 +1,19 @@
+# tests/test_benchmarks.py
+from app.utils.validation import validate_weather_data
+from app.services.weather_service import _parse_forecast
+from benchmarks.load import percentile, summarize, uncovered_routes
+from benchmarks.stub_server import weather_payload, forecast_payload
+
+def test_stub_payloads_pass_backend_parsing():
+    row = validate_weather_data(weather_payload("Madrid"), "Madrid")
+    assert row["city"] == "Madrid"
+    assert len(_parse_forecast(forecast_payload("Madrid"))) == 40
+
+def test_load_summary_percentiles():
+    stats = summarize([float(i) for i in range(1, 101)], errors=2, wall_seconds=2.0)
+    assert (stats["p50_ms"], stats["p95_ms"], stats["p99_ms"]) == (50.0, 95.0, 99.0)
+    assert stats["throughput_rps"] == 50.0
+    assert percentile([], 50) is None
+
+def test_every_route_has_a_benchmark():
+    assert uncovered_routes() == []
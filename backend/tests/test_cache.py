@@ -0,0 +1,104 @@
+# tests/test_cache.py
+import threading
+import time
+import pytest
+from app.utils.cache import TTLCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=600, clock=clock)
+    cache.set("madrid", {"temp": 20})
+    assert cache.get("madrid") == {"temp": 20}
+
+    clock.now = 601
+    assert cache.get("madrid") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["expirations"] == 1
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=600)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+def test_ttl_cache_coalesces_concurrent_misses():
+    cache = TTLCache(maxsize=10, ttl=600)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return "sunny"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("madrid", loader))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == ["sunny"] * 8
+    assert cache.stats()["coalesced"] == 7
+
+def test_ttl_cache_does_not_cache_errors():
+    cache = TTLCache(maxsize=10, ttl=600)
+
+    def failing():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("madrid", failing)
+    assert cache.get_or_load("madrid", lambda: "ok") == "ok"
+
+def test_ttl_cache_coalesces_concurrent_async_misses():
+    import asyncio
+    cache = TTLCache(maxsize=10, ttl=600)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "cloudy"
+
+    async def main():
+        return await asyncio.gather(*(cache.aget_or_load("madrid", loader) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["cloudy"] * 5
+    assert len(calls) == 1
+
+def test_async_cancelled_leader_does_not_fail_followers():
+    import asyncio
+    cache = TTLCache(maxsize=10, ttl=600)
+
+    async def loader():
+        await asyncio.sleep(0.05)
+        return "cloudy"
+
+    async def main():
+        leader = asyncio.create_task(cache.aget_or_load("madrid", loader))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(cache.aget_or_load("madrid", loader))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return leader, await follower
+
+    leader, value = asyncio.run(main())
+    assert leader.cancelled()
+    assert value == "cloudy"
+    assert cache.get("madrid") == "cloudy"
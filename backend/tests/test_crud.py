@@ -4,7 +4,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.db import Base
 from app.models import Weather
-from app.crud import save_weather, validate_weather_data
+from app.crud import save_weather, save_weather_batch, validate_weather_data
 from app.exceptions import ValidationError, APIError, DatabaseError
 from unittest.mock import patch
 from app.weather_client import get_weather
@@ -80,4 +80,61 @@ def test_save_weather_database_error(mock_get, db_session, monkeypatch):
         save_weather("Valencia", db=db_session)
 
     count = db_session.query(Weather).count()
-    assert count == 0
\ No newline at end of file
+    assert count == 0
+
+def test_save_weather_batch_partial_success(db_session):
+    payloads = {
+        "Valencia": fake_weather_api_success("Valencia"),
+        "Madrid": fake_weather_api_success("Madrid"),
+        "Atlantis": fake_weather_api_incomplete("Atlantis"),
+    }
+    result = save_weather_batch(payloads, db=db_session)
+
+    assert sorted(result["saved"]) == ["Madrid", "Valencia"]
+    assert list(result["failures"]) == ["Atlantis"]
+    assert db_session.query(Weather).count() == 2
+
+def test_save_weather_batch_bad_row_does_not_roll_back_others(db_session):
+    broken = fake_weather_api_success("Lisbon")
+    broken["weather"] = [{"description": None}]
+    payloads = {
+        "Valencia": fake_weather_api_success("Valencia"),
+        "Lisbon": broken,
+        "Madrid": fake_weather_api_success("Madrid"),
+    }
+    result = save_weather_batch(payloads, db=db_session)
+
+    assert sorted(result["saved"]) == ["Madrid", "Valencia"]
+    assert "Lisbon" in result["failures"]
+    assert db_session.query(Weather).count() == 2
+
+def test_save_weather_batch_malformed_payload_is_a_row_failure(db_session):
+    malformed = fake_weather_api_success("Lisbon")
+    malformed["main"] = "oops"
+    result = save_weather_batch({"Lisbon": malformed, "Madrid": fake_weather_api_success("Madrid")}, db=db_session)
+
+    assert result["saved"] == ["Madrid"]
+    assert "Invalid weather data for Lisbon" in result["failures"]["Lisbon"]
+    assert db_session.query(Weather).count() == 1
+
+@patch("app.crud.get_weather", side_effect=fake_weather_api_success)
+def test_save_weather_updates_latest_store_after_commit(mock_get, db_session, monkeypatch):
+    from app.services.latest_store import latest_store
+
+    latest_store.clear()
+    save_weather("Valencia", db=db_session)
+    saved = db_session.query(Weather).filter_by(city="Valencia").one()
+    assert latest_store.get("Valencia")["id"] == saved.id
+
+    monkeypatch.setattr(db_session, "commit", lambda: (_ for _ in ()).throw(Exception("Commit failed!")))
+    with pytest.raises(DatabaseError):
+        save_weather("Valencia", db=db_session)
+    assert latest_store.get("Valencia")["id"] == saved.id
+
+def test_save_weather_batch_updates_latest_store(db_session):
+    from app.services.latest_store import latest_store
+
+    latest_store.clear()
+    save_weather_batch({"Valencia": fake_weather_api_success("Valencia"),
+                        "Atlantis": fake_weather_api_incomplete("Atlantis")}, db=db_session)
+    assert set(latest_store.snapshot()) == {"Valencia"}
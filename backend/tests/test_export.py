@@ -0,0 +1,28 @@
+# tests/test_export.py
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from app.services.export_service import stream_export
+from tests.test_weather_service import add_records, BASE_TIME
+
+def test_stream_export_ndjson_chunks(db_session):
+    add_records(db_session, count=5)
+    chunks = list(stream_export(db_session, "Madrid", fmt="ndjson", batch_size=2))
+
+    assert len(chunks) == 3
+    rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert [r["temperature"] for r in rows] == [20.0, 21.0, 22.0, 23.0, 24.0]
+
+def test_export_endpoint_csv_with_range(api_client, db_session):
+    add_records(db_session, count=6)
+    response = api_client.get("/weather/export/Madrid", params={
+        "format": "csv",
+        "from": (BASE_TIME + timedelta(hours=1)).isoformat(),
+        "to": (BASE_TIME + timedelta(hours=4)).isoformat(),
+    })
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [float(r["temperature"]) for r in rows] == [21.0, 22.0, 23.0]
@@ -0,0 +1,9 @@
+# tests/test_geo.py
+from app.utils.geo import geohash_encode
+
+def test_geohash_known_value():
+    assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+def test_geohash_groups_nearby_points():
+    assert geohash_encode(28.9630, -13.5477, 6) == geohash_encode(28.9632, -13.5479, 6)
+    assert geohash_encode(28.9630, -13.5477, 6) != geohash_encode(40.4168, -3.7038, 6)
@@ -0,0 +1,62 @@
+# tests/test_http_client.py
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from app.http_client import HTTPClient
+from app.utils.rate_limit import RateLimiter
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    failures_left = 0
+
+    def do_GET(self):
+        if _Handler.failures_left > 0:
+            _Handler.failures_left -= 1
+            status, body = 503, b"{}"
+        else:
+            status, body = 200, b'{"ok": true}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/data"
+    server.shutdown()
+    server.server_close()
+
+def test_http_client_reuses_connections(server_url):
+    client = HTTPClient(pool_size=2, timeout=2, max_retries=0, backoff_factor=0)
+    for _ in range(3):
+        assert client.get(server_url).json() == {"ok": True}
+
+    stats = client.stats()
+    assert stats["requests"] == 3
+    assert stats["new_connections"] == 1
+    assert stats["reused_connections"] == 2
+    client.close()
+
+def test_http_client_retries_with_backoff(server_url):
+    _Handler.failures_left = 2
+    client = HTTPClient(pool_size=2, timeout=2, max_retries=3, backoff_factor=0)
+    res = client.get(server_url)
+
+    assert res.status_code == 200
+    assert client.stats()["retries"] == 2
+    client.close()
+
+def test_http_client_takes_a_rate_limit_token_per_attempt(server_url):
+    _Handler.failures_left = 2
+    limiter = RateLimiter(rate_per_minute=6000, burst=10, reserved=0, daily_quota=0)
+    client = HTTPClient(pool_size=2, timeout=2, max_retries=3, backoff_factor=0, limiter=limiter)
+    assert client.get(server_url).status_code == 200
+    assert sum(limiter.stats()["granted"].values()) == 3
+    client.close()
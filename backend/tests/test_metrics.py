@@ -0,0 +1,60 @@
+# tests/test_metrics.py
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+from prometheus_client import REGISTRY
+from app.metrics import instrument_engine, observe_upstream, timed_job
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+def test_metrics_endpoint_reports_route_templates(api_client):
+    before = sample("weather_http_request_duration_seconds_count",
+                    method="GET", route="/weather/history/{city}", status="200")
+    assert api_client.get("/weather/history/Madrid").status_code == 200
+
+    response = api_client.get("/metrics")
+    assert response.status_code == 200
+    assert "text/plain" in response.headers["content-type"]
+    assert 'route="/weather/history/{city}"' in response.text
+    assert sample("weather_http_request_duration_seconds_count",
+                  method="GET", route="/weather/history/{city}", status="200") == before + 1
+
+def test_upstream_calls_are_labelled_by_endpoint():
+    before = sample("weather_upstream_requests_total", endpoint="forecast", status="503")
+    observe_upstream("https://api.openweathermap.org/data/2.5/forecast", 503, 0.2)
+    assert sample("weather_upstream_requests_total", endpoint="forecast", status="503") == before + 1
+
+def test_engine_instrumentation_times_queries_and_checkouts(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'metrics.db'}", poolclass=QueuePool)
+    instrument_engine(engine, name="test")
+    queries = sample("weather_db_query_duration_seconds_count", operation="SELECT")
+    connects = sample("weather_db_connect_duration_seconds_count", engine="test")
+    checkouts = sample("weather_db_pool_checkout_duration_seconds_count", engine="test")
+    app_checkouts = sample("weather_db_pool_checkout_duration_seconds_count", engine="app")
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    # Pool events survive dispose(): the new pool keeps the listeners.
+    engine.dispose()
+    with engine.begin() as conn:
+        conn.execute(text("SELECT 2"))
+        assert sample("weather_db_pool_checked_out", engine="test") == 1
+    assert sample("weather_db_pool_checked_out", engine="test") == 0
+
+    assert sample("weather_db_query_duration_seconds_count", operation="SELECT") == queries + 3
+    assert sample("weather_db_connect_duration_seconds_count", engine="test") == connects + 2
+    assert sample("weather_db_pool_checkout_duration_seconds_count", engine="test") == checkouts + 3
+    assert sample("weather_db_pool_checkout_duration_seconds_count", engine="app") == app_checkouts
+
+def test_timed_job_records_failures():
+    def broken():
+        raise RuntimeError("boom")
+
+    before = sample("weather_scheduler_job_failures_total", job="test_job")
+    with pytest.raises(RuntimeError):
+        timed_job("test_job", broken)()
+    assert sample("weather_scheduler_job_failures_total", job="test_job") == before + 1
+    assert sample("weather_scheduler_job_duration_seconds_count", job="test_job") == 1
@@ -0,0 +1,35 @@
+# tests/test_partitions.py
+from datetime import date
+from app.partitions import (
+    partition_name, month_ranges, partition_ddl, ensure_partitions, detach_partition, migrate_to_partitioned,
+)
+
+def test_month_ranges_cross_year_boundary():
+    ranges = month_ranges(date(2025, 11, 20), months_ahead=2)
+    assert ranges == [
+        (date(2025, 11, 1), date(2025, 12, 1)),
+        (date(2025, 12, 1), date(2026, 1, 1)),
+        (date(2026, 1, 1), date(2026, 2, 1)),
+    ]
+
+def test_partition_ddl():
+    assert partition_name(2025, 3) == "weather_data_y2025m03"
+    create, move, attach = partition_ddl(date(2025, 3, 1), date(2025, 4, 1))
+    assert create.startswith("CREATE TABLE weather_data_y2025m03 (LIKE weather_data")
+    # Rows that fell into the default partition are moved before attaching the month.
+    # Bounds carry an explicit UTC offset so the session TimeZone cannot shift them.
+    assert move == (
+        "WITH moved AS (DELETE FROM weather_data_default "
+        "WHERE created_at >= '2025-03-01 00:00:00+00' AND created_at < '2025-04-01 00:00:00+00' RETURNING *) "
+        "INSERT INTO weather_data_y2025m03 SELECT * FROM moved"
+    )
+    assert attach == (
+        "ALTER TABLE weather_data ATTACH PARTITION weather_data_y2025m03 "
+        "FOR VALUES FROM ('2025-03-01 00:00:00+00') TO ('2025-04-01 00:00:00+00')"
+    )
+
+def test_partitioning_is_noop_on_sqlite(db_session):
+    engine = db_session.get_bind()
+    assert ensure_partitions(engine) == []
+    assert detach_partition(2025, 1, engine) is False
+    assert migrate_to_partitioned(engine) == 0
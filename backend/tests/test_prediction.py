@@ -0,0 +1,114 @@
+# tests/test_prediction.py
+import math
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pytest
+from sqlalchemy import insert
+from app.crud import save_weather_batch
+from app.models import Weather
+from app.services.prediction import HarmonicModel, backtest_city, model_store, predict_city
+
+START = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+@pytest.fixture(autouse=True)
+def fresh_models():
+    model_store.clear()
+    yield
+    model_store.clear()
+
+def diurnal(hour_of_day):
+    """Temperature peaking at 15:00 UTC, humidity peaking at 03:00 UTC."""
+    phase = 2 * math.pi * (hour_of_day - 15) / 24
+    return 15.0 + 6 * math.cos(phase), 60.0 - 15 * math.cos(phase)
+
+def seed(db, city="Madrid", days=10, step_minutes=60):
+    rows = []
+    for i in range(days * 24 * 60 // step_minutes):
+        ts = START + timedelta(minutes=step_minutes * i)
+        temperature, humidity = diurnal(ts.hour + ts.minute / 60)
+        rows.append({"city": city, "description": "clear sky", "temperature": temperature,
+                     "humidity": humidity, "created_at": ts.replace(tzinfo=None)})
+    db.execute(insert(Weather), rows)
+    db.commit()
+    return START + timedelta(minutes=step_minutes * (len(rows) - 1))
+
+def arrays(hours, start=START):
+    ts = start.timestamp() + np.arange(hours) * 3600.0
+    y = np.array([diurnal((t % 86400) / 3600) for t in ts])
+    return ts, y
+
+def test_fit_recovers_diurnal_cycle():
+    model = HarmonicModel()
+    model.fit(*arrays(24 * 7))
+    ts, expected = arrays(24, start=START + timedelta(days=7))
+    assert np.allclose(model.predict(ts), expected, atol=0.01)
+    assert model.rmse()["temperature"] < 0.01
+    assert np.allclose(model.predict_one(ts[5]), expected[5], atol=0.01)
+
+def test_incremental_updates_match_batch_fit():
+    ts, y = arrays(24 * 3)
+    batch, incremental = HarmonicModel(), HarmonicModel()
+    batch.fit(ts, y)
+    for t, values in zip(ts, y):
+        assert incremental.update(t, values)
+
+    assert not incremental.update(ts[0], y[0])
+    assert incremental.samples == batch.samples == ts.size
+    assert np.allclose(incremental.xtx, batch.xtx) and np.allclose(incremental.xty, batch.xty)
+    assert incremental.version == ts.size
+
+def test_predict_city_peaks_at_the_right_hour_and_follows_the_save_path(db_session):
+    last = seed(db_session, days=3)
+    result = predict_city("Madrid", db_session, hours=24, now=last)
+
+    assert result["samples"] == 72
+    assert result["predictions"][0]["time"] == (last + timedelta(hours=1)).isoformat()
+    peak = max(result["predictions"], key=lambda p: p["temperature"])
+    assert datetime.fromisoformat(peak["time"]).hour == 15
+    assert abs(peak["temperature"] - 21.0) < 0.05
+
+    # Saved observations are folded into the model in memory, without retraining.
+    version = result["model_version"]
+    payload = {"name": "Madrid", "main": {"temp": 12.0, "humidity": 40}, "weather": [{"description": "clear"}]}
+    save_weather_batch({"Madrid": payload}, db=db_session)
+    model = model_store.get("Madrid", db_session)
+    assert model.version == version + 1 and model.samples == 73
+
+def test_backtest_beats_persistence_on_diurnal_data(db_session):
+    seed(db_session, days=10)
+    result = backtest_city("Madrid", db_session, horizon_hours=12)
+
+    assert result["evaluated"] == 7 * 24 + 1
+    for name in ("temperature", "humidity"):
+        assert result["model"][name]["mae"] < 0.1
+        assert result["model"][name]["mae"] < result["persistence"][name]["mae"] / 10
+
+def test_predict_endpoint(api_client, db_session):
+    seed(db_session, city="Madrid", days=2)
+    body = api_client.get("/weather/predict/Madrid", params={"hours": 6}).json()
+    assert len(body["predictions"]) == 6
+    assert set(body["rmse"]) == {"temperature", "humidity"}
+
+    seed(db_session, city="Lisbon", days=1, step_minutes=120)
+    assert api_client.get("/weather/predict/Lisbon").status_code == 404
+    assert api_client.get("/weather/predict/Madrid", params={"hours": 0}).status_code == 422
+
+    backtest = api_client.get("/weather/predict/Madrid/backtest", params={"horizon": 6}).json()
+    assert backtest["evaluated"] > 0
+
+def test_model_catches_up_with_rows_saved_by_other_processes(db_session):
+    seed(db_session, city="Lisbon", days=1, step_minutes=120)
+    model = model_store.get("Lisbon", db_session)
+    assert model.samples == 12
+
+    # Rows inserted directly (cron job, another worker) never pass through observe().
+    db_session.execute(insert(Weather), [
+        {"city": "Lisbon", "description": "clear sky", "temperature": 15.0, "humidity": 60.0,
+         "created_at": (START + timedelta(days=1, hours=i)).replace(tzinfo=None)}
+        for i in range(12)
+    ])
+    db_session.commit()
+
+    result = predict_city("Lisbon", db_session, hours=1, now=START + timedelta(days=2))
+    assert result["samples"] == 24
+    assert model_store.get("Lisbon", db_session).samples == 24
@@ -0,0 +1,121 @@
+# tests/test_rate_limit.py
+from datetime import date
+from unittest.mock import patch
+import pytest
+from app.crud import fetch_weather_many
+from app.exceptions import RateLimitError
+from app.utils.rate_limit import (
+    INTERACTIVE,
+    SCHEDULED,
+    RateLimiter,
+    current_priority,
+    upstream_priority,
+)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_limiter(clock, **kwargs):
+    options = dict(rate_per_minute=60, burst=5, reserved=2, daily_quota=0, daily_reserve=0,
+                   timeouts={SCHEDULED: 10, INTERACTIVE: 0}, clock=clock, today=lambda: date(2025, 1, 15))
+    options.update(kwargs)
+    return RateLimiter(**options)
+
+def test_interactive_calls_cannot_use_reserved_tokens():
+    limiter = make_limiter(FakeClock())
+    for _ in range(3):
+        assert limiter.acquire(INTERACTIVE) == 0
+    with pytest.raises(RateLimitError) as excinfo:
+        limiter.acquire(INTERACTIVE)
+    assert excinfo.value.code == 503
+    assert excinfo.value.retry_after == pytest.approx(1.0)
+
+    # The scheduled class still gets the reserved tokens without waiting.
+    assert limiter.acquire(SCHEDULED) == 0
+    assert limiter.acquire(SCHEDULED) == 0
+    stats = limiter.stats()
+    assert stats["granted"] == {SCHEDULED: 2, INTERACTIVE: 3}
+    assert stats["rejected"][INTERACTIVE] == 1
+
+def test_tokens_refill_over_time():
+    clock = FakeClock()
+    limiter = make_limiter(clock)
+    for _ in range(3):
+        limiter.acquire(INTERACTIVE)
+    clock.now = 2.0
+    assert limiter.stats()["interactive_tokens_available"] == pytest.approx(2.0)
+    assert limiter.acquire(INTERACTIVE) == 0
+
+def test_scheduled_calls_wait_for_their_reservation_in_order():
+    limiter = make_limiter(FakeClock(), reserved=0)
+    waits = [limiter._reserve(SCHEDULED, None) for _ in range(8)]
+    assert waits == pytest.approx([0, 0, 0, 0, 0, 1, 2, 3])
+
+    # A caller whose slot falls after its deadline is rejected at once.
+    with pytest.raises(RateLimitError):
+        limiter._reserve(SCHEDULED, timeout=2)
+
+def test_daily_quota_keeps_a_reserve_for_scheduled_calls():
+    limiter = make_limiter(FakeClock(), rate_per_minute=6000, daily_quota=3, daily_reserve=1)
+    limiter.acquire(INTERACTIVE)
+    limiter.acquire(INTERACTIVE)
+    with pytest.raises(RateLimitError):
+        limiter.acquire(INTERACTIVE)
+    limiter.acquire(SCHEDULED)
+    with pytest.raises(RateLimitError) as excinfo:
+        limiter.acquire(SCHEDULED)
+    assert limiter.stats()["remaining_today"] == 0
+    # Retry once the quota resets at the next UTC midnight.
+    assert 0 < excinfo.value.retry_after <= 86400
+
+def test_priority_propagates_to_fetch_worker_threads():
+    seen = []
+
+    def fake_fetch(city):
+        seen.append(current_priority())
+        return {"name": city}
+
+    with patch("app.crud.fetch_raw_weather", side_effect=fake_fetch):
+        with upstream_priority(SCHEDULED):
+            fetch_weather_many(["Madrid", "London"], max_workers=2)
+        fetch_weather_many(["Paris"])
+
+    assert sorted(seen) == [INTERACTIVE, SCHEDULED, SCHEDULED]
+
+def test_upstream_budget_endpoint(api_client):
+    response = api_client.get("/weather/upstream/budget")
+    assert response.status_code == 200
+    body = response.json()
+    assert {"tokens_available", "interactive_tokens_available", "granted", "rejected"} <= body.keys()
+
+def test_rate_limit_errors_carry_retry_after(api_client):
+    with patch("app.routers.weather.fetch_current_weather_async",
+               side_effect=RateLimitError("OpenWeather rate limit", retry_after=1.2)):
+        response = api_client.get("/weather/Madrid")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "2"
+
+def test_rate_limited_fetch_is_not_rewrapped_as_bad_gateway(api_client):
+    with patch("app.services.weather_service.get_weather_async",
+               side_effect=RateLimitError("OpenWeather rate limit", retry_after=3)):
+        response = api_client.get("/weather/Madrid")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+
+def test_rate_limited_latest_fallback_is_not_rewrapped_as_bad_gateway(api_client):
+    # No stored rows: /latest falls back to the live weather, which is rate limited.
+    with patch("app.services.weather_service.get_weather",
+               side_effect=RateLimitError("OpenWeather rate limit", retry_after=3)):
+        response = api_client.get("/weather/latest/Madrid")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+
+def test_rate_limited_save_is_not_rewrapped_as_bad_gateway(api_client):
+    with patch("app.crud.get_weather", side_effect=RateLimitError("OpenWeather rate limit", retry_after=3)):
+        response = api_client.post("/weather/save/Madrid")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
@@ -0,0 +1,131 @@
+# tests/test_rollups.py
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import event
+from app.crud import save_weather_batch
+from app.models import WeatherRollup
+from app.services.rollups import (
+    bucket_start, update_rollups, rebuild_rollups, get_rollups, compare_rollups, window_start,
+)
+
+def observation(ts, temperature, humidity=50.0, pressure=1010, wind_speed=None, city="Madrid"):
+    return {"city": city, "created_at": ts, "temperature": temperature, "humidity": humidity,
+            "pressure": pressure, "wind_speed": wind_speed}
+
+def test_bucket_start():
+    ts = datetime(2025, 3, 13, 17, 42, 5, tzinfo=timezone.utc)  # Thursday
+    assert bucket_start(ts, "hour") == datetime(2025, 3, 13, 17, tzinfo=timezone.utc)
+    assert bucket_start(ts, "day") == datetime(2025, 3, 13, tzinfo=timezone.utc)
+    assert bucket_start(ts, "week") == datetime(2025, 3, 10, tzinfo=timezone.utc)
+    assert bucket_start(ts, "month") == datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+def test_window_start():
+    end = datetime(2025, 3, 13, 17, 42, tzinfo=timezone.utc)
+    assert window_start(end, "hour", 168) == datetime(2025, 3, 6, 18, tzinfo=timezone.utc)
+    assert window_start(end, "week", 2) == datetime(2025, 3, 3, tzinfo=timezone.utc)
+    assert window_start(end, "month", 15) == datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert window_start(datetime(2025, 3, 1), "day", 1) == datetime(2025, 2, 28, tzinfo=timezone.utc)
+
+def test_update_rollups_is_incremental(db_session):
+    base = datetime(2025, 3, 13, 10, tzinfo=timezone.utc)
+    update_rollups(db_session, [observation(base, 10.0, wind_speed=2.0)])
+    update_rollups(db_session, [observation(base + timedelta(minutes=30), 20.0)])
+    update_rollups(db_session, [observation(base + timedelta(days=1), 30.0, pressure=None)])
+    db_session.commit()
+
+    days = get_rollups(db_session, "Madrid", "day")
+    assert [d["count"] for d in days] == [2, 1]
+    assert days[0]["temperature_avg"] == 15.0
+    assert days[0]["temperature_min"] == 10.0
+    assert days[0]["temperature_max"] == 20.0
+    assert days[0]["wind_speed_max"] == 2.0
+    assert days[1]["pressure_avg"] is None
+
+    weeks = get_rollups(db_session, "Madrid", "week")
+    assert len(weeks) == 1 and weeks[0]["count"] == 3
+    assert len(get_rollups(db_session, "Madrid", "day", start=base + timedelta(days=1))) == 1
+
+def test_save_weather_batch_updates_rollups(db_session):
+    payload = {"name": "Madrid", "main": {"temp": 12.0, "humidity": 40}, "weather": [{"description": "clear"}]}
+    save_weather_batch({"Madrid": payload}, db=db_session)
+
+    assert db_session.query(WeatherRollup).count() == 4
+    assert rebuild_rollups(db_session, city="Madrid") == 1
+    assert get_rollups(db_session, "Madrid", "month")[0]["temperature_avg"] == 12.0
+
+def test_aggregate_endpoint(api_client, db_session):
+    base = datetime(2025, 3, 13, 10, tzinfo=timezone.utc)
+    update_rollups(db_session, [observation(base + timedelta(days=i), 10.0 + i) for i in range(10)])
+    db_session.commit()
+
+    response = api_client.get("/weather/aggregate/Madrid", params={"bucket": "week"})
+    assert response.status_code == 200
+    assert [w["count"] for w in response.json()] == [4, 6]
+
+    response = api_client.get("/weather/aggregate/Madrid", params={"bucket": "year"})
+    assert response.status_code == 422
+
+def test_update_rollups_batch_is_one_statement(db_session):
+    base = datetime(2025, 3, 13, 10, tzinfo=timezone.utc)
+    rows = [observation(base + timedelta(minutes=10 * i), 10.0 + i, city=city)
+            for i in range(6) for city in ("Madrid", "London", "Oslo")]
+
+    statements = []
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(db_session.get_bind(), "before_cursor_execute", count)
+    try:
+        update_rollups(db_session, rows)
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", count)
+    db_session.commit()
+
+    assert len(statements) == 1
+    hours = get_rollups(db_session, "London", "hour")
+    assert [h["count"] for h in hours] == [6] and hours[0]["temperature_max"] == 15.0
+
+def test_compare_rollups_aligns_cities_in_one_query(db_session):
+    base = datetime(2025, 3, 13, 10, tzinfo=timezone.utc)
+    update_rollups(db_session, [observation(base + timedelta(hours=i), 10.0 + i) for i in range(3)]
+                   + [observation(base + timedelta(hours=1, minutes=m), 20.0 + m, city="London") for m in (0, 30)]
+                   + [observation(base + timedelta(hours=3), 5.0, pressure=None, city="London")])
+    db_session.commit()
+
+    statements = []
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(db_session.get_bind(), "before_cursor_execute", count)
+    try:
+        result = compare_rollups(db_session, ["Madrid", "London", "Oslo"], "temperature", "hour")
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", count)
+    assert len(statements) == 1
+
+    assert result["buckets"] == [(base + timedelta(hours=i)).isoformat() for i in range(4)]
+    assert result["series"] == {
+        "Madrid": [10.0, 11.0, 12.0, None],
+        "London": [None, 35.0, None, 5.0],
+        "Oslo": [None, None, None, None],
+    }
+    pressure = compare_rollups(db_session, ["London"], "pressure", "day")
+    assert pressure["series"]["London"] == [1010.0]
+
+def test_compare_endpoint(api_client, db_session):
+    base = datetime(2025, 3, 13, 10, tzinfo=timezone.utc)
+    update_rollups(db_session, [observation(base, 10.0), observation(base + timedelta(days=1), 3.0, city="Oslo")])
+    db_session.commit()
+
+    # Without 'from' only the last COMPARE_DEFAULT_BUCKETS buckets are returned.
+    recent = api_client.get("/weather/compare", params={"cities": "Madrid,Oslo", "bucket": "day"}).json()
+    assert recent["buckets"] == [] and recent["series"] == {"Madrid": [], "Oslo": []}
+
+    body = api_client.get("/weather/compare", params={"cities": "Madrid,Oslo,Madrid", "bucket": "day",
+                                                      "to": "2025-03-20T00:00:00"}).json()
+    assert body["cities"] == ["Madrid", "Oslo"]
+    assert body["buckets"] == ["2025-03-13T00:00:00+00:00", "2025-03-14T00:00:00+00:00"]
+    assert body["series"] == {"Madrid": [10.0, None], "Oslo": [None, 3.0]}
+
+    ranged = api_client.get("/weather/compare", params=[("cities", "Madrid"), ("cities", "Oslo"), ("bucket", "day"),
+                                                        ("from", "2025-03-14T00:00:00")]).json()
+    assert ranged["series"] == {"Madrid": [None], "Oslo": [3.0]}
+    assert api_client.get("/weather/compare", params={"cities": "Madrid", "metric": "clouds"}).status_code == 422
+    assert api_client.get("/weather/compare", params={"cities": ","}).status_code == 422
@@ -0,0 +1,201 @@
+# tests/test_routes.py
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch, AsyncMock
+from sqlalchemy import event
+from app.exceptions import APIError
+
+WEATHER = {"name": "Madrid", "main": {"temp": 21.0, "humidity": 40}, "weather": [{"description": "clear sky"}]}
+FORECAST = {"list": [{"dt_txt": "2025-01-01 12:00:00", "main": {"temp": 18.0}, "weather": [{"icon": "01d"}]}]}
+
+@patch("app.services.weather_service.get_weather_async", new_callable=AsyncMock, return_value=WEATHER)
+def test_current_weather_is_async_and_cached(mock_get, api_client):
+    assert api_client.get("/weather/Madrid").json()["name"] == "Madrid"
+    assert api_client.get("/weather/madrid").json()["name"] == "Madrid"
+    assert mock_get.await_count == 1
+
+@patch("app.services.weather_service.get_5day_forecast_async", new_callable=AsyncMock, return_value=FORECAST)
+def test_forecast_async(mock_get, api_client):
+    response = api_client.get("/weather/forecast/Madrid")
+    assert response.status_code == 200
+    assert response.json()[0]["temperature"] == 18.0
+
+@patch("app.services.geocode_service.reverse_geocode_async", new_callable=AsyncMock, return_value=[{"name": "Arrecife"}])
+def test_reverse_geocode_async_uses_quantized_cache(mock_geo, api_client, db_session):
+    from app.models import GeocodeCache
+    from app.services.geocode_service import geocode_cache
+
+    geocode_cache.invalidate()
+    response = api_client.get("/weather/reverse-geocode", params={"lat": 28.9630, "lon": -13.5477})
+    assert response.status_code == 200
+    assert response.json() == {"city": "Arrecife"}
+
+    response = api_client.get("/weather/reverse-geocode", params={"lat": 28.9632, "lon": -13.5479})
+    assert response.json() == {"city": "Arrecife"}
+    assert mock_geo.await_count == 1
+    assert db_session.query(GeocodeCache).count() == 1
+
+    geocode_cache.invalidate()
+    api_client.get("/weather/reverse-geocode", params={"lat": 28.9631, "lon": -13.5478})
+    assert mock_geo.await_count == 1
+    stats = api_client.get("/weather/reverse-geocode/stats").json()
+    assert stats["db_hits"] >= 1
+
+@patch("app.services.geocode_service.reverse_geocode_async", new_callable=AsyncMock, return_value=[])
+def test_reverse_geocode_caches_misses_and_expires_rows(mock_geo, api_client, db_session):
+    from app.models import GeocodeCache
+    from app.services.geocode_service import geocode_cache, geocode_misses
+
+    # Open sea: the miss is remembered in memory and in the database.
+    params = {"lat": 30.0, "lon": -40.0}
+    assert api_client.get("/weather/reverse-geocode", params=params).status_code == 404
+    assert api_client.get("/weather/reverse-geocode", params=params).status_code == 404
+    assert mock_geo.await_count == 1
+    geocode_misses.invalidate()
+    assert api_client.get("/weather/reverse-geocode", params=params).status_code == 404
+    assert mock_geo.await_count == 1
+    assert db_session.query(GeocodeCache).one().city is None
+
+    # Rows older than their TTL are looked up again and refreshed.
+    entry = db_session.query(GeocodeCache).one()
+    entry.city, entry.created_at = "Arrecife", datetime(2020, 1, 1)
+    db_session.commit()
+    geocode_misses.invalidate()
+    geocode_cache.invalidate()
+    mock_geo.return_value = [{"name": "Atlantis"}]
+    assert api_client.get("/weather/reverse-geocode", params=params).json() == {"city": "Atlantis"}
+    assert mock_geo.await_count == 2
+
+    assert api_client.get("/weather/reverse-geocode", params={"lat": 91, "lon": 0}).status_code == 422
+
+@patch("app.services.weather_service.get_weather_async", new_callable=AsyncMock, side_effect=APIError("upstream down"))
+def test_current_weather_upstream_error(mock_get, api_client):
+    response = api_client.get("/weather/Madrid")
+    assert response.status_code == 502
+
+def test_history_conditional_get(api_client, db_session):
+    from tests.test_weather_service import add_records, BASE_TIME
+
+    add_records(db_session, count=2)
+    first = api_client.get("/weather/history/Madrid", params={"limit": 5})
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert first.headers["last-modified"] == "Wed, 15 Jan 2025 13:00:00 GMT"
+
+    cached = api_client.get("/weather/history/Madrid", params={"limit": 5}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert api_client.get("/weather/history/Madrid", params={"limit": 2},
+                          headers={"If-None-Match": etag}).status_code == 200
+    assert api_client.get("/weather/history/Madrid", params={"limit": 5},
+                          headers={"If-Modified-Since": first.headers["last-modified"]}).status_code == 304
+
+    add_records(db_session, count=1, start=BASE_TIME + timedelta(hours=5))
+    fresh = api_client.get("/weather/history/Madrid", params={"limit": 5}, headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"] != etag
+
+def test_daily_summary_conditional_get(api_client, db_session):
+    from tests.test_weather_service import add_records
+
+    add_records(db_session, count=2, start=datetime.now(timezone.utc).replace(tzinfo=None))
+    first = api_client.get("/weather/daily-summary/Madrid")
+    assert first.status_code == 200
+    assert api_client.get("/weather/daily-summary/Madrid",
+                          headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+
+def test_latest_conditional_get(api_client, db_session):
+    from tests.test_weather_service import add_records
+
+    add_records(db_session, count=2)
+    first = api_client.get("/weather/latest/Madrid")
+    assert first.status_code == 200
+    assert first.json()["temperature"] == 21.0
+    assert api_client.get("/weather/latest/Madrid",
+                          headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+
+def test_latest_snapshot_served_from_store(api_client, db_session):
+    from tests.test_weather_service import add_records, BASE_TIME
+    from app.services.latest_store import latest_store
+
+    add_records(db_session, count=3)
+    add_records(db_session, city="Valencia", count=1)
+    latest_store.load(db_session)
+
+    body = api_client.get("/weather/latest").json()
+    assert body["count"] == 2
+    assert [(r["city"], r["temperature"]) for r in body["records"]] == [("Madrid", 22.0), ("Valencia", 20.0)]
+
+    # Within the TTL a city is answered from memory, without any query.
+    statements = []
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(db_session.get_bind(), "before_cursor_execute", count)
+    try:
+        assert api_client.get("/weather/latest/Madrid").json()["temperature"] == 22.0
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", count)
+    assert statements == []
+
+def test_latest_city_picks_up_other_processes_after_ttl(api_client, db_session, monkeypatch):
+    from tests.test_weather_service import add_records, BASE_TIME
+    from app.services import weather_service
+    from app.services.latest_store import latest_store
+
+    add_records(db_session, count=3)
+    assert api_client.get("/weather/latest/Madrid").json()["temperature"] == 22.0
+
+    # A row written by another process (not through the save path) shows up once the entry expires.
+    add_records(db_session, count=1, start=BASE_TIME + timedelta(hours=9), temperature=5.0)
+    assert api_client.get("/weather/latest/Madrid").json()["temperature"] == 22.0
+    monkeypatch.setattr(weather_service, "LATEST_SNAPSHOT_TTL_SECONDS", 0)
+    assert api_client.get("/weather/latest/Madrid").json()["temperature"] == 5.0
+    assert latest_store.get("Madrid")["temperature"] == 5.0
+
+def test_latest_snapshot_reloads_after_ttl(api_client, db_session, monkeypatch):
+    from tests.test_weather_service import add_records
+    from app.services import weather_service
+
+    add_records(db_session, count=1)
+    assert api_client.get("/weather/latest").json()["count"] == 1
+
+    add_records(db_session, city="Valencia", count=1)
+    assert api_client.get("/weather/latest").json()["count"] == 1
+    monkeypatch.setattr(weather_service, "LATEST_SNAPSHOT_TTL_SECONDS", 0)
+    assert api_client.get("/weather/latest").json()["count"] == 2
+
+def _weather_for(city):
+    if city == "London":
+        raise APIError("upstream down")
+    return {**WEATHER, "name": city}
+
+@patch("app.services.weather_service.get_weather_async", new_callable=AsyncMock, side_effect=_weather_for)
+def test_weather_batch_reports_results_and_errors_per_city(mock_get, api_client):
+    response = api_client.post("/weather/batch", json={"cities": ["Madrid", " madrid", "London", "Paris1"]})
+    assert response.status_code == 200
+    body = response.json()
+    assert list(body["results"]) == ["Madrid"]
+    assert list(body["errors"]) == ["London", "Paris1"]
+    assert "Invalid city name" in body["errors"]["Paris1"]
+    assert mock_get.await_count == 2
+
+    # Served from the cache shared with GET /weather/{city}
+    query = api_client.get("/weather/batch", params={"cities": "Madrid,Paris"}).json()
+    assert set(query["results"]) == {"Madrid", "Paris"}
+    assert mock_get.await_count == 3
+
+def test_weather_batch_rejects_empty_list(api_client):
+    assert api_client.get("/weather/batch", params={"cities": " , "}).status_code == 422
+
+def test_weather_batch_bounds_total_latency():
+    import asyncio
+    from app.services.weather_service import fetch_current_weather_batch
+
+    async def slow(city):
+        await asyncio.sleep(0 if city == "Madrid" else 5)
+        return {**WEATHER, "name": city}
+
+    with patch("app.services.weather_service.get_weather_async", side_effect=slow):
+        body = asyncio.run(fetch_current_weather_batch(["Madrid", "Oslo"], timeout=0.1))
+    assert list(body["results"]) == ["Madrid"]
+    assert body["errors"] == {"Oslo": "Timed out after 0.1s"}
+    assert body["duration_ms"] < 1000
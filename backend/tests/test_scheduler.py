@@ -0,0 +1,93 @@
+# tests/test_scheduler.py
+import threading
+import zlib
+from unittest.mock import patch
+from app.models import Weather
+from app.scheduler import fetch_and_save_all_cities
+
+def fake_weather(city):
+    if city == "Atlantis":
+        raise Exception("city not found")
+    return {
+        "name": city,
+        "main": {"temp": 20.0, "humidity": 50},
+        "weather": [{"description": "clear sky"}]
+    }
+
+def test_fetch_and_save_all_cities_concurrent(db_session):
+    cities = ["Madrid", "Valencia", "London", "Atlantis"]
+    # Every call waits until all four are in flight: this only completes if they run concurrently.
+    barrier = threading.Barrier(len(cities), timeout=5)
+
+    def concurrent_weather(city):
+        barrier.wait()
+        return fake_weather(city)
+
+    with patch("app.crud.get_weather", side_effect=concurrent_weather):
+        report = fetch_and_save_all_cities(cities=cities, max_workers=4, db=db_session)
+
+    assert sorted(report["saved"]) == ["London", "Madrid", "Valencia"]
+    assert list(report["failures"]) == ["Atlantis"]
+    assert set(report["latency_ms"]) == set(cities)
+    assert not barrier.broken
+    assert db_session.query(Weather).count() == 3
+
+@patch("app.crud.get_weather", side_effect=fake_weather)
+def test_fetch_and_save_all_cities_commit_failure(mock_get, db_session, monkeypatch):
+    def fake_commit():
+        raise Exception("Commit failed!")
+
+    monkeypatch.setattr(db_session, "commit", fake_commit)
+    report = fetch_and_save_all_cities(cities=["Madrid"], max_workers=2, db=db_session)
+
+    assert report["saved"] == []
+    assert "Madrid" in report["failures"]
+
+def fake_payload(city):
+    return {
+        "id": zlib.crc32(city.encode()) % 10_000_000,
+        "coord": {"lat": 40.4, "lon": -3.7},
+        "name": city,
+        "main": {"temp": 20.0, "humidity": 50},
+        "weather": [{"description": "clear sky"}],
+        "sys": {"country": "ES"},
+    }
+
+@patch("app.crud.get_weather_group")
+@patch("app.crud.get_weather", side_effect=fake_payload)
+def test_resolved_cities_are_ingested_through_group_requests(mock_get, mock_group, db_session):
+    from app.models import City
+
+    cities = [f"City {a}{b}" for a in "ABCDE" for b in "ABCDE"]
+    payloads = {fake_payload(c)["id"]: fake_payload(c) for c in cities}
+    mock_group.side_effect = lambda ids: [payloads[i] for i in ids if i != fake_payload("City EE")["id"]]
+
+    first = fetch_and_save_all_cities(cities=cities, db=db_session)
+    assert first["upstream_calls"] == 25
+    assert db_session.query(City).count() == 25
+    assert db_session.get(City, "City AA").owm_id == fake_payload("City AA")["id"]
+
+    # City EE's id was retired upstream; fetched by name, it resolves to a new one.
+    mock_get.reset_mock()
+    mock_get.side_effect = lambda city: {**fake_payload(city), "id": 42}
+    second = fetch_and_save_all_cities(cities=cities, db=db_session)
+    assert second["upstream_calls"] == 3
+    assert [len(call.args[0]) for call in mock_group.call_args_list] == [20, 5]
+    assert [call.args[0] for call in mock_get.call_args_list] == ["City EE"]
+    assert len(second["saved"]) == 25 and second["failures"] == {}
+    db_session.expire_all()
+    assert db_session.get(City, "City EE").owm_id == 42
+    assert db_session.query(Weather).count() == 50
+
+
+@patch("app.crud.get_weather_group")
+def test_group_size_is_capped_at_the_openweather_limit(mock_group):
+    from app.crud import fetch_weather_many
+
+    cities = [f"City {a}{b}" for a in "ABCDE" for b in "ABCDE"]
+    mock_group.side_effect = lambda ids: [fake_payload(c) for c in cities if fake_payload(c)["id"] in ids]
+
+    outcome = fetch_weather_many(cities, city_ids={c: fake_payload(c)["id"] for c in cities}, group_size=50)
+
+    assert sorted(len(call.args[0]) for call in mock_group.call_args_list) == [5, 20]
+    assert outcome["failures"] == {}
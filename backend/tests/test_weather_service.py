@@ -0,0 +1,89 @@
+# tests/test_weather_service.py
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.models import Weather
+from app.exceptions import ValidationError
+from app.services.weather_service import get_weather_history
+
+BASE_TIME = datetime(2025, 1, 15, 12, 0, 0)
+
+def add_records(db, city="Madrid", count=5, start=BASE_TIME, step=timedelta(hours=1), **fields):
+    for i in range(count):
+        db.add(Weather(
+            city=city,
+            description=fields.get("description", "clear sky"),
+            temperature=fields.get("temperature", 20.0 + i),
+            humidity=fields.get("humidity", 50.0),
+            pressure=fields.get("pressure", 1010 + i),
+            wind_speed=fields.get("wind_speed", 3.0),
+            clouds=fields.get("clouds", 10),
+            created_at=start + step * i,
+        ))
+    db.commit()
+
+def test_history_keyset_pagination_walks_all_records(db_session):
+    add_records(db_session, count=5)
+    add_records(db_session, count=2, start=BASE_TIME + timedelta(hours=2), step=timedelta(0))
+
+    seen = []
+    page = get_weather_history(db_session, city="Madrid", limit=3, include_total=False)
+    assert page["total"] is None
+    while True:
+        seen.extend(page["records"])
+        if not page["next_cursor"]:
+            break
+        page = get_weather_history(db_session, city="Madrid", limit=3, cursor=page["next_cursor"])
+
+    assert len(seen) == 7
+    assert len({r.id for r in seen}) == 7
+    keys = [(r.created_at, r.id) for r in seen]
+    assert keys == sorted(keys, reverse=True)
+
+def test_history_offset_pagination_still_counts(db_session):
+    add_records(db_session, count=4)
+    page = get_weather_history(db_session, city="Madrid", limit=2, offset=1)
+
+    assert page["total"] == 4
+    assert [r.temperature for r in page["records"]] == [22.0, 21.0]
+    assert page["next_cursor"] is not None
+
+def test_history_invalid_cursor(db_session):
+    with pytest.raises(ValidationError):
+        get_weather_history(db_session, cursor="not-a-cursor")
+
+def test_daily_summary_aggregates_in_sql(db_session):
+    from fastapi import HTTPException
+    from app.services.weather_service import get_daily_summary
+
+    with pytest.raises(HTTPException):
+        get_daily_summary("Madrid", db_session)
+
+    start = datetime.combine(datetime.now(timezone.utc).date(), datetime.min.time()) + timedelta(minutes=5)
+    add_records(db_session, count=3, start=start)
+    summary = get_daily_summary("Madrid", db_session)
+
+    assert summary["temp_min"] == 20.0
+    assert summary["temp_max"] == 22.0
+    assert summary["pressure_avg"] == 1011.0
+    assert summary["cloudiness_avg"] == 10.0
+    assert summary["feels_like_avg"] is None
+
+def test_history_fast_path_matches_pydantic_serialization(api_client, db_session):
+    from app.schemas import WeatherResponse
+
+    add_records(db_session, count=3)
+    body = api_client.get("/weather/history/Madrid", params={"limit": 3}).json()
+    rows = get_weather_history(db_session, city="Madrid", limit=3)["records"]
+    expected = [WeatherResponse.model_validate(r, from_attributes=True).model_dump(mode="json") for r in rows]
+
+    assert body["total"] == 3
+    assert body["records"] == expected
+    assert body["records"][0]["created_at"] == "2025-01-15T15:00:00+01:00"
+
+def test_localize_batch_handles_dst_transition():
+    from app.utils.serialization import localize_batch
+
+    batch = [datetime(2025, 3, 30, 0, 30), datetime(2025, 3, 30, 1, 30)]
+    assert [ts.isoformat() for ts in localize_batch(batch)] == [
+        "2025-03-30T01:30:00+01:00", "2025-03-30T03:30:00+02:00",
+    ]
@@ -2,17 +2,112 @@ CREATE DATABASE weather_db;
 
 \c weather_db;
 
+-- Range-partitioned by month on created_at. The backend creates upcoming monthly
+-- partitions at startup and daily (app/partitions.py); old months can be detached
+-- with ALTER TABLE weather_data DETACH PARTITION weather_data_yYYYYmMM.
+-- The primary key must include the partition key, so only (id, created_at) is
+-- enforced unique; id itself is a uuid4 generated by the application.
+-- An existing unpartitioned weather_data is converted with:
+--   python -m app.partitions migrate
 CREATE TABLE weather_data (
-    id UUID PRIMARY KEY,
+    id UUID NOT NULL,
     city VARCHAR(100) NOT NULL,
+    country VARCHAR(10),
+    description VARCHAR(255) NOT NULL,
+    icon VARCHAR(10),
     temperature FLOAT NOT NULL,
     feels_like FLOAT,
+    temp_min FLOAT,
+    temp_max FLOAT,
     humidity FLOAT NOT NULL,
-    pressure FLOAT,
+    pressure INTEGER,
+    sea_level INTEGER,
+    grnd_level INTEGER,
     wind_speed FLOAT,
-    wind_deg FLOAT,
-    cloudiness FLOAT,
-    description VARCHAR(255),
-    icon VARCHAR(10),
-    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
-);
\ No newline at end of file
+    wind_deg INTEGER,
+    wind_gust FLOAT,
+    visibility INTEGER,
+    clouds INTEGER,
+    rain_1h FLOAT,
+    rain_3h FLOAT,
+    sunrise INTEGER,
+    sunset INTEGER,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE weather_data_default PARTITION OF weather_data DEFAULT;
+
+CREATE INDEX ix_weather_created_at ON weather_data (created_at);
+
+-- Narrows per-city history, latest record and daily summary to an index range
+-- scan in (created_at, id) order; the other columns are still read from the
+-- table. Existing databases: db/migrations/001_weather_city_created_at.sql.
+CREATE INDEX ix_weather_city_created_at ON weather_data (city, created_at DESC, id DESC);
+
+-- Incrementally maintained aggregates (bucket = hour | day | week | month).
+CREATE TABLE weather_rollups (
+    city VARCHAR(100) NOT NULL,
+    bucket VARCHAR(10) NOT NULL,
+    bucket_start TIMESTAMPTZ NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    temp_sum FLOAT NOT NULL DEFAULT 0,
+    temp_min FLOAT,
+    temp_max FLOAT,
+    humidity_sum FLOAT NOT NULL DEFAULT 0,
+    humidity_min FLOAT,
+    humidity_max FLOAT,
+    pressure_sum FLOAT NOT NULL DEFAULT 0,
+    pressure_count INTEGER NOT NULL DEFAULT 0,
+    wind_speed_sum FLOAT NOT NULL DEFAULT 0,
+    wind_speed_count INTEGER NOT NULL DEFAULT 0,
+    wind_speed_max FLOAT,
+    PRIMARY KEY (city, bucket, bucket_start)
+);
+
+-- Reverse geocoding results keyed by geohash cell.
+CREATE TABLE geocode_cache (
+    cell VARCHAR(12) PRIMARY KEY,
+    city VARCHAR(100),              -- NULL: no city matches the cell (negative cache entry)
+    country VARCHAR(10),
+    created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Tracked cities resolved to OpenWeather ids, for multi-city group requests.
+CREATE TABLE cities (
+    name VARCHAR(100) PRIMARY KEY,
+    owm_id INTEGER,
+    resolved_name VARCHAR(100),
+    country VARCHAR(10),
+    lat FLOAT,
+    lon FLOAT,
+    resolved_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Incremental anomaly detector state, one row per (city, detector).
+CREATE TABLE detector_state (
+    city VARCHAR(100) NOT NULL,
+    detector VARCHAR(40) NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    mean FLOAT,
+    variance FLOAT,
+    last_value FLOAT,
+    last_at TIMESTAMPTZ,
+    PRIMARY KEY (city, detector)
+);
+
+-- Anomalies raised on ingestion.
+CREATE TABLE alerts (
+    id SERIAL PRIMARY KEY,
+    city VARCHAR(100) NOT NULL,
+    kind VARCHAR(30) NOT NULL,
+    metric VARCHAR(30) NOT NULL,
+    value FLOAT NOT NULL,
+    expected FLOAT,
+    score FLOAT,
+    message VARCHAR(255) NOT NULL,
+    observed_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX ix_alerts_observed_at ON alerts (observed_at DESC);
+CREATE INDEX ix_alerts_city_observed_at ON alerts (city, observed_at DESC);
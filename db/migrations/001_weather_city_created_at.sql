@@ -0,0 +1,16 @@
+-- Replaces the single-column city index with the composite index used by
+-- per-city history, latest record and daily summary queries.
+--
+-- init.sql only runs on an empty database, so apply this once to databases
+-- created before the composite index existed:
+--
+--     psql "$DATABASE_URL" -f db/migrations/001_weather_city_created_at.sql
+--
+-- The statements are idempotent. On an unpartitioned weather_data, replace
+-- CREATE INDEX with CREATE INDEX CONCURRENTLY (outside a transaction) to avoid
+-- blocking writes while the index is built; PostgreSQL does not allow
+-- CONCURRENTLY on a partitioned parent table.
+
+CREATE INDEX IF NOT EXISTS ix_weather_city_created_at ON weather_data (city, created_at DESC, id DESC);
+
+DROP INDEX IF EXISTS ix_weather_city;
@@ -0,0 +1,6 @@
+-- Allows geocode_cache to remember cells with no matching city (city IS NULL),
+-- so repeated lookups for them do not reach OpenWeather.
+--
+--     psql "$DATABASE_URL" -f db/migrations/002_geocode_cache_negative_entries.sql
+
+ALTER TABLE geocode_cache ALTER COLUMN city DROP NOT NULL;
@@ -1,23 +1,23 @@
 import { useMemo } from "react";
 import { TEChart } from "tw-elements-react";
-import { flattenByDayAndHour } from "../utils/weatherHelpers";
-import { windDegToDir } from "../utils/weatherHelpers";
 
-export default function TemperatureChart({ unit, history }) {
-  const flattenedHistory = useMemo(() => flattenByDayAndHour(history), [history]);
-
-  const temps = flattenedHistory.map(r => (unit === "C" ? r.temperature : r.temperature != null ? Math.round((r.temperature * 9)/5 + 32) : null));
+// series: [[isoTimestamp, temperatureCelsius], ...] as returned by getSeries (already downsampled).
+export default function TemperatureChart({ unit, series }) {
+  const chartData = useMemo(() => (series || [])
+    .map(([time, value]) => {
+      const dateObj = new Date(time);
+      if (isNaN(dateObj)) return null;
+      return {
+        label: `${dateObj.toLocaleDateString("es-ES")} ${dateObj.toLocaleTimeString("es-ES", { hour: "2-digit", minute: "2-digit" })}`,
+        value: unit === "C" || value == null ? value : Math.round((value * 9) / 5 + 32),
+      };
+    })
+    .filter(Boolean), [series, unit]);
 
+  const temps = chartData.map(d => d.value);
   const maxIndex = temps.indexOf(Math.max(...temps));
   const minIndex = temps.indexOf(Math.min(...temps));
-  const chartData = flattenedHistory.map((r, i) => ({
-    label: `${r.day} ${r.hour}`,
-    value: temps[i],
-    humidity: r.humidity,
-    pressure: r.pressure,
-    wind_speed: r.wind_speed,
-    wind_deg: r.wind_deg,
-  }));
+  const pointRadius = chartData.length > 100 ? 0 : 3;
 
   return (
     <div className="w-full h-full card-bg rounded-2xl shadow-xl p-4">
@@ -34,7 +34,7 @@ export default function TemperatureChart({ unit, history }) {
               backgroundColor: "rgba(147, 197, 253, 0.2)", 
               tension: 0.3,
               fill: true,
-              pointRadius: chartData.map((_, i) => (i === maxIndex || i === minIndex ? 6 : 3)),
+              pointRadius: chartData.map((_, i) => (i === maxIndex || i === minIndex ? 6 : pointRadius)),
               pointBackgroundColor: chartData.map((_, i) =>
                 i === maxIndex ? "red" : i === minIndex ? "green" : "rgb(147 197 253)"
               ),
@@ -53,17 +53,11 @@ export default function TemperatureChart({ unit, history }) {
               callbacks: {
                 label: (tooltipItem) => {
                   const record = chartData[tooltipItem.dataIndex];
-                  const tempLabel = tooltipItem.dataIndex === maxIndex
+                  return tooltipItem.dataIndex === maxIndex
                     ? `Max: ${record.value} °${unit}`
                     : tooltipItem.dataIndex === minIndex
                     ? `Min: ${record.value} °${unit}`
                     : `${record.value} °${unit}`;
-                  return [
-                    tempLabel,
-                    `Humidity: ${record.humidity ?? "–"} %`,
-                    `Pressure: ${record.pressure ?? "–"} hPa`,
-                    `Wind: ${record.wind_speed ?? "–"} m/s ${windDegToDir(record.wind_deg)}`,
-                  ];
                 },
               },
             },
@@ -1,12 +1,16 @@
 import { useEffect, useState } from "react";
 import TemperatureChart from "./TemperatureChart";
 import HistoryTable from "./HistoryTable";
-import { getWeather, getForecast } from "../services/api";
+import { getWeather, getForecast, getSeries } from "../services/api";
+
+// Points requested for the chart; the backend downsamples longer histories (LTTB).
+const CHART_POINTS = 500;
 
 export default function TemperatureHistory({ city: propCity, initialWeather }) {
   const [activeTab, setActiveTab] = useState("chart");
   const [city, setCity] = useState(propCity || "");
   const [history, setHistory] = useState([]);
+  const [series, setSeries] = useState([]);
   
   useEffect(() => {
     setCity(propCity || "");
@@ -56,8 +60,31 @@ export default function TemperatureHistory({ city: propCity, initialWeather }) {
     return () => { cancelled = true; };
   }, [city, initialWeather]);
 
+  useEffect(() => {
+    if (!city) {
+      setSeries([]);
+      return;
+    }
+
+    let cancelled = false;
+    getSeries(city, "temperature", CHART_POINTS)
+      .then(data => { if (!cancelled) setSeries(data.series || []); })
+      .catch(err => {
+        console.error("Series fetch failed, charting the table records:", err);
+        if (!cancelled) setSeries([]);
+      });
+    return () => { cancelled = true; };
+  }, [city]);
+
+  // Stored history when the city has any, otherwise the records shown in the table.
+  const chartSeries = series.length > 0
+    ? series
+    : history
+        .map(r => [r.created_at, r.temperature])
+        .sort((a, b) => new Date(a[0]) - new Date(b[0]));
+
   if (!city) return null;
-  if (!history || history.length === 0) {
+  if (chartSeries.length === 0 && (!history || history.length === 0)) {
     return null; 
   }
   return (
@@ -87,7 +114,7 @@ export default function TemperatureHistory({ city: propCity, initialWeather }) {
       {/* Contenido */}
       <div className="flex-1 w-full overflow-auto">
         {activeTab === "chart" ? (
-          <TemperatureChart unit="C" history={history} className="w-full h-full" />
+          <TemperatureChart unit="C" series={chartSeries} className="w-full h-full" />
         ) : (
           <HistoryTable unit="C" history={history} />
         )}
@@ -27,6 +27,22 @@ export async function getDailySummary(city) {
   return res.json();
 }
 
+export async function getSeries(city, metric = "temperature", points = 500, from = null, to = null) {
+  const params = new URLSearchParams({ metric, points });
+  if (from) params.set("from", from);
+  if (to) params.set("to", to);
+  const res = await fetch(`${API_URL}/weather/series/${city}?${params}`);
+  if (!res.ok) throw new Error("Failed to fetch series");
+  return res.json();
+}
+
+export async function getComparison(cities, metric = "temperature", bucket = "hour") {
+  const params = new URLSearchParams({ cities: cities.join(","), metric, bucket });
+  const res = await fetch(`${API_URL}/weather/compare?${params}`);
+  if (!res.ok) throw new Error("Failed to fetch comparison");
+  return res.json();
+}
+
 export async function getForecast(city) {
   const res = await fetch(`${API_URL}/weather/forecast/${city}`);
   if (!res.ok) throw new Error("Failed to fetch forecast");